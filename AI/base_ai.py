@@ -1,10 +1,19 @@
 import abc
-from typing import List, Tuple, Dict, Optional, Callable
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, List, Tuple, Dict, Optional, Callable
 from Common.constants import PIECE_COLORS
 from Common.config import Config
 
 class BaseAI(metaclass=abc.ABCMeta):
     """AI抽象基类（统一接口规范）"""
+    _shared_cpp_core = None  # 胜负判定用C++核心（进程内共享，首次使用时创建）
+    # 模型检查点LRU缓存：(绝对路径, 修改时间ns, 设备) -> 已反序列化的检查点（进程内共享）
+    _checkpoint_cache: 'OrderedDict[Tuple[str, int, str], Any]' = OrderedDict()
+    _checkpoint_cache_size = 2
+    _checkpoint_lock = threading.Lock()
+
     def __init__(self, color: int, level: str):
         self.color = color  # 棋子颜色（BLACK/WHITE）
         self.opponent_color = PIECE_COLORS['WHITE'] if color == PIECE_COLORS['BLACK'] else PIECE_COLORS['BLACK']
@@ -13,6 +22,23 @@ class BaseAI(metaclass=abc.ABCMeta):
         self.board_size = self.config.board_size
         self.thinking_callback: Optional[Callable[[Dict], None]] = None  # 思维可视化回调
 
+    @classmethod
+    def _load_checkpoint_cached(cls, model_path: str, device: str, loader: Callable[[str], Any]) -> Any:
+        """读取模型检查点（按路径+修改时间缓存，文件被覆盖后自动失效；调用方需复制而非直接引用其中张量）"""
+        key = (os.path.abspath(model_path), os.stat(model_path).st_mtime_ns, device)
+        with cls._checkpoint_lock:
+            checkpoint = BaseAI._checkpoint_cache.get(key)
+            if checkpoint is not None:
+                BaseAI._checkpoint_cache.move_to_end(key)
+                return checkpoint
+        checkpoint = loader(model_path)
+        with cls._checkpoint_lock:
+            BaseAI._checkpoint_cache[key] = checkpoint
+            BaseAI._checkpoint_cache.move_to_end(key)
+            while len(BaseAI._checkpoint_cache) > cls._checkpoint_cache_size:
+                BaseAI._checkpoint_cache.popitem(last=False)
+        return checkpoint
+
     @abc.abstractmethod
     def move(self, board: List[List[int]], thinking_callback: Optional[Callable[[Dict], None]] = None) -> Tuple[int, int]:
         """核心落子方法（必须实现）"""
@@ -38,7 +64,9 @@ class BaseAI(metaclass=abc.ABCMeta):
 
     def _is_win(self, board: List[List[int]], color: int) -> Tuple[bool, List[Tuple[int, int]]]:
         """检查是否获胜（通用实现，对接C++核心）"""
-        from Compute.cpp_interface import CppCore
-        cpp_core = CppCore()
+        cpp_core = BaseAI._shared_cpp_core
+        if cpp_core is None:
+            from Compute.cpp_interface import CppCore
+            cpp_core = BaseAI._shared_cpp_core = CppCore()
         result = cpp_core.check_game_end(board, self.board_size)
         return (result['is_end'] and result['winner'] == color, result['win_line'])
\ No newline at end of file
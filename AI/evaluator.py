@@ -1,9 +1,116 @@
+import functools
 import numpy as np
-from typing import List, Tuple, Dict
-from Common.constants import PIECE_COLORS, EVAL_WEIGHTS
+from typing import List, Tuple, Dict, Callable
+from Common.constants import PIECE_COLORS, EVAL_WEIGHTS, COLOR_SWITCH
 from Common.logger import Logger
 from Compute.cpp_interface import CppCore
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # 未安装numba时保留纯Python实现
+    NUMBA_AVAILABLE = False
+
+# 棋型识别方向（横、纵、正对角、反对角）
+_DIRECTIONS = np.array([(0, 1), (1, 0), (1, 1), (1, -1)], dtype=np.int64)
+
+
+def _evaluate_board_kernel(board: np.ndarray, color: int, opponent_color: int,
+                           position_weights: np.ndarray, score_table: np.ndarray) -> float:
+    """整盘评估内核（numba编译，棋盘为int8数组，score_table[连子数][是否被挡]）"""
+    size = board.shape[0]
+    total_score = 0.0
+    for x in range(size):
+        for y in range(size):
+            cell = board[x, y]
+            if cell != color and cell != opponent_color:
+                continue
+            max_score = 0.0
+            for d in range(4):
+                dx = _DIRECTIONS[d, 0]
+                dy = _DIRECTIONS[d, 1]
+                count = 1
+                blocked = 0
+                # 正向
+                nx, ny = x + dx, y + dy
+                while 0 <= nx < size and 0 <= ny < size and board[nx, ny] == cell:
+                    count += 1
+                    nx += dx
+                    ny += dy
+                if 0 <= nx < size and 0 <= ny < size and board[nx, ny] != 0:
+                    blocked = 1
+                # 反向
+                nx, ny = x - dx, y - dy
+                while 0 <= nx < size and 0 <= ny < size and board[nx, ny] == cell:
+                    count += 1
+                    nx -= dx
+                    ny -= dy
+                if 0 <= nx < size and 0 <= ny < size and board[nx, ny] != 0:
+                    blocked = 1
+                score = score_table[min(count, 5), blocked]
+                if score > max_score:
+                    max_score = score
+            if cell == color:
+                total_score += max_score * position_weights[x, y]
+            else:
+                total_score -= max_score * position_weights[x, y]
+    return total_score
+
+
+@functools.lru_cache(maxsize=None)
+def _build_score_moves_kernel(size: int) -> Callable[..., np.ndarray]:
+    """生成指定棋盘尺寸的候选落子批量评分内核（size为闭包常量，numba编译时循环边界和越界判断按常量折叠）"""
+
+    def line_score(board: np.ndarray, x: int, y: int, dx: int, dy: int, color: int, score_table: np.ndarray) -> float:
+        """假设color落在(x, y)时，该方向上的棋型得分"""
+        count = 1
+        blocked = 0
+        nx, ny = x + dx, y + dy
+        while 0 <= nx < size and 0 <= ny < size and board[nx, ny] == color:
+            count += 1
+            nx += dx
+            ny += dy
+        if 0 <= nx < size and 0 <= ny < size and board[nx, ny] != 0:
+            blocked = 1
+        nx, ny = x - dx, y - dy
+        while 0 <= nx < size and 0 <= ny < size and board[nx, ny] == color:
+            count += 1
+            nx -= dx
+            ny -= dy
+        if 0 <= nx < size and 0 <= ny < size and board[nx, ny] != 0:
+            blocked = 1
+        return score_table[min(count, 5), blocked]
+
+    if NUMBA_AVAILABLE:
+        line_score = njit(fastmath=True)(line_score)
+
+    def score_moves(board: np.ndarray, color: int, opponent_color: int,
+                    position_weights: np.ndarray, score_table: np.ndarray) -> np.ndarray:
+        """一次遍历所有空位：己方成型分+阻挡对手分，乘位置权重；非空位记-1"""
+        scores = np.full((size, size), -1.0)
+        for x in range(size):
+            for y in range(size):
+                if board[x, y] != 0:
+                    continue
+                attack = 0.0
+                defense = 0.0
+                for d in range(4):
+                    dx = _DIRECTIONS[d, 0]
+                    dy = _DIRECTIONS[d, 1]
+                    attack = max(attack, line_score(board, x, y, dx, dy, color, score_table))
+                    defense = max(defense, line_score(board, x, y, dx, dy, opponent_color, score_table))
+                scores[x, y] = (attack + defense) * position_weights[x, y]
+        return scores
+
+    if NUMBA_AVAILABLE:
+        score_moves = njit(fastmath=True)(score_moves)
+    return score_moves
+
+
+if NUMBA_AVAILABLE:
+    _evaluate_board_kernel = njit(cache=True, fastmath=True)(_evaluate_board_kernel)
+
 class BoardEvaluator:
     """棋盘评估器（棋型识别、位置权重、局势评分）"""
     def __init__(self, board_size: int = 15):
@@ -12,6 +119,10 @@ class BoardEvaluator:
         self.cpp_core = CppCore()
         # 位置权重矩阵（天元及周边权重高）
         self.position_weights = self._init_position_weights()
+        # 棋型得分表（numba内核使用：行=连子数，列=是否被挡）
+        self.score_table = self._init_score_table()
+        # 按棋盘尺寸特化的候选落子评分内核（同尺寸进程内共享，首次调用时编译）
+        self._score_moves_kernel = _build_score_moves_kernel(board_size)
 
     def _init_position_weights(self) -> np.ndarray:
         """初始化位置权重矩阵"""
@@ -28,6 +139,14 @@ class BoardEvaluator:
             weights[x][y] *= 1.2
         return weights
 
+    def _init_score_table(self) -> np.ndarray:
+        """初始化棋型得分表（与_calc_pattern_score一致）"""
+        table = np.zeros((6, 2), dtype=np.float64)
+        for count in range(1, 6):
+            for blocked in range(2):
+                table[count, blocked] = self._calc_pattern_score(count, blocked)
+        return table
+
     def _recognize_pattern(self, board: List[List[int]], x: int, y: int, color: int) -> Tuple[str, int]:
         """识别落子位置的棋型（C++加速）"""
         if self.cpp_core:
@@ -69,7 +188,7 @@ class BoardEvaluator:
                 count += 1
                 nx += dx
                 ny += dy
-            if 0 <= nx < self.board_size and 0 <= ny < self.board_size and board[nx][ny] != PIECE_COLORS['EMPTY']:
+            if 0 <= nx < self.board_size and 0 <= ny < self.board_size and board[nx][ny] != PIECE_COLORS.EMPTY:
                 blocked += 1
             # 反向
             nx, ny = x - dx, y - dy
@@ -77,7 +196,7 @@ class BoardEvaluator:
                 count += 1
                 nx -= dx
                 ny -= dy
-            if 0 <= nx < self.board_size and 0 <= ny < self.board_size and board[nx][ny] != PIECE_COLORS['EMPTY']:
+            if 0 <= nx < self.board_size and 0 <= ny < self.board_size and board[nx][ny] != PIECE_COLORS.EMPTY:
                 blocked += 1
             # 计算得分
             pattern_score = self._calc_pattern_score(count, blocked)
@@ -113,18 +232,32 @@ class BoardEvaluator:
             return 'ONE'
 
     def evaluate_board(self, board: List[List[int]], color: int) -> float:
-        """评估整个棋盘的局势得分"""
+        """评估整个棋盘的局势得分（已安装numba时使用编译内核，否则逐格识别棋型）"""
+        if NUMBA_AVAILABLE:
+            board_arr = np.asarray(board, dtype=np.int8)
+            return float(_evaluate_board_kernel(board_arr, color, color ^ COLOR_SWITCH,
+                                                self.position_weights, self.score_table))
+        return self._evaluate_board_py(board, color)
+
+    def _evaluate_board_py(self, board: List[List[int]], color: int) -> float:
+        """逐格识别棋型的整盘评估（未安装numba时使用）"""
         total_score = 0.0
+        opponent_color = color ^ COLOR_SWITCH
         for x in range(self.board_size):
             for y in range(self.board_size):
                 if board[x][y] == color:
                     pattern, score = self._recognize_pattern(board, x, y, color)
                     total_score += score
-                elif board[x][y] == (PIECE_COLORS['WHITE'] if color == PIECE_COLORS['BLACK'] else PIECE_COLORS['BLACK']):
-                    pattern, score = self._recognize_pattern(board, x, y, board[x][y])
+                elif board[x][y] == opponent_color:
+                    pattern, score = self._recognize_pattern(board, x, y, opponent_color)
                     total_score -= score
         return total_score
 
+    def score_moves(self, board: List[List[int]], color: int) -> np.ndarray:
+        """批量评估所有空位作为color下一手的得分（用于搜索排序；返回board_size×board_size数组，非空位为-1）"""
+        board_arr = np.asarray(board, dtype=np.int8)
+        return self._score_moves_kernel(board_arr, color, color ^ COLOR_SWITCH, self.position_weights, self.score_table)
+
     def evaluate_move(self, board: List[List[int]], x: int, y: int, color: int) -> float:
         """评估单个落子的得分"""
         # 模拟落子
@@ -1,7 +1,7 @@
 import random
 import numpy as np
 from typing import List, Tuple, Dict, Optional, Callable
-from Common.constants import AI_LEVELS, EVAL_WEIGHTS, PIECE_COLORS
+from Common.constants import AI_LEVELS, EVAL_WEIGHTS, PIECE_COLORS, COLOR_SWITCH
 from Common.logger import Logger
 from AI.base_ai import BaseAI
 from Compute.cpp_interface import CppCore
@@ -102,7 +102,7 @@ class MCTSAI(BaseAI):
                 move = random.choice(empty_pos)
             # 执行落子
             temp_board[move[0]][move[1]] = current_color
-            current_color = PIECE_COLORS['WHITE'] if current_color == PIECE_COLORS['BLACK'] else PIECE_COLORS['BLACK']
+            current_color ^= COLOR_SWITCH
 
     def _mcts_iteration(self, root: MCTSNode) -> None:
         """单次MCTS迭代（选择→扩展→模拟→回溯）"""
@@ -175,7 +175,7 @@ class MCTSAI(BaseAI):
         thinking_data['iteration'] = self.iterations
         self._notify_thinking(thinking_data)
 
-        self.logger.info(f"MCTS AI落子：{best_move}，访问次数：{best_node.visits}/{root.visits}")
+        self.logger.info("MCTS AI落子：%s，访问次数：%s/%s", best_move, best_node.visits, root.visits)
         return best_move
 
     def _get_node_depth(self, node: MCTSNode) -> int:
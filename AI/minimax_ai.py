@@ -1,10 +1,28 @@
+import time
+import functools
 import numpy as np
+from collections import namedtuple
 from typing import List, Tuple, Dict, Optional, Callable
 from Common.constants import AI_LEVELS, EVAL_WEIGHTS, PIECE_COLORS
 from Common.logger import Logger
 from AI.base_ai import BaseAI
+from AI.evaluator import BoardEvaluator
 from Compute.cpp_interface import CppCore
 
+# 置换表条目：搜索深度、边界类型、局面值、最佳落子
+TTEntry = namedtuple('TTEntry', ['depth', 'flag', 'value', 'best_move'])
+_TT_EXACT, _TT_LOWER, _TT_UPPER = 0, 1, 2
+# PVS零窗口宽度（局面值为浮点数，取远小于最小棋型分差的宽度）
+_PVS_WINDOW = 1e-3
+
+
+@functools.lru_cache(maxsize=None)
+def zobrist_table(board_size: int) -> List[List[List[int]]]:
+    """Zobrist随机数表（[颜色-1][x][y]，固定种子；同尺寸棋盘进程内共享，调用方只读）"""
+    return np.random.SeedSequence(42).generate_state(
+        2 * board_size * board_size, dtype=np.uint64
+    ).reshape(2, board_size, board_size).tolist()
+
 class MinimaxAI(BaseAI):
     """Minimax+Alpha-Beta剪枝AI（C++加速核心）"""
     def __init__(self, color: int, level: str = AI_LEVELS['HARD'], use_cpp: bool = True):
@@ -12,10 +30,17 @@ class MinimaxAI(BaseAI):
         self.logger = Logger.get_instance()
         self.cpp_core = CppCore() if use_cpp else None
         self.max_depth = self._get_max_depth()  # 动态深度适配难度
+        self._root_depth = self.max_depth  # 迭代加深当前轮的根节点深度
+        self.time_budget = self.config.get_float('AI', 'minimax_time_budget', 5.0)  # 单步搜索时间预算（秒）
         self.alpha = -float('inf')
         self.beta = float('inf')
         self.best_move: Tuple[int, int] = (0, 0)
         self.eval_cache = {}  # 评估缓存（减少重复计算）
+        self.evaluator = BoardEvaluator(self.board_size)  # 候选落子批量评分（搜索排序）
+        # Zobrist随机数表与置换表（跨回合保留，局面值均以己方视角计）
+        self._zobrist = zobrist_table(self.board_size)
+        self.trans_table: Dict[int, TTEntry] = {}
+        self.tt_max_size = 200000
 
     def _get_max_depth(self) -> int:
         """根据难度获取最大搜索深度"""
@@ -96,44 +121,119 @@ class MinimaxAI(BaseAI):
                 score += 10.0
         return score
 
-    def _minimax(self, board: List[List[int]], depth: int, alpha: float, beta: float, is_maximizing: bool) -> float:
-        """Minimax核心算法（Alpha-Beta剪枝）"""
+    def _minimax(self, board: List[List[int]], depth: int, alpha: float, beta: float, is_maximizing: bool,
+                 key: Optional[int] = None) -> float:
+        """Minimax核心算法（PVS主变例搜索+置换表；key为当前棋盘的Zobrist哈希，为空时现算）"""
+        if key is None:
+            key = self._hash_board(board)
+        alpha_orig, beta_orig = alpha, beta
+        # 置换表探查（根节点需确定best_move，不直接截断）
+        entry = self.trans_table.get(key)
+        tt_move = None
+        if entry is not None:
+            tt_move = entry.best_move
+            if entry.depth >= depth and depth != self._root_depth:
+                if entry.flag == _TT_EXACT:
+                    return entry.value
+                if entry.flag == _TT_LOWER:
+                    alpha = max(alpha, entry.value)
+                else:
+                    beta = min(beta, entry.value)
+                if beta <= alpha:
+                    return entry.value
         # 检查游戏结束
         win, _ = self._is_win(board, self.color if is_maximizing else self.opponent_color)
         if win:
-            return 10000.0 * (1 + depth / 10) if is_maximizing else -10000.0 * (1 + depth / 10)
+            value = 10000.0 * (1 + depth / 10) if is_maximizing else -10000.0 * (1 + depth / 10)
+            self._store_tt(key, depth, _TT_EXACT, value, None)
+            return value
         # 搜索深度终止
         if depth == 0:
-            return self._evaluate(board, self.color)
-        # 空位置排序（提升剪枝效率）
-        empty_pos = self._get_empty_positions(board)
-        empty_pos.sort(key=lambda pos: self._evaluate(self._simulate_move(board, pos[0], pos[1], self.color if is_maximizing else self.opponent_color), self.color), reverse=is_maximizing)
+            value = self._evaluate(board, self.color)
+            self._store_tt(key, depth, _TT_EXACT, value, None)
+            return value
+        move_color = self.color if is_maximizing else self.opponent_color
+        # 空位置排序（提升剪枝效率）：所有空位一次批量评分，取得分最高的候选位；置换表记录的最佳落子优先
+        empty_pos = self._ordered_moves(board, move_color)
+        if tt_move is not None and board[tt_move[0]][tt_move[1]] == PIECE_COLORS.EMPTY:
+            if tt_move in empty_pos:
+                empty_pos.remove(tt_move)
+            empty_pos.insert(0, tt_move)
+        zobrist = self._zobrist[move_color - 1]
+        best_move = None
+        # 首个候选（主变例）全窗口搜索，其余先零窗口试探，试探越界时才全窗口重搜
         # 最大化玩家（己方）
         if is_maximizing:
-            max_score = -float('inf')
-            for (x, y) in empty_pos[:15]:  # 限制候选位数量，提升速度
+            best_score = -float('inf')
+            for i, (x, y) in enumerate(empty_pos[:15]):  # 限制候选位数量，提升速度
                 new_board = self._simulate_move(board, x, y, self.color)
-                score = self._minimax(new_board, depth - 1, alpha, beta, False)
-                if score > max_score:
-                    max_score = score
-                    if depth == self.max_depth:
+                child_key = key ^ zobrist[x][y]
+                if i == 0:
+                    score = self._minimax(new_board, depth - 1, alpha, beta, False, child_key)
+                else:
+                    score = self._minimax(new_board, depth - 1, alpha, alpha + _PVS_WINDOW, False, child_key)
+                    if alpha < score < beta:
+                        score = self._minimax(new_board, depth - 1, score, beta, False, child_key)
+                if score > best_score:
+                    best_score = score
+                    best_move = (x, y)
+                    if depth == self._root_depth:
                         self.best_move = (x, y)
-                alpha = max(alpha, max_score)
+                alpha = max(alpha, best_score)
                 if beta <= alpha:
                     break  # Beta剪枝
-            return max_score
         # 最小化玩家（对手）
         else:
-            min_score = float('inf')
-            for (x, y) in empty_pos[:15]:
+            best_score = float('inf')
+            for i, (x, y) in enumerate(empty_pos[:15]):
                 new_board = self._simulate_move(board, x, y, self.opponent_color)
-                score = self._minimax(new_board, depth - 1, alpha, beta, True)
-                if score < min_score:
-                    min_score = score
-                beta = min(beta, min_score)
+                child_key = key ^ zobrist[x][y]
+                if i == 0:
+                    score = self._minimax(new_board, depth - 1, alpha, beta, True, child_key)
+                else:
+                    score = self._minimax(new_board, depth - 1, beta - _PVS_WINDOW, beta, True, child_key)
+                    if alpha < score < beta:
+                        score = self._minimax(new_board, depth - 1, alpha, score, True, child_key)
+                if score < best_score:
+                    best_score = score
+                    best_move = (x, y)
+                beta = min(beta, best_score)
                 if beta <= alpha:
                     break  # Alpha剪枝
-            return min_score
+        # 按搜索窗口记录边界类型
+        if best_score <= alpha_orig:
+            flag = _TT_UPPER
+        elif best_score >= beta_orig:
+            flag = _TT_LOWER
+        else:
+            flag = _TT_EXACT
+        self._store_tt(key, depth, flag, best_score, best_move)
+        return best_score
+
+    def _hash_board(self, board: List[List[int]]) -> int:
+        """计算棋盘的Zobrist哈希（搜索中按落子增量异或更新）"""
+        key = 0
+        for x in range(self.board_size):
+            row = board[x]
+            for y in range(self.board_size):
+                if row[y] != PIECE_COLORS.EMPTY:
+                    key ^= self._zobrist[row[y] - 1][x][y]
+        return key
+
+    def _store_tt(self, key: int, depth: int, flag: int, value: float, best_move: Optional[Tuple[int, int]]):
+        """写入置换表（同一局面保留搜索深度更深的结果；超出容量时整体清空）"""
+        entry = self.trans_table.get(key)
+        if entry is not None and entry.depth > depth:
+            return
+        if len(self.trans_table) >= self.tt_max_size:
+            self.trans_table.clear()
+        self.trans_table[key] = TTEntry(depth, flag, value, best_move)
+
+    def _ordered_moves(self, board: List[List[int]], color: int, limit: int = 15) -> List[Tuple[int, int]]:
+        """按color落子得分降序返回前limit个空位"""
+        scores = self.evaluator.score_moves(board, color).ravel()
+        order = np.argsort(-scores, kind='stable')[:limit]
+        return [divmod(int(i), self.board_size) for i in order if scores[i] >= 0]
 
     def _simulate_move(self, board: List[List[int]], x: int, y: int, color: int) -> List[List[int]]:
         """模拟落子（深拷贝棋盘）"""
@@ -165,8 +265,19 @@ class MinimaxAI(BaseAI):
                 self._notify_thinking(thinking_data)
                 return winning_move
 
-        # 启动Minimax搜索
-        score = self._minimax(board, self.max_depth, self.alpha, self.beta, True)
+        # 迭代加深：逐层加深搜索，浅层结果经置换表为深层提供落子排序；预计超出时间预算时停止加深
+        start = time.monotonic()
+        root_key = self._hash_board(board)
+        score = 0.0
+        for depth in range(1, self.max_depth + 1):
+            self._root_depth = depth
+            score = self._minimax(board, depth, self.alpha, self.beta, True, root_key)
+            thinking_data['depth'] = depth
+            elapsed = time.monotonic() - start
+            # 下一层耗时通常为本层数倍，已用去一半预算时不再开始新一轮
+            if depth < self.max_depth and elapsed > self.time_budget / 2:
+                self.logger.debug("Minimax迭代加深在第%d层停止（耗时%.2fs）", depth, elapsed)
+                break
 
         # 思维可视化：更新最终数据
         empty_pos = self._get_empty_positions(board)[:10]
@@ -176,5 +287,5 @@ class MinimaxAI(BaseAI):
         thinking_data['considering_moves'] = empty_pos[:5]
         self._notify_thinking(thinking_data)
 
-        self.logger.info(f"Minimax AI落子：{self.best_move}，局势评分：{score:.2f}")
+        self.logger.info("Minimax AI落子：%s，局势评分：%.2f", self.best_move, score)
         return self.best_move
\ No newline at end of file
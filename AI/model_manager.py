@@ -2,9 +2,11 @@ import os
 import torch
 import zipfile
 import shutil
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from Common.config import Config
 from Common.logger import Logger
+from Common.data_utils import DataUtils
 from Storage.model_storage import ModelStorage
 from AI.rl_ai import RLAI
 from AI.nn_ai import NNAI
@@ -16,25 +18,56 @@ class ModelManager:
         self.logger = Logger.get_instance()
         self.model_storage = ModelStorage()
         self.model_dir = self.config.get('PATH', 'model_dir', './data/model')
+        # 模型目录文件名缓存：(目录mtime_ns, 文件名列表)，目录增删文件时自动失效
+        self._dir_listing: Tuple[int, List[str]] = (-1, [])
+        # 批量导出时并行读取文件的线程数
+        self.export_workers = min(4, os.cpu_count() or 1)
+        # 导入模型时的拷贝缓冲区大小（16MB，减少大文件读写次数）
+        self.copy_buffer_size = 16 << 20
+
+    def _list_model_dir(self) -> List[str]:
+        """列出模型目录文件名（目录未变化时直接返回缓存）"""
+        dir_mtime = os.stat(self.model_dir).st_mtime_ns
+        cached_mtime, names = self._dir_listing
+        if cached_mtime != dir_mtime:
+            with os.scandir(self.model_dir) as it:
+                names = [entry.name for entry in it]
+            self._dir_listing = (dir_mtime, names)
+        return names
 
     def get_user_models(self, user_id: str) -> List[Dict]:
-        """获取用户的所有模型"""
-        model_files = os.listdir(self.model_dir)
+        """获取用户的所有模型（目录列表按mtime缓存，单次遍历同时收集模型和元数据文件）"""
+        prefix = f"user_{user_id}_"
+        model_names = []
+        meta_names = set()
+        for name in self._list_model_dir():
+            if not name.startswith(prefix):
+                continue
+            if name.endswith('_meta.json'):
+                meta_names.add(name)
+            elif name.endswith('.pth'):
+                model_names.append(name)
+
         user_models = []
-        for file in model_files:
-            if file.startswith(f"user_{user_id}_") and file.endswith('.pth'):
-                # 解析模型信息
-                meta_file = file.replace('.pth', '_meta.json')
-                meta_path = os.path.join(self.model_dir, meta_file)
-                if os.path.exists(meta_path):
-                    with open(meta_path, 'r', encoding='utf-8') as f:
-                        meta_data = json.load(f)
-                    user_models.append({
-                        'name': file,
-                        'path': os.path.join(self.model_dir, file),
-                        'meta': meta_data,
-                        'timestamp': os.path.getmtime(os.path.join(self.model_dir, file))
-                    })
+        for file in model_names:
+            # 解析模型信息（元数据文件已在同一次遍历中收集）
+            meta_file = file.replace('.pth', '_meta.json')
+            if meta_file not in meta_names:
+                continue
+            meta_data = DataUtils.load_json_cached(os.path.join(self.model_dir, meta_file))
+            if meta_data is None:
+                continue
+            model_path = os.path.join(self.model_dir, file)
+            try:
+                timestamp = os.stat(model_path).st_mtime
+            except FileNotFoundError:
+                continue
+            user_models.append({
+                'name': file,
+                'path': model_path,
+                'meta': meta_data,
+                'timestamp': timestamp
+            })
         # 按时间排序（最新在前）
         user_models.sort(key=lambda x: x['timestamp'], reverse=True)
         return user_models
@@ -59,7 +92,9 @@ class ModelManager:
         # 加载所有模型参数
         models = []
         for path in model_paths:
-            checkpoint = torch.load(path, map_location=torch.device('cpu'))
+            # mmap按需分页读取（只读求均值，无需整文件读入内存）
+            DataUtils.advise_sequential_read(path)
+            checkpoint = torch.load(path, map_location='cpu', mmap=True, weights_only=True)
             models.append(checkpoint['policy_net_state_dict'] if 'policy_net_state_dict' in checkpoint else checkpoint)
         # 平均参数合并
         merged_state = {}
@@ -79,33 +114,62 @@ class ModelManager:
         return output_path
 
     def export_models(self, model_names: List[str], export_path: str) -> bool:
-        """批量导出模型（ZIP压缩）"""
+        """批量导出模型（.pth本身已是ZIP格式，直接存储不再压缩；仅元数据JSON压缩）"""
         try:
-            with zipfile.ZipFile(export_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for model_name in model_names:
-                    # 添加模型文件
-                    model_path = self.model_storage.get_model_path(model_name)
-                    if os.path.exists(model_path):
-                        zipf.write(model_path, arcname=os.path.basename(model_path))
-                    # 添加元数据文件
-                    meta_name = model_name.replace('.pth', '_meta.json')
-                    meta_path = os.path.join(self.model_dir, meta_name)
-                    if os.path.exists(meta_path):
-                        zipf.write(meta_path, arcname=meta_name)
+            # 先收集所有待导出文件：(源路径, 包内名称, 压缩方式)
+            entries = []
+            for model_name in model_names:
+                # 模型文件（不压缩）
+                model_path = self.model_storage.get_model_path(model_name)
+                if os.path.exists(model_path):
+                    entries.append((model_path, os.path.basename(model_path), zipfile.ZIP_STORED))
+                # 元数据文件（文本，DEFLATE压缩）
+                meta_name = model_name.replace('.pth', '_meta.json')
+                meta_path = os.path.join(self.model_dir, meta_name)
+                if os.path.exists(meta_path):
+                    entries.append((meta_path, meta_name, zipfile.ZIP_DEFLATED))
+
+            # 多线程并行读取文件，主线程按顺序写入ZIP（按批提交，限制同时驻留内存的文件数）
+            workers = min(self.export_workers, len(entries)) or 1
+            with ThreadPoolExecutor(max_workers=workers) as pool, \
+                    zipfile.ZipFile(export_path, 'w', zipfile.ZIP_STORED, allowZip64=True) as zipf:
+                for batch in DataUtils.split_batch(entries, workers):
+                    contents = pool.map(self._read_file, [src for src, _, _ in batch])
+                    for (src, arcname, compress_type), data in zip(batch, contents):
+                        zinfo = zipfile.ZipInfo.from_file(src, arcname=arcname)
+                        zipf.writestr(zinfo, data, compress_type=compress_type)
             self.logger.info(f"批量导出模型成功：{export_path}，共{len(model_names)}个模型")
             return True
         except Exception as e:
             self.logger.error(f"批量导出模型失败：{str(e)}")
             return False
 
+    @staticmethod
+    def _read_file(file_path: str) -> bytes:
+        """读取文件全部内容（供导出线程池使用）"""
+        with open(file_path, 'rb') as f:
+            return f.read()
+
     def import_models(self, import_path: str) -> bool:
-        """批量导入模型（ZIP解压）"""
+        """批量导入模型（ZIP解压，大缓冲区拷贝；模型目录为扁平结构，只取文件名防止路径穿越）"""
+        tmp_path = None
         try:
             with zipfile.ZipFile(import_path, 'r') as zipf:
-                zipf.extractall(self.model_dir)
+                for member in zipf.infolist():
+                    if member.is_dir():
+                        continue
+                    target_path = os.path.join(self.model_dir, os.path.basename(member.filename))
+                    # 先写临时文件再原子替换：已按mmap加载的旧检查点仍指向原文件，不会读到截断/写了一半的内容
+                    tmp_path = target_path + '.tmp'
+                    with zipf.open(member) as src, open(tmp_path, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, length=self.copy_buffer_size)
+                    os.replace(tmp_path, target_path)
+                    tmp_path = None
             self.logger.info(f"批量导入模型成功：{import_path}")
             return True
         except Exception as e:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
             self.logger.error(f"批量导入模型失败：{str(e)}")
             return False
 
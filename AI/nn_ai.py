@@ -5,10 +5,19 @@ from typing import List, Tuple, Dict, Optional, Callable
 from Common.constants import AI_LEVELS, PIECE_COLORS
 from Common.config import Config
 from Common.logger import Logger
+from Common.error_handler import AIError
+from Common.data_utils import DataUtils
 from AI.base_ai import BaseAI
 from Storage.model_storage import ModelStorage
 from Compute.gpu_accelerator import GPUAccelerator
 
+try:
+    from safetensors.torch import load_file as load_safetensors
+    SAFETENSORS_AVAILABLE = True
+except ImportError:
+    # 未安装safetensors时仅支持.pth模型
+    SAFETENSORS_AVAILABLE = False
+
 class NNNetwork(nn.Module):
     """神经网络模型（棋盘→落子概率）"""
     def __init__(self, input_size: int = 225, hidden_size: int = 1024, output_size: int = 225):
@@ -54,6 +63,12 @@ class NNAI(BaseAI):
         # 初始化模型
         self.model = NNNetwork(input_size=self.board_size**2, output_size=self.board_size**2).to(self.device)
         self.model.eval()
+        # 推理用模型（加载权重后按需量化；self.model保持float32供训练/保存）
+        self.infer_model: nn.Module = self.model
+        # 输入主机缓冲区（复用，GPU推理时为锁页内存以支持异步拷贝）
+        self._input_host = torch.zeros((1, 2, self.board_size, self.board_size), dtype=torch.float32)
+        if torch.device(self.device).type == 'cuda':
+            self._input_host = self._input_host.pin_memory()
         # 加载预训练模型
         if model_path:
             self.load_model(model_path)
@@ -62,12 +77,13 @@ class NNAI(BaseAI):
 
     def _preprocess_board(self, board: List[List[int]]) -> torch.Tensor:
         """预处理棋盘：转换为模型输入（batch, 2, 15, 15）"""
-        # 己方为1，对手为0（通道1）；对手为1，己方为0（通道2）
-        board_np = np.array(board, dtype=np.float32)
-        own_channel = (board_np == self.color).astype(np.float32)
-        opp_channel = (board_np == self.opponent_color).astype(np.float32)
-        input_tensor = torch.tensor(np.stack([own_channel, opp_channel], axis=0), dtype=torch.float32).unsqueeze(0)
-        return input_tensor.to(self.device)
+        # 己方为1，对手为0（通道1）；对手为1，己方为0（通道2）；直接写入复用的主机缓冲区
+        board_np = np.asarray(board, dtype=np.int8)
+        host = self._input_host.numpy()
+        host[0, 0] = board_np == self.color
+        host[0, 1] = board_np == self.opponent_color
+        # 锁页内存→显存异步拷贝（CPU推理时为原张量，无拷贝）
+        return self._input_host.to(self.device, non_blocking=True)
 
     def _idx_to_move(self, idx: int) -> Tuple[int, int]:
         """索引→落子坐标"""
@@ -76,15 +92,50 @@ class NNAI(BaseAI):
         return (x, y)
 
     def load_model(self, model_path: str):
-        """加载模型"""
-        checkpoint = torch.load(model_path, map_location=self.device)
+        """加载模型（mmap按需分页读取权重，检查点进程内缓存，重复导入只做内存拷贝；支持.safetensors）"""
+        if model_path.endswith('.safetensors') and not SAFETENSORS_AVAILABLE:
+            raise AIError(f"加载safetensors模型需要安装safetensors：{model_path}", 4002)
+        checkpoint = self._load_checkpoint_cached(model_path, str(self.device), self._read_checkpoint)
+        # 缓存中的张量被多个实例共享，这里复制到本模型参数而不直接引用
         if 'model_state_dict' in checkpoint:
             self.model.load_state_dict(checkpoint['model_state_dict'])
         else:
             self.model.load_state_dict(checkpoint)
         self.model.eval()
+        self._build_inference_model()
         self.logger.info(f"加载神经网络模型成功：{model_path}")
 
+    def _build_inference_model(self):
+        """生成推理模型（CPU推理时全连接层动态量化为int8，权重读取量降为1/4；GPU或量化不可用时沿用float32模型）"""
+        self.infer_model = self.model
+        if torch.device(self.device).type == 'cpu' and self.config.get_bool('AI', 'quantize_int8', True):
+            try:
+                # 逐层scale的int8权重，激活值运行时动态量化（fbgemm后端在支持VNNI的CPU上自动使用对应指令）
+                self.infer_model = torch.ao.quantization.quantize_dynamic(self.model, {nn.Linear}, dtype=torch.qint8)
+            except (RuntimeError, AttributeError) as e:
+                self.logger.warning(f"模型int8量化失败，使用float32推理：{str(e)}")
+        if self.config.get_bool('AI', 'compile_model', True):
+            self.infer_model = self._compile_model(self.infer_model)
+
+    def _compile_model(self, model: nn.Module) -> nn.Module:
+        """权重固定后把推理模型编译为冻结的TorchScript（权重折叠为常量、算子融合，推理时不再逐模块走Python调度）"""
+        example = torch.zeros(1, 2, self.board_size, self.board_size, device=self.device)
+        try:
+            with torch.no_grad():
+                traced = torch.jit.trace(model, example)
+            return torch.jit.optimize_for_inference(torch.jit.freeze(traced))
+        except (RuntimeError, AttributeError) as e:
+            self.logger.warning(f"模型编译失败，使用未编译模型推理：{str(e)}")
+            return model
+
+    def _read_checkpoint(self, model_path: str) -> Dict:
+        """从磁盘读取检查点（safetensors直接mmap；.pth先提示顺序预读再mmap反序列化）"""
+        if model_path.endswith('.safetensors'):
+            # safetensors为扁平张量布局，直接mmap读取，无需反序列化对象图
+            return load_safetensors(model_path, device=str(self.device))
+        DataUtils.advise_sequential_read(model_path)
+        return torch.load(model_path, map_location=self.device, mmap=True, weights_only=True)
+
     def load_best_model(self):
         """加载最优模型"""
         best_model_path = self.model_storage.find_best_model('nn')
@@ -110,7 +161,7 @@ class NNAI(BaseAI):
 
         # 模型预测
         with torch.no_grad():
-            output = self.model(input_tensor)
+            output = self.infer_model(input_tensor)
             prob = output.cpu().numpy()[0]  # 落子概率分布
 
         # 过滤已落子位置
@@ -120,16 +171,14 @@ class NNAI(BaseAI):
         best_idx = np.argmax(prob)
         best_move = self._idx_to_move(best_idx)
 
-        # 思维可视化：更新概率热力图
-        for x in range(self.board_size):
-            for y in range(self.board_size):
-                idx = self._move_to_idx((x, y))
-                thinking_data['scores'][x][y] = prob[idx] * 100
+        # 思维可视化：更新概率热力图（索引与x*board_size+y一致，直接整形）
+        thinking_data['scores'] = prob.reshape(self.board_size, self.board_size) * 100
         thinking_data['best_move'] = best_move
-        thinking_data['considering_moves'] = [self._idx_to_move(np.argsort(prob)[-i-1]) for i in range(5)]
+        top_moves = np.argsort(prob)[::-1][:5]
+        thinking_data['considering_moves'] = [self._idx_to_move(int(idx)) for idx in top_moves]
         self._notify_thinking(thinking_data)
 
-        self.logger.info(f"神经网络AI落子：{best_move}，预测概率：{prob[best_idx]:.2%}")
+        self.logger.info("神经网络AI落子：%s，预测概率：%.2f%%", best_move, prob[best_idx] * 100)
         return best_move
 
     def _move_to_idx(self, move: Tuple[int, int]) -> int:
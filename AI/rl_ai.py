@@ -3,11 +3,13 @@ import torch.nn as nn
 import torch.optim as optim
 import numpy as np
 import random
+import copy
 from collections import deque
 from typing import List, Tuple, Dict, Optional, Callable
 from Common.constants import PIECE_COLORS, AI_LEVELS, EVAL_WEIGHTS
 from Common.config import Config
 from Common.logger import Logger
+from Common.data_utils import DataUtils
 from AI.base_ai import BaseAI
 from AI.evaluator import BoardEvaluator
 from Compute.cpp_interface import CppCore
@@ -342,15 +344,25 @@ class RLAI(BaseAI):
         """加载最优模型"""
         best_model_path = self.model_storage.find_best_model('rl')
         if best_model_path:
-            checkpoint = torch.load(best_model_path, map_location=self.device)
-            self.policy_net.load_state_dict(checkpoint['policy_net_state_dict'])
-            self.target_net.load_state_dict(checkpoint['target_net_state_dict'])
-            self.optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
-            self.train_step = checkpoint['train_step']
-            self.self_play_games = checkpoint['self_play_games']
-            self.best_win_rate = checkpoint['best_win_rate']
+            self.load_model(best_model_path)
             self.logger.info(f"加载最优RL模型成功：{best_model_path}，胜率：{self.best_win_rate:.2%}")
 
+    def load_model(self, model_path: str):
+        """加载指定RL模型（mmap按需分页读取，文件在进程生命周期内需保留在磁盘上）"""
+        checkpoint = self._load_checkpoint_cached(model_path, str(self.device), self._read_checkpoint)
+        self.policy_net.load_state_dict(checkpoint['policy_net_state_dict'])
+        self.target_net.load_state_dict(checkpoint['target_net_state_dict'])
+        # 优化器会原地更新状态张量，深拷贝后再加载以免污染缓存的检查点
+        self.optimizer.load_state_dict(copy.deepcopy(checkpoint['optimizer_state_dict']))
+        self.train_step = checkpoint['train_step']
+        self.self_play_games = checkpoint['self_play_games']
+        self.best_win_rate = checkpoint['best_win_rate']
+
+    def _read_checkpoint(self, model_path: str) -> Dict:
+        """从磁盘读取检查点（先提示顺序预读，再mmap反序列化）"""
+        DataUtils.advise_sequential_read(model_path)
+        return torch.load(model_path, map_location=self.device, mmap=True, weights_only=True)
+
     def stop_training(self):
         """停止训练"""
         self.running = False
\ No newline at end of file
@@ -1,9 +1,8 @@
 import os
 import json
-import csv
 import time
 from typing import List, Dict, Optional
-from Common.constants import PIECE_COLORS
+from Common.constants import PIECE_COLORS, COLOR_SWITCH
 from Common.logger import Logger
 from Common.data_utils import DataUtils  # 补充数据工具类依赖
 from Storage.train_data_storage import TrainDataStorage
@@ -70,7 +69,7 @@ class TrainingManager:
                     result = 'draw'
 
                 # 切换玩家
-                current_color = PIECE_COLORS['WHITE'] if current_color == PIECE_COLORS['BLACK'] else PIECE_COLORS['BLACK']
+                current_color ^= COLOR_SWITCH
 
             # 补充游戏结果并汇总数据
             for data in game_data:
@@ -98,36 +97,35 @@ class TrainingManager:
             return False
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                data = list(reader)
-
-                # 数据格式校验（必填字段）
-                required_columns = ['board', 'move', 'color', 'pattern', 'score', 'quality', 'result']
-                missing_cols = [col for col in required_columns if col not in reader.fieldnames]
-                if missing_cols:
-                    raise ValueError(f"缺少必填字段：{','.join(missing_cols)}")
-
-                # 数据格式清洗
-                cleaned_data = []
-                for item in data:
-                    # 校验落子格式
-                    try:
-                        x, y = map(int, item['move'].split(','))
-                    except:
-                        self.logger.warning(f"跳过无效落子数据：{item['move']}")
-                        continue
-                    # 标准化棋盘格式
-                    item['board'] = DataUtils.board_to_str(DataUtils.str_to_board(item['board']))
-                    # 补充默认字段
-                    item['timestamp'] = item.get('timestamp', time.time())
-                    item['game_id'] = f"manual_{user_id}_{int(time.time())}_{len(cleaned_data)}"
-                    cleaned_data.append(item)
-
-                # 保存到本地存储
-                self.train_data_storage.save_train_data(user_id, cleaned_data)
-                self.logger.info(f"人工数据导入成功：{file_path}，有效数据{len(cleaned_data)}/{len(data)}条")
-                return True
+            data = DataUtils.load_csv(file_path) or []
+
+            # 数据格式校验（必填字段）
+            required_columns = ['board', 'move', 'color', 'pattern', 'score', 'quality', 'result']
+            fieldnames = DataUtils.load_csv_headers(file_path)
+            missing_cols = [col for col in required_columns if col not in fieldnames]
+            if missing_cols:
+                raise ValueError(f"缺少必填字段：{','.join(missing_cols)}")
+
+            # 数据格式清洗
+            cleaned_data = []
+            for item in data:
+                # 校验落子格式
+                try:
+                    x, y = map(int, item['move'].split(','))
+                except:
+                    self.logger.warning(f"跳过无效落子数据：{item['move']}")
+                    continue
+                # 标准化棋盘格式
+                item['board'] = DataUtils.board_to_str(DataUtils.str_to_board(item['board']))
+                # 补充默认字段
+                item['timestamp'] = item.get('timestamp', time.time())
+                item['game_id'] = f"manual_{user_id}_{int(time.time())}_{len(cleaned_data)}"
+                cleaned_data.append(item)
+
+            # 保存到本地存储
+            self.train_data_storage.save_train_data(user_id, cleaned_data)
+            self.logger.info(f"人工数据导入成功：{file_path}，有效数据{len(cleaned_data)}/{len(data)}条")
+            return True
 
         except Exception as e:
             self.logger.error(f"人工数据导入失败：{str(e)}")
@@ -179,10 +177,7 @@ class TrainingManager:
 
             # 保存预处理后的数据（CSV格式）
             output_path = os.path.join(self.data_dir, output_file)
-            with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=processed_data[0].keys())
-                writer.writeheader()
-                writer.writerows(processed_data)
+            DataUtils.save_csv(processed_data, output_path, list(processed_data[0].keys()))
 
             self.logger.info(f"训练数据预处理完成：{output_path}，处理数据{len(processed_data)}条")
             return True
@@ -1,7 +1,8 @@
 import os
+import io
 import json
 import configparser
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable
 from Common.logger import Logger
 from Common.error_handler import ConfigError
 
@@ -23,6 +24,8 @@ class Config:
         self.config_dir = os.path.join(os.getcwd(), 'data', 'config')
         self.config_file = os.path.join(self.config_dir, 'game_config.ini')
         self.json_config_file = os.path.join(self.config_dir, 'ai_config.json')
+        # INI配置变更监听器：callback(section, key, value)，供缓存配置值的组件刷新
+        self._ini_listeners: List[Callable[[str, str, str], None]] = []
         self._create_dir()
         self._load_config()
 
@@ -154,6 +157,30 @@ class Config:
             json.dump(self.json_config, f, ensure_ascii=False, indent=2)
         self.logger.info(f"JSON配置保存至：{self.json_config_file}")
 
+    def persist(self):
+        """一次性保存INI+JSON配置（先在内存序列化同一时刻的快照，再依次写盘，只记一条日志）"""
+        ini_buffer = io.StringIO()
+        self.ini_config.write(ini_buffer)
+        json_text = json.dumps(self.json_config, ensure_ascii=False, indent=2)
+        for path, text in ((self.config_file, ini_buffer.getvalue()), (self.json_config_file, json_text)):
+            self._write_atomic(path, text)
+        self.logger.info(f"配置保存至：{self.config_dir}")
+
+    @staticmethod
+    def _write_atomic(path: str, text: str):
+        """写入文本文件（先写临时文件再原子替换，退出途中崩溃不会截断原配置，与DataUtils.save_json一致）"""
+        tmp_path = path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
     def get(self, section: str, key: str, default: Any = None) -> str:
         """获取INI配置值"""
         try:
@@ -201,6 +228,12 @@ class Config:
             self.ini_config[section] = {}
         self.ini_config[section][key] = value
         self.save_ini()
+        for listener in self._ini_listeners:
+            listener(section, key, value)
+
+    def add_ini_listener(self, listener: Callable[[str, str, str], None]):
+        """注册INI配置变更监听器（set_ini写入后回调）"""
+        self._ini_listeners.append(listener)
 
     def set_json(self, key: str, value: Any):
         """设置JSON配置"""
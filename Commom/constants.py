@@ -30,6 +30,9 @@ class PIECE_COLORS:
     BLACK = 1       # 黑棋
     WHITE = 2       # 白棋
 
+# 黑白互换掩码（color ^ COLOR_SWITCH 即为对手颜色，替代if/else分支）
+COLOR_SWITCH: int = PIECE_COLORS.BLACK ^ PIECE_COLORS.WHITE
+
 # 游戏模式常量
 class GAME_MODES:
     PVE = 'pve'         # 人机对战
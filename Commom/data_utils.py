@@ -1,14 +1,64 @@
 import os
+import copy
 import json
 import time
 import random
 import hashlib
+import functools
+import itertools
 from typing import List, Tuple, Dict, Optional, Any
 import numpy as np
 from Common.constants import PIECE_COLORS
 from Common.config import Config
 from Common.error_handler import StorageError
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    # 未安装pyarrow时使用标准库csv
+    PYARROW_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    # 未安装orjson时使用标准库json
+    ORJSON_AVAILABLE = False
+
+
+def _json_dumps(data: Any, pretty: bool = False) -> bytes:
+    """JSON序列化为UTF-8字节（优先orjson；默认紧凑格式，pretty=True时缩进便于人工查看）"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _json_loads(raw: bytes) -> Any:
+    """JSON反序列化（优先orjson，直接解析字节无需先解码）"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+# 进程内唯一ID序号（itertools.count自增由GIL保证原子性，无需加锁）
+_ID_SEQUENCE = itertools.count()
+
+
+@functools.lru_cache(maxsize=256)
+def _load_json_by_stat(file_path: str, mtime_ns: int, size: int) -> Any:
+    """按文件stat签名缓存JSON解析结果（mtime/大小变化即自动失效）"""
+    try:
+        with open(file_path, 'rb') as f:
+            return _json_loads(f.read())
+    except Exception as e:
+        raise StorageError(f"加载JSON失败：{str(e)}", 6001)
+
 class DataUtils:
     """数据转换与工具类"""
     @staticmethod
@@ -41,10 +91,9 @@ class DataUtils:
 
     @staticmethod
     def generate_unique_id(length: int = 16) -> str:
-        """生成唯一ID（基于时间+随机数）"""
-        timestamp = str(int(time.time() * 1000))
-        random_str = ''.join(random.choices('0123456789abcdef', k=8))
-        return hashlib.md5((timestamp + random_str).encode('utf-8')).hexdigest()[:length]
+        """生成唯一ID（基于时间+进程内序号+随机数）"""
+        seed = f"{time.time_ns()}_{next(_ID_SEQUENCE)}_{random.getrandbits(32)}"
+        return hashlib.md5(seed.encode('utf-8')).hexdigest()[:length]
 
     @staticmethod
     def get_current_time_str() -> str:
@@ -77,16 +126,22 @@ class DataUtils:
         return True
 
     @staticmethod
-    def save_json(data: Any, file_path: str) -> bool:
-        """保存JSON文件（Win11兼容）"""
+    def save_json(data: Any, file_path: str, pretty: bool = False) -> bool:
+        """保存JSON文件（先写临时文件再原子替换，中途崩溃不会截断原文件；默认紧凑格式）"""
+        tmp_path = file_path + '.tmp'
         try:
             dir_path = os.path.dirname(file_path)
-            if not os.path.exists(dir_path):
+            if dir_path and not os.path.exists(dir_path):
                 os.makedirs(dir_path)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(tmp_path, 'wb', buffering=1 << 20) as f:
+                f.write(_json_dumps(data, pretty))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
             return True
         except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
             raise StorageError(f"保存JSON失败：{str(e)}", 6001)
 
     @staticmethod
@@ -95,18 +150,48 @@ class DataUtils:
         if not os.path.exists(file_path):
             return None
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(file_path, 'rb') as f:
+                return _json_loads(f.read())
         except Exception as e:
             raise StorageError(f"加载JSON失败：{str(e)}", 6001)
 
+    @staticmethod
+    def load_json_cached(file_path: str) -> Optional[Dict]:
+        """加载JSON文件（带缓存，文件未修改时不重复读取/解析；返回深拷贝，调用方修改结果不会污染缓存）"""
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        return copy.deepcopy(_load_json_by_stat(file_path, st.st_mtime_ns, st.st_size))
+
+    @staticmethod
+    def advise_sequential_read(file_path: str):
+        """提示内核按顺序预读整个文件（大模型加载前调用；不支持posix_fadvise的平台如Windows直接跳过）"""
+        if not hasattr(os, 'posix_fadvise'):
+            return
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
     @staticmethod
     def save_csv(data: List[Dict], file_path: str, headers: List[str]) -> bool:
-        """保存CSV文件"""
+        """保存CSV文件（优先使用pyarrow批量写入，未安装时降级为csv模块）"""
         try:
             dir_path = os.path.dirname(file_path)
-            if not os.path.exists(dir_path):
+            if dir_path and not os.path.exists(dir_path):
                 os.makedirs(dir_path)
+            if PYARROW_AVAILABLE and data:
+                # 显式按字符串列写入（与csv模块一致按str格式化），混合int/str的列不会触发Arrow类型推断失败
+                schema = pa.schema([(key, pa.string()) for key in headers])
+                columns = {key: [None if row.get(key) is None else str(row.get(key)) for row in data] for key in headers}
+                pa_csv.write_csv(pa.Table.from_pydict(columns, schema=schema), file_path)
+                return True
             import csv
             with open(file_path, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.DictWriter(f, fieldnames=headers)
@@ -118,17 +203,38 @@ class DataUtils:
 
     @staticmethod
     def load_csv(file_path: str) -> Optional[List[Dict]]:
-        """加载CSV文件"""
+        """加载CSV文件（字段值均为字符串，与csv.DictReader一致）"""
         if not os.path.exists(file_path):
             return None
         try:
             import csv
+            if PYARROW_AVAILABLE:
+                # 先读表头，按字符串类型整列解析（C实现，无逐单元格Python调用）
+                headers = DataUtils.load_csv_headers(file_path)
+                if not headers:
+                    return []
+                convert_options = pa_csv.ConvertOptions(column_types={name: pa.string() for name in headers})
+                # 允许引号内换行（与csv模块一致）；列数不齐等pyarrow无法解析的文件改走DictReader逐行读取
+                parse_options = pa_csv.ParseOptions(newlines_in_values=True)
+                try:
+                    return pa_csv.read_csv(
+                        file_path, parse_options=parse_options, convert_options=convert_options
+                    ).to_pylist()
+                except pa.ArrowInvalid:
+                    pass
             with open(file_path, 'r', newline='', encoding='utf-8') as f:
                 reader = csv.DictReader(f)
                 return list(reader)
         except Exception as e:
             raise StorageError(f"加载CSV失败：{str(e)}", 6001)
 
+    @staticmethod
+    def load_csv_headers(file_path: str) -> List[str]:
+        """读取CSV表头（仅有表头的文件也能取得字段名）"""
+        import csv
+        with open(file_path, 'r', newline='', encoding='utf-8') as f:
+            return next(csv.reader(f), None) or []
+
     @staticmethod
     def calculate_crc32(data: bytes) -> int:
         """计算CRC32校验码"""
@@ -1,17 +1,24 @@
-from typing import Dict, Callable, List, Any
+import time
+from collections import deque
+from typing import Dict, Callable, List, Any, Optional
 from Common.logger import Logger
 
 class Event:
     """事件类"""
+    _pooled = False  # 是否来自事件管理器的对象池（分发后回收复用）
+
     def __init__(self, event_type: str, data: Dict = None):
         self.type = event_type
         self.data = data or {}
         self.timestamp = self._get_timestamp()
 
+    def reset(self, event_type: str, data: Dict = None):
+        """原地重置事件内容（对象池复用时调用）"""
+        self.__init__(event_type, data)
+
     def _get_timestamp(self) -> int:
-        """获取事件时间戳"""
-        import time
-        return int(time.time() * 1000)
+        """获取事件时间戳（毫秒，墙钟时间；计时/超时请使用time.monotonic）"""
+        return time.time_ns() // 1000000
 
     def to_dict(self) -> Dict:
         """转换为字典"""
@@ -22,11 +29,26 @@ class Event:
         }
 
 class EventManager:
-    """事件管理器（发布-订阅模式）"""
+    """事件管理器（发布-订阅模式，支持按帧分层批量分发）"""
+    # 批量分发层级：先读（几何/状态查询）→ 写（状态修改）→ 写后读
+    LEVEL_READ = 0
+    LEVEL_WRITE = 1
+    LEVEL_READ_AFTER_WRITE = 2
+    LEVEL_COUNT = 3
+    EVENT_POOL_SIZE = 64  # 事件对象池容量
+
     def __init__(self):
         self.logger = Logger.get_instance()
         self.event_listeners: Dict[str, List[Callable[[Event], None]]] = {}
         self.lock = __import__('threading').Lock()
+        # 本帧缓冲的事件（按层级存放，flush_frame时统一分发）
+        self._pending: List[List[Event]] = [[] for _ in range(self.LEVEL_COUNT)]
+        # 事件对象池（高频转发的事件复用同一批对象，减少分配和GC）
+        self._event_free: deque = deque(maxlen=self.EVENT_POOL_SIZE)
+        for _ in range(self.EVENT_POOL_SIZE):
+            pooled = Event.__new__(Event)
+            pooled._pooled = True
+            self._event_free.append(pooled)
 
     def register(self, event_type: str, listener: Callable[[Event], None]):
         """注册事件监听器"""
@@ -34,7 +56,7 @@ class EventManager:
             if event_type not in self.event_listeners:
                 self.event_listeners[event_type] = []
             self.event_listeners[event_type].append(listener)
-            self.logger.debug(f"注册事件监听器：{event_type}")
+            self.logger.debug("注册事件监听器：%s", event_type)
 
     def unregister(self, event_type: str, listener: Callable[[Event], None]):
         """注销事件监听器"""
@@ -42,28 +64,67 @@ class EventManager:
             if event_type in self.event_listeners:
                 if listener in self.event_listeners[event_type]:
                     self.event_listeners[event_type].remove(listener)
-                    self.logger.debug(f"注销事件监听器：{event_type}")
+                    self.logger.debug("注销事件监听器：%s", event_type)
                 if not self.event_listeners[event_type]:
                     del self.event_listeners[event_type]
 
-    def emit(self, event: Event):
-        """发布事件"""
+    def emit(self, event: Event, level: Optional[int] = None):
+        """发布事件（level为空时立即分发；否则缓冲到对应层级，由flush_frame统一分发）"""
+        if level is not None:
+            with self.lock:
+                self._pending[level].append(event)
+            return
+        self._dispatch(event)
+
+    def emit_pooled(self, event_type: str, data: Dict = None, level: int = LEVEL_WRITE):
+        """从对象池取事件对象发布（缓冲到对应层级，flush_frame分发后自动回收；监听器不应持有该事件对象）"""
         with self.lock:
-            event_type = event.type
-            if event_type not in self.event_listeners:
-                self.logger.debug(f"无监听器的事件：{event_type}")
-                return
-            # 触发所有监听器
-            for listener in self.event_listeners[event_type]:
-                try:
-                    listener(event)
-                except Exception as e:
-                    self.logger.error(f"事件{event_type}监听器执行失败：{str(e)}")
+            event = self._event_free.pop() if self._event_free else None
+        if event is None:
+            event = Event.__new__(Event)
+            event._pooled = True
+        event.reset(event_type, data)
+        self.emit(event, level)
+
+    def flush_frame(self) -> int:
+        """按层级顺序分发本帧缓冲的事件（分发期间新缓冲的事件留到下一帧），返回分发数量"""
+        with self.lock:
+            batches = self._pending
+            if not any(batches):
+                return 0
+            self._pending = [[] for _ in range(self.LEVEL_COUNT)]
+        count = 0
+        for batch in batches:
+            for event in batch:
+                self._dispatch(event)
+                count += 1
+                if event._pooled:
+                    event.data = None  # 释放数据引用，等待下次复用
+                    with self.lock:
+                        self._event_free.append(event)
+        return count
+
+    def _dispatch(self, event: Event):
+        """分发单个事件（锁内只复制监听器列表，监听器在锁外执行，可安全地注册/发布事件）"""
+        event_type = event.type
+        with self.lock:
+            listeners = self.event_listeners.get(event_type)
+            listeners = list(listeners) if listeners else None
+        if listeners is None:
+            self.logger.debug("无监听器的事件：%s", event_type)
+            return
+        # 触发所有监听器
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                self.logger.error(f"事件{event_type}监听器执行失败：{str(e)}")
 
     def clear(self):
         """清空所有监听器"""
         with self.lock:
             self.event_listeners.clear()
+            self._pending = [[] for _ in range(self.LEVEL_COUNT)]
             self.logger.debug("清空所有事件监听器")
 
     def get_listener_count(self, event_type: str) -> int:
@@ -61,25 +61,29 @@ class Logger:
 
         return logger
 
-    def debug(self, message: str):
-        """调试日志"""
-        self.logger.debug(message)
+    def debug(self, message: str, *args):
+        """调试日志（args非空时按%格式延迟拼接，级别未启用则不格式化）"""
+        self.logger.debug(message, *args)
 
-    def info(self, message: str):
-        """信息日志"""
-        self.logger.info(message)
+    def info(self, message: str, *args):
+        """信息日志（args非空时按%格式延迟拼接，级别未启用则不格式化）"""
+        self.logger.info(message, *args)
 
-    def warning(self, message: str):
-        """警告日志"""
-        self.logger.warning(message)
+    def warning(self, message: str, *args):
+        """警告日志（args非空时按%格式延迟拼接，级别未启用则不格式化）"""
+        self.logger.warning(message, *args)
 
-    def error(self, message: str):
-        """错误日志"""
-        self.logger.error(message)
+    def error(self, message: str, *args):
+        """错误日志（args非空时按%格式延迟拼接，级别未启用则不格式化）"""
+        self.logger.error(message, *args)
 
-    def critical(self, message: str):
-        """严重错误日志"""
-        self.logger.critical(message)
+    def critical(self, message: str, *args):
+        """严重错误日志（args非空时按%格式延迟拼接，级别未启用则不格式化）"""
+        self.logger.critical(message, *args)
+
+    def is_enabled_for(self, level: int) -> bool:
+        """判断指定日志级别是否启用（用于跳过高频路径上的日志参数构造）"""
+        return self.logger.isEnabledFor(level)
 
     def exception(self, message: str, exc_info: Optional[Exception] = None):
         """异常日志"""
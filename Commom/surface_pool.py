@@ -0,0 +1,62 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+import pygame
+
+
+def convert_alpha_safe(surface: pygame.Surface) -> pygame.Surface:
+    """转换为显示器像素格式（带alpha），使后续blit免去逐次格式转换；显示模式未设置时原样返回"""
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha()
+
+
+class SurfacePool:
+    """透明临时表面池（单例模式，按尺寸复用SRCALPHA表面，减少每帧分配/释放）"""
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._init()
+        return cls._instance
+
+    def _init(self):
+        self.max_per_size = 8  # 每种尺寸最多缓存的空闲表面数（防止无限增长）
+        self._free: Dict[Tuple[int, int], List[pygame.Surface]] = {}
+
+    def acquire(self, width: int, height: int) -> pygame.Surface:
+        """取出一张已清空的透明表面（池中无可用时新建）"""
+        free_list = self._free.get((width, height))
+        if free_list:
+            surface = free_list.pop()
+            surface.fill((0, 0, 0, 0))
+            return surface
+        return pygame.Surface((width, height), pygame.SRCALPHA)
+
+    def release(self, surface: pygame.Surface):
+        """归还表面（超出容量上限时直接丢弃）"""
+        free_list = self._free.setdefault(surface.get_size(), [])
+        if len(free_list) < self.max_per_size:
+            free_list.append(surface)
+
+    @contextmanager
+    def borrow(self, width: int, height: int) -> Iterator[pygame.Surface]:
+        """借用表面（with语句结束后自动归还）"""
+        surface = self.acquire(width, height)
+        try:
+            yield surface
+        finally:
+            self.release(surface)
+
+    def clear(self):
+        """清空表面池"""
+        self._free.clear()
+
+    @staticmethod
+    def get_instance() -> 'SurfacePool':
+        """获取单例实例"""
+        return SurfacePool()
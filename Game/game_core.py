@@ -1,7 +1,11 @@
 import time
+import queue
+import functools
 import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor, Future
 from typing import List, Tuple, Dict, Optional, Callable
-from Common.constants import PIECE_COLORS, GAME_MODES, AI_LEVELS, EVAL_WEIGHTS
+from Common.constants import PIECE_COLORS, GAME_MODES, AI_LEVELS, EVAL_WEIGHTS, COLOR_SWITCH
 from Common.config import Config
 from Common.logger import Logger
 from Common.data_utils import DataUtils
@@ -18,28 +22,33 @@ from Compute.cpp_interface import CppCore
 from Game.game_mode import GameModeManager
 from Game.rule_engine import RuleEngine
 from Game.ranking_system import ELORankingSystem
+from AI.minimax_ai import zobrist_table
 
 class GameCore:
     """游戏核心管理器（单例模式+事件驱动，统筹所有游戏逻辑）"""
     _instance = None
     _lock = threading.Lock()
 
-    def __new__(cls):
+    def __new__(cls, event_manager: Optional[EventManager] = None):
         if cls._instance is None:
             with cls._lock:
                 if cls._instance is None:
                     cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self):
+    def __init__(self, event_manager: Optional[EventManager] = None):
         if hasattr(self, '_initialized'):
+            # 界面传入自己的事件管理器时改用它（核心事件与界面在同一管理器上分发/按帧缓冲）
+            if event_manager is not None and event_manager is not self.event_manager:
+                self.event_manager = event_manager
+                self._register_events()
             return
         self._initialized = True
 
         # 基础配置与工具
         self.config = Config.get_instance()
         self.logger = Logger.get_instance()
-        self.event_manager = EventManager()
+        self.event_manager = event_manager or EventManager()
         self.cpp_core = CppCore()
         self.data_utils = DataUtils()
 
@@ -54,14 +63,23 @@ class GameCore:
         self.user_storage = UserStorage()
         self.game_storage = GameRecordStorage()
         self.ranking_storage = RankingStorage()
+        # 对战记录后台写入（单线程保证写入顺序，落子/AI线程不等待磁盘IO）
+        self._record_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='record_writer')
 
         # 游戏状态（线程安全）
-        self.state_lock = threading.Lock()
+        self.state_lock = threading.RLock()  # 可重入：set_mode/transition_to持锁时会调用reset_game
         self.board_size = self.config.board_size
         self.board = [[PIECE_COLORS['EMPTY'] for _ in range(self.board_size)] for _ in range(self.board_size)]
+        # 当前局面的Zobrist哈希（落子时增量异或更新，与Minimax置换表使用同一随机数表）
+        self._zobrist = zobrist_table(self.board_size)
+        self.zkey = 0
         self.move_history = []  # 落子历史：[(x,y,color,is_ai,timestamp,score,quality)]
+        # 落子质量列（复盘统计直接读取，避免遍历字典列表）
+        self.mh_quality = array('d')
         self.game_active = False
         self.current_player = PIECE_COLORS['BLACK']
+        # 对局代次（重置/停止时递增；AI请求携带发起时的代次，落子时代次不符即丢弃上一局的迟到落子）
+        self.game_generation = 0
         self.game_result = None  # 最终结果：{'winner': 'black/white/draw', 'win_line': [], 'ranking_update': {}}
 
         # 模式配置
@@ -71,6 +89,9 @@ class GameCore:
         self.ai_first = False
         self.current_ai: Optional[BaseAI] = None
         self.ai_team: Optional[AIFleet] = None
+        # AI常驻工作线程（落子/换模型任务经队列串行执行，避免每步新建线程，AI模型/缓存保持热态）
+        self._ai_requests: "queue.Queue[Callable[[], None]]" = queue.Queue()
+        self._ai_worker: Optional[threading.Thread] = None
 
         # 联机相关
         self.is_online = False
@@ -83,12 +104,19 @@ class GameCore:
         # 训练相关
         self.is_training = False
         self.train_user_id = None
+        self.model_path: Optional[str] = None  # 当前AI加载的自定义模型路径（训练子进程据此还原AI）
         self.train_progress = 0.0  # 训练进度（0-100）
 
         # 性能优化：评估缓存
         self.eval_cache = {}
         self.cache_max_size = 1000
 
+        # 性能优化：用户昵称缓存（user_id -> (缓存时间, 昵称)）
+        self.nickname_cache: Dict[str, Tuple[float, str]] = {}
+        self.nickname_cache_ttl = 60.0
+        # 当前用户ELO积分（对局结束更新排行榜时刷新，界面直接读取，不再逐帧查询存储）
+        self.current_elo: Optional[int] = None
+
         # 注册事件监听
         self._register_events()
 
@@ -124,7 +152,7 @@ class GameCore:
     def _on_move_made(self, event: Event):
         """落子事件"""
         move_data = event.data
-        self.logger.info(f"落子记录：({move_data['x']},{move_data['y']})，颜色={move_data['color']}，AI={move_data['is_ai']}")
+        self.logger.info("落子记录：(%s,%s)，颜色=%s，AI=%s", move_data['x'], move_data['y'], move_data['color'], move_data['is_ai'])
         self.event_manager.emit(Event('ui_update', {'type': 'move_made', 'data': move_data}))
 
     def _on_game_end(self, event: Event):
@@ -132,16 +160,17 @@ class GameCore:
         self.game_active = False
         self.logger.info(f"游戏结束：结果={self.game_result}")
 
-        # 保存对战记录
-        self.game_storage.save_game_record({
+        # 保存对战记录（落子历史取快照后交给后台线程写盘，新对局重置棋局不影响待写记录）
+        record = {
             'user_id': self.train_user_id,
             'mode': self.current_mode,
-            'move_history': self.move_history,
+            'move_history': list(self.move_history),
             'result': self.game_result,
             'timestamp': time.time(),
             'ai_level': self.ai_level,
             'ai_type': self.ai_type
-        })
+        }
+        self._record_writer.submit(self.game_storage.save_game_record, record).add_done_callback(self._on_record_saved)
 
         # 联机模式更新排行榜
         if self.is_online and self.game_result and self.game_result['winner'] != 'draw':
@@ -153,6 +182,12 @@ class GameCore:
 
         self.event_manager.emit(Event('ui_update', {'type': 'game_end', 'data': self.game_result}))
 
+    def _on_record_saved(self, future: Future):
+        """对战记录后台写入完成回调（仅记录失败日志）"""
+        error = future.exception()
+        if error is not None:
+            self.logger.error(f"保存对战记录失败：{str(error)}")
+
     def _on_model_saved(self, event: Event):
         """模型保存事件"""
         model_data = event.data
@@ -189,8 +224,10 @@ class GameCore:
     def reset_game(self):
         """重置游戏状态"""
         with self.state_lock:
+            self.game_generation += 1
             self.board = [[PIECE_COLORS['EMPTY'] for _ in range(self.board_size)] for _ in range(self.board_size)]
-            self.move_history.clear()
+            self.zkey = 0
+            self._clear_move_columns()
             self.game_active = True
             self.current_player = PIECE_COLORS['BLACK']
             self.game_result = None
@@ -198,13 +235,47 @@ class GameCore:
 
             # AI先手逻辑
             if self.ai_first and self.current_ai:
-                threading.Thread(target=self.ai_move, daemon=True).start()
+                self.request_ai_move()
 
-    def place_piece(self, x: int, y: int, is_ai: bool = False) -> str:
-        """玩家落子（含合法性校验）"""
+    def transition_to(self, state: str):
+        """游戏状态迁移（一次加锁完成停止+清盘；state：'stopped'停止并清空棋局，'ready'重置为可开局状态）"""
+        with self.state_lock:
+            if state == 'ready':
+                self.reset_game()
+                return
+            if state != 'stopped':
+                raise GameError(f"不支持的游戏状态：{state}", 2004)
+            self.game_generation += 1
+            self.board = [[PIECE_COLORS.EMPTY for _ in range(self.board_size)] for _ in range(self.board_size)]
+            self.zkey = 0
+            self._clear_move_columns()
+            self.game_active = False
+            self.game_result = None
+            self.eval_cache.clear()
+        # 锁外发布停止事件（监听器可能回调GameCore）
+        self.event_manager.emit(Event('game_stop'))
+
+    def stop_game(self):
+        """停止游戏（等价于迁移到stopped状态）"""
+        self.transition_to('stopped')
+
+    def place_piece(self, x: int, y: int, is_ai: bool = False, generation: Optional[int] = None) -> str:
+        """玩家落子（含合法性校验；AI落子传入请求发起时的对局代次）"""
         with self.state_lock:
             if not self.game_active:
                 return 'game_not_active'
+            if is_ai:
+                # AI思考期间对局已重置/停止（代次变化），或已不是AI回合：丢弃这步迟到的落子
+                if generation is not None and generation != self.game_generation:
+                    return 'stale_move'
+                if self.current_ai is None or self.current_player != self.current_ai.color:
+                    return 'not_your_turn'
+            # AI回合拒绝玩家落子（AI在后台线程思考期间，防止玩家替AI执子）
+            elif self.current_ai is not None and self.current_player == self.current_ai.color:
+                return 'not_your_turn'
+
+            # AI线程的落子事件缓冲到UI线程flush_frame时分发（监听器会修改界面状态）
+            event_level = EventManager.LEVEL_WRITE if is_ai else None
 
             # 规则校验（调用规则引擎）
             valid, reason = self.rule_engine.validate_move(self.board, x, y, self.current_player)
@@ -214,6 +285,7 @@ class GameCore:
 
             # 执行落子（C++核心加速）
             self.board = self.cpp_core.place_piece(self.board, x, y, self.current_player)
+            self.zkey ^= self._zobrist[self.current_player - 1][x][y]
 
             # 落子质量评估
             eval_result = self.evaluator.analyze_move_quality(self.board, x, y, self.current_player)
@@ -229,22 +301,22 @@ class GameCore:
                 'quality': eval_result['quality'],
                 'pattern': eval_result['pattern']
             }
-            self.move_history.append(move_data)
-            self.event_manager.emit(Event('move_made', move_data))
+            self._append_move(move_data)
+            self.event_manager.emit(Event('move_made', move_data), event_level)
 
             # 检查游戏结束
-            end_result = self.rule_engine.check_game_end(self.board)
+            end_result = self.rule_engine.check_game_end(self.board, last_move=(x, y))
             if end_result['is_end']:
                 self.game_result = {
                     'winner': 'black' if end_result['winner'] == PIECE_COLORS['BLACK'] else 'white' if end_result['winner'] else 'draw',
                     'win_line': end_result['win_line'],
                     'move_count': len(self.move_history)
                 }
-                self.event_manager.emit(Event('game_end', self.game_result))
+                self.event_manager.emit(Event('game_end', self.game_result), event_level)
                 return 'game_end'
 
             # 切换玩家
-            self.current_player = PIECE_COLORS['WHITE'] if self.current_player == PIECE_COLORS['BLACK'] else PIECE_COLORS['BLACK']
+            self.current_player ^= COLOR_SWITCH
 
             # 联机模式同步落子
             if self.is_online:
@@ -252,8 +324,11 @@ class GameCore:
 
             return 'success'
 
-    def ai_move(self, thinking_callback: Optional[Callable[[Dict], None]] = None) -> Tuple[int, int]:
-        """AI落子（支持多AI协同）"""
+    def ai_move(self, thinking_callback: Optional[Callable[[Dict], None]] = None,
+                generation: Optional[int] = None) -> Tuple[int, int]:
+        """AI落子（支持多AI协同；generation为请求发起时的对局代次，缺省取当前代次）"""
+        if generation is None:
+            generation = self.game_generation
         if not self.game_active or not self.current_ai:
             raise GameError("AI落子失败：游戏未激活或AI未初始化", 2002)
 
@@ -266,23 +341,86 @@ class GameCore:
         else:
             x, y = self.current_ai.move(self.board, thinking_callback)
 
-        # 执行落子
-        self.place_piece(x, y, is_ai=True)
+        # 执行落子（锁内按代次/回合复核，思考期间对局已变化时丢弃）
+        result = self.place_piece(x, y, is_ai=True, generation=generation)
+        if result in ('stale_move', 'not_your_turn'):
+            self.logger.info(f"AI落子已丢弃（对局已变化）：({x}, {y})")
         return (x, y)
 
+    def request_ai_move(self, thinking_callback: Optional[Callable[[Dict], None]] = None):
+        """异步请求AI落子（投递到常驻AI线程，首次调用时启动该线程；思考开始/结束以缓冲事件通知界面）"""
+        self.event_manager.emit(Event('ai_thinking_start'), EventManager.LEVEL_WRITE)
+        self._submit_ai_task(functools.partial(self._run_ai_move, thinking_callback, self.game_generation))
+
+    def request_model_reload(self):
+        """请求切换为最优模型（与落子同队列串行执行，避免AI推理途中替换模型；完成后以缓冲事件trained_model_loaded通知界面）"""
+        self._submit_ai_task(self._reload_best_model)
+
+    def _submit_ai_task(self, task: Callable[[], None]):
+        """投递任务到AI工作线程（首次调用时启动该线程）"""
+        if self._ai_worker is None or not self._ai_worker.is_alive():
+            self._ai_worker = threading.Thread(target=self._ai_worker_loop, name="AIWorker", daemon=True)
+            self._ai_worker.start()
+        self._ai_requests.put(task)
+
+    def _ai_worker_loop(self):
+        """AI工作线程主循环（逐个处理任务，单个任务失败不影响后续任务）"""
+        while True:
+            task = self._ai_requests.get()
+            try:
+                task()
+            except Exception as e:
+                self.logger.error(f"AI任务执行失败：{str(e)}")
+
+    def _run_ai_move(self, thinking_callback: Optional[Callable[[Dict], None]], generation: int):
+        """执行一次AI落子请求（在AI工作线程；generation为请求发起时的对局代次）"""
+        try:
+            if generation != self.game_generation:
+                raise GameError("对局已重置，丢弃排队中的AI落子请求", 2003)
+            self.ai_move(thinking_callback, generation)
+        except GameError as e:
+            self.logger.warning(f"AI落子请求已忽略：{e}")
+        except Exception as e:
+            self.logger.error(f"AI落子失败：{str(e)}")
+        finally:
+            # 缓冲到UI线程分发（落子事件之后），界面据此解除AI思考状态
+            self.event_manager.emit(Event('ai_thinking_end'), EventManager.LEVEL_WRITE)
+
+    def _reload_best_model(self):
+        """加载最优模型（在AI工作线程，加载时重新量化/编译推理模型）"""
+        error = None
+        try:
+            if self.current_ai is not None and hasattr(self.current_ai, 'load_best_model'):
+                self.current_ai.load_best_model()
+                self.mode_manager.clear_ai_cache()
+        except Exception as e:
+            error = str(e)
+        self.event_manager.emit(Event('trained_model_loaded', {'error': error}), EventManager.LEVEL_WRITE)
+
+    # ------------------------------ 落子历史 ------------------------------
+    def _append_move(self, move_data: Dict):
+        """追加落子记录（同时写入质量列）"""
+        self.move_history.append(move_data)
+        self.mh_quality.append(move_data['quality'])
+
+    def _clear_move_columns(self):
+        """清空落子历史（含质量列）"""
+        self.move_history.clear()
+        del self.mh_quality[:]
+
     # ------------------------------ 辅助功能 ------------------------------
     def _update_online_ranking(self):
         """更新联机对战排行榜（ELO积分）"""
         try:
-            # 获取双方玩家信息
+            # 获取双方玩家信息（昵称走缓存）
             player1_id = self.train_user_id
-            player1_data = self.user_storage.load_user(player1_id)
-            if not player1_data:
+            player1_name = self._get_user_nickname(player1_id)
+            if player1_name is None:
                 raise GameError(f"用户数据不存在：{player1_id}", 3001)
 
             player2_id = self.online_opponent_id
-            player2_data = self.user_storage.load_user(player2_id)
-            if not player2_data:
+            player2_name = self._get_user_nickname(player2_id)
+            if player2_name is None:
                 raise GameError(f"对手数据不存在：{player2_id}", 3002)
 
             # 判断胜负
@@ -292,21 +430,23 @@ class GameCore:
             # 更新全球+本地排行榜
             ranking_result = self.ranking_system.update_player_rating(
                 player1_id=player1_id,
-                player1_name=player1_data['nickname'],
+                player1_name=player1_name,
                 player2_id=player2_id,
-                player2_name=player2_data['nickname'],
+                player2_name=player2_name,
                 player1_win=player1_win,
                 is_global=True
             )
             self.ranking_system.update_player_rating(
                 player1_id=player1_id,
-                player1_name=player1_data['nickname'],
+                player1_name=player1_name,
                 player2_id=player2_id,
-                player2_name=player2_data['nickname'],
+                player2_name=player2_name,
                 player1_win=player1_win,
                 is_global=False
             )
 
+            self.current_elo = ranking_result['player1']['new_rating']
+
             # 记录积分变化
             self.game_result['ranking_update'] = {
                 'player1': ranking_result['player1'],
@@ -316,16 +456,31 @@ class GameCore:
         except Exception as e:
             self.logger.error(f"更新排行榜失败：{str(e)}")
 
+    def _get_user_nickname(self, user_id: str) -> Optional[str]:
+        """获取用户昵称（带TTL缓存，避免重复读取用户文件；昵称变化最迟在TTL到期后生效）"""
+        now = time.monotonic()
+        cached = self.nickname_cache.get(user_id)
+        if cached and now - cached[0] < self.nickname_cache_ttl:
+            return cached[1]
+
+        user_data = self.user_storage.load_user(user_id)
+        if not user_data:
+            self.nickname_cache.pop(user_id, None)
+            return None
+        nickname = user_data['nickname']
+        self.nickname_cache[user_id] = (now, nickname)
+        return nickname
+
     def _generate_replay_report(self):
         """生成训练模式复盘报告"""
         if not self.move_history:
             return
 
         # 分析落子质量统计
-        total_quality = sum(move['quality'] for move in self.move_history)
-        avg_quality = total_quality / len(self.move_history)
-        best_move = max(self.move_history, key=lambda x: x['quality'])
-        worst_move = min(self.move_history, key=lambda x: x['quality'])
+        quality = self.mh_quality
+        avg_quality = sum(quality) / len(quality)
+        best_move = self.move_history[max(range(len(quality)), key=quality.__getitem__)]
+        worst_move = self.move_history[min(range(len(quality)), key=quality.__getitem__)]
 
         # 棋型分布统计
         pattern_counts = {}
@@ -372,10 +527,13 @@ class GameCore:
             self.current_ai.load_model(model_path)
         elif self.ai_type == 'nn':
             self.current_ai = self.model_manager.load_model('nn', model_path, self.current_ai.color, self.ai_level)
+        self.model_path = model_path
+        # 缓存的AI实例仍持有旧模型，下次初始化模式时重新创建
+        self.mode_manager.clear_ai_cache()
         self.logger.info(f"加载自定义模型：{model_path}")
 
-    def start_ai_training(self, num_games: int = 100):
-        """启动AI训练（仅训练模式）"""
+    def start_ai_training(self, num_games: int = 100) -> threading.Thread:
+        """启动AI训练（仅训练模式，后台线程执行，返回训练线程）"""
         if self.current_mode != GAME_MODES['TRAIN'] or not isinstance(self.current_ai, (RLAI, NNAI)):
             raise GameError("仅训练模式支持AI训练，且AI类型需为RL或NN", 4001)
 
@@ -393,4 +551,26 @@ class GameCore:
             self.logger.info(f"AI训练完成：{num_games}局自我对弈")
             self.event_manager.emit(Event('ui_update', {'type': 'train_complete'}))
 
-        threading.Thread(target=train_worker, daemon=True).start()
\ No newline at end of file
+        train_thread = threading.Thread(target=train_worker, daemon=True)
+        train_thread.start()
+        return train_thread
+
+
+def run_training_process(settings: Dict, progress_q):
+    """训练子进程入口（按UI进程的模式/AI类型/难度/模型路径还原AI后训练，进度以(进度, 损失)元组、结果以字典经队列回传）"""
+    try:
+        core = GameCore()
+        core.ai_type = settings['ai_type']
+        core.ai_level = settings['ai_level']
+        core.set_mode(settings['mode'], settings['user_id'])
+        if settings.get('model_path'):
+            core.load_ai_model(settings['model_path'])
+        core.train_ai_model(
+            user_id=settings['user_id'],
+            epochs=settings['epochs'],
+            batch_size=settings['batch_size'],
+            progress_callback=lambda data: progress_q.put(('train_progress', (data['progress'], data.get('loss', 0.0))))
+        )
+        progress_q.put(('train_complete', {'success': True}))
+    except Exception as e:
+        progress_q.put(('train_complete', {'success': False, 'error': str(e)}))
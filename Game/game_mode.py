@@ -1,4 +1,4 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from Common.constants import GAME_MODES, AI_LEVELS, PIECE_COLORS
 from Common.logger import Logger
 from Common.error_handler import GameError
@@ -22,6 +22,8 @@ class GameModeManager:
             GAME_MODES['ONLINE']: self._init_online_mode,
             GAME_MODES['TRAIN']: self._init_train_mode
         }
+        # AI实例缓存（(AI类型, 难度, 颜色) -> AI），切换模式/重开时复用已加载的模型
+        self.ai_cache: Dict[Tuple[str, str, int], BaseAI] = {}
 
     def init_mode(self, mode: str):
         """初始化指定模式"""
@@ -92,6 +94,15 @@ class GameModeManager:
 
     # ------------------------------ 辅助方法 ------------------------------
     def _create_single_ai(self, color: int) -> BaseAI:
+        """获取单一AI实例（按类型/难度/颜色缓存，避免重复构建与加载模型）"""
+        cache_key = (self.game_core.ai_type, self.game_core.ai_level, color)
+        ai = self.ai_cache.get(cache_key)
+        if ai is None:
+            ai = self._build_single_ai(color)
+            self.ai_cache[cache_key] = ai
+        return ai
+
+    def _build_single_ai(self, color: int) -> BaseAI:
         """创建单一AI实例（根据类型选择）"""
         ai_map = {
             'rl': RLAI,
@@ -103,6 +114,10 @@ class GameModeManager:
         ai_cls = ai_map.get(self.game_core.ai_type, MCTSAI)
         return ai_cls(color, self.game_core.ai_level)
 
+    def clear_ai_cache(self):
+        """清空AI实例缓存（模型更新后调用）"""
+        self.ai_cache.clear()
+
     def _handle_online_message(self, data: Dict):
         """处理联机消息回调"""
         msg_type = data.get('type')
@@ -1,5 +1,8 @@
 import math
-from typing import List, Dict, Optional
+import heapq
+from operator import itemgetter
+import numpy as np
+from typing import List, Dict, Optional, Tuple
 from Common.logger import Logger
 from Storage.ranking_storage import RankingStorage
 
@@ -12,6 +15,12 @@ class ELORankingSystem:
         self.k_factor = 32  # 积分变化系数（普通玩家）
         self.k_factor_new = 40  # 新玩家系数（前20局）
         self.k_factor_master = 24  # 大师系数（积分≥2000）
+        # 前N名缓存（is_global -> (前N名玩家, 总人数)），积分更新时刷新，避免每次加载完整排行榜
+        # 缓存只随本实例的积分更新刷新，读写同一排行榜的组件应共用一个实例（界面复用GameCore.ranking_system）
+        self.top_cache_size = 100
+        self.top_cache: Dict[bool, Tuple[List[Dict], int]] = {}
+        # 玩家索引（is_global -> user_id -> 玩家数据），O(1)查找单个玩家
+        self.player_index: Dict[bool, Dict[str, Dict]] = {}
 
     def calculate_new_ratings(self, player1_rating: int, player2_rating: int, player1_win: bool, player1_games: int, player2_games: int) -> Tuple[int, int]:
         """计算对战后双方新积分（动态K因子）"""
@@ -39,9 +48,10 @@ class ELORankingSystem:
         ranking = self.ranking_storage.load_global_ranking() if is_global else self.ranking_storage.load_local_ranking()
         ranking = ranking or []
 
-        # 获取玩家当前数据
-        player1_data = next((p for p in ranking if p['user_id'] == player1_id), None)
-        player2_data = next((p for p in ranking if p['user_id'] == player2_id), None)
+        # 获取玩家当前数据（一次遍历建立索引，O(1)查找）
+        index = {p['user_id']: i for i, p in enumerate(ranking)}
+        player1_data = ranking[index[player1_id]] if player1_id in index else None
+        player2_data = ranking[index[player2_id]] if player2_id in index else None
 
         # 初始化新玩家数据
         if not player1_data:
@@ -68,34 +78,37 @@ class ELORankingSystem:
         player1_data['last_update'] = self._get_current_time()
         player2_data['last_update'] = self._get_current_time()
 
-        # 更新排行榜
-        ranking = self._upsert_player(ranking, player1_data)
-        ranking = self._upsert_player(ranking, player2_data)
+        # 更新排行榜（两名玩家写入后统一排序一次）
+        self._upsert_player(ranking, index, player1_data)
+        self._upsert_player(ranking, index, player2_data)
+        ranking = self._sort_ranking(ranking)
 
         # 保存排行榜
         if is_global:
             self.ranking_storage.save_global_ranking(ranking)
         else:
             self.ranking_storage.save_local_ranking(ranking)
+        self.top_cache[is_global] = (ranking[:self.top_cache_size], len(ranking))
+        self.player_index[is_global] = {p['user_id']: p for p in ranking}
 
-        # 获取最终排名
-        player1_final = next(p for p in ranking if p['user_id'] == player1_id)
-        player2_final = next(p for p in ranking if p['user_id'] == player2_id)
-
+        # 获取最终排名（排序后仍为同一字典对象，rank已更新）
         return {
-            'player1': self._format_player_ranking(player1_final, player1_data['score'], new_rating1),
-            'player2': self._format_player_ranking(player2_final, player2_data['score'], new_rating2),
+            'player1': self._format_player_ranking(player1_data, player1_data['score'], new_rating1),
+            'player2': self._format_player_ranking(player2_data, player2_data['score'], new_rating2),
             'is_global': is_global,
             'total_players': len(ranking)
         }
 
     def get_player_ranking(self, user_id: str, is_global: bool = False) -> Optional[Dict]:
-        """获取单个玩家的排名信息"""
-        ranking = self.ranking_storage.load_global_ranking() if is_global else self.ranking_storage.load_local_ranking()
-        if not ranking:
-            return None
-
-        player = next((p for p in ranking if p['user_id'] == user_id), None)
+        """获取单个玩家的排名信息（通过玩家索引O(1)查找）"""
+        index = self.player_index.get(is_global)
+        if index is None:
+            ranking = self.ranking_storage.load_global_ranking() if is_global else self.ranking_storage.load_local_ranking()
+            if not ranking:
+                return None
+            index = self.player_index[is_global] = {p['user_id']: p for p in ranking}
+
+        player = index.get(user_id)
         if not player:
             self.logger.warning(f"玩家{user_id}未在{'全球' if is_global else '本地'}排行榜中")
             return None
@@ -116,18 +129,18 @@ class ELORankingSystem:
             'win_rate': round(win_rate * 100, 2),
             'last_update': player['last_update'],
             'is_global': is_global,
-            'total_players': len(ranking)
+            'total_players': len(index)
         }
 
     def get_ranking_list(self, top_n: int = 10, is_global: bool = False) -> List[Dict]:
-        """获取排行榜前N名"""
-        ranking = self.ranking_storage.load_global_ranking() if is_global else self.ranking_storage.load_local_ranking()
-        if not ranking:
+        """获取排行榜前N名（优先读取前N名缓存）"""
+        top_players = self._get_top_players(top_n, is_global)
+        if not top_players:
             return []
 
         # 截取前N名并格式化
         top_ranking = []
-        for i, player in enumerate(ranking[:top_n]):
+        for i, player in enumerate(top_players[:top_n]):
             total_games = player['win_count'] + player['lose_count'] + player['draw_count']
             win_rate = player['win_count'] / total_games if total_games > 0 else 0.0
             top_ranking.append({
@@ -145,6 +158,21 @@ class ELORankingSystem:
         return top_ranking
 
     # ------------------------------ 辅助方法 ------------------------------
+    def _get_top_players(self, top_n: int, is_global: bool) -> List[Dict]:
+        """获取积分前N名玩家（缓存覆盖时不读取存储；否则加载后堆选择前N名）"""
+        cached = self.top_cache.get(is_global)
+        if cached is not None:
+            top_players, total = cached
+            if top_n <= len(top_players) or len(top_players) == total:
+                return top_players
+
+        ranking = self.ranking_storage.load_global_ranking() if is_global else self.ranking_storage.load_local_ranking()
+        if not ranking:
+            return []
+        top_players = heapq.nlargest(max(top_n, self.top_cache_size), ranking, key=itemgetter('score'))
+        self.top_cache[is_global] = (top_players, len(ranking))
+        return top_players
+
     def _get_k_factor(self, rating: int, game_count: int) -> int:
         """获取动态K因子"""
         if game_count < 20:
@@ -178,16 +206,22 @@ class ELORankingSystem:
         else:
             player_data['lose_count'] += 1
 
-    def _upsert_player(self, ranking: List[Dict], player_data: Dict) -> List[Dict]:
-        """插入或更新玩家排名"""
-        # 移除旧数据
-        ranking = [p for p in ranking if p['user_id'] != player_data['user_id']]
-        # 添加新数据
-        ranking.append(player_data)
-        # 按积分降序排序并更新排名
-        ranking.sort(key=lambda x: x['score'], reverse=True)
-        for i, p in enumerate(ranking):
-            p['rank'] = i + 1
+    def _upsert_player(self, ranking: List[Dict], index: Dict[str, int], player_data: Dict):
+        """插入或原地更新玩家数据（不排序，由_sort_ranking统一处理）"""
+        user_id = player_data['user_id']
+        if user_id in index:
+            ranking[index[user_id]] = player_data
+        else:
+            index[user_id] = len(ranking)
+            ranking.append(player_data)
+
+    def _sort_ranking(self, ranking: List[Dict]) -> List[Dict]:
+        """按积分降序排序并更新排名（NumPy稳定argsort，积分相同保持原顺序）"""
+        scores = np.fromiter((p['score'] for p in ranking), dtype=np.int32, count=len(ranking))
+        order = np.argsort(-scores, kind='stable')
+        ranking = [ranking[i] for i in order]
+        for rank, p in enumerate(ranking, 1):
+            p['rank'] = rank
         return ranking
 
     def _format_player_ranking(self, player: Dict, old_rating: int, new_rating: int) -> Dict:
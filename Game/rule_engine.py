@@ -1,4 +1,4 @@
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 from Common.constants import PIECE_COLORS
 from Common.logger import Logger
 from Compute.cpp_interface import CppCore
@@ -9,78 +9,55 @@ class RuleEngine:
         self.board_size = board_size
         self.logger = Logger.get_instance()
         self.cpp_core = CppCore()
-        self.valid_rules = {
-            'position': self._validate_position,
-            'occupied': self._validate_occupied,
-            'player_turn': self._validate_player_turn
-        }
+        # 预计算所有五连获胜线，并按经过的格子建立索引（落子后只检查经过该点的线）
+        self.win_lines = self._build_win_lines()
+        self.win_lines_at: Dict[Tuple[int, int], List[Tuple[Tuple[int, int], ...]]] = {}
+        for line in self.win_lines:
+            for pos in line:
+                self.win_lines_at.setdefault(pos, []).append(line)
 
     def validate_move(self, board: List[List[int]], x: int, y: int, current_player: int) -> Tuple[bool, str]:
-        """综合校验落子合法性（调用C++核心加速）"""
-        # 优先使用C++核心校验（高效）
-        if self.cpp_core:
-            valid, reason = self.cpp_core.validate_move(board, x, y, current_player, self.board_size)
-            return (valid, reason)
-
-        # Python降级校验（备用）
-        for rule_name, rule_func in self.valid_rules.items():
-            valid, reason = rule_func(board, x, y, current_player)
-            if not valid:
-                return (False, reason)
+        """综合校验落子合法性（坐标+占用一次完成，回合由GameCore的current_player保证）"""
+        # 仅两次比较，无需把整盘传给C++核心
+        if not (0 <= x < self.board_size and 0 <= y < self.board_size):
+            return (False, 'invalid_position')
+        if board[x][y] != PIECE_COLORS.EMPTY:
+            return (False, 'occupied')
         return (True, 'success')
 
-    def check_game_end(self, board: List[List[int]]) -> Dict:
-        """检查游戏是否结束（获胜/平局）"""
+    def check_game_end(self, board: List[List[int]], last_move: Optional[Tuple[int, int]] = None) -> Dict:
+        """检查游戏是否结束（获胜/平局，传入最后落子时仅检查经过该点的获胜线）"""
+        if last_move is not None:
+            return self.check_win_at(board, last_move[0], last_move[1])
+
         # 优先使用C++核心判断（高效）
         if self.cpp_core:
             return self.cpp_core.check_game_end(board, self.board_size)
 
-        # Python降级判断（备用）
-        # 检查横向获胜
-        for i in range(self.board_size):
-            for j in range(self.board_size - 4):
-                color = board[i][j]
-                if color == PIECE_COLORS['EMPTY']:
-                    continue
-                if all(board[i][j + k] == color for k in range(5)):
-                    win_line = [(i, j + k) for k in range(5)]
-                    return {'is_end': True, 'winner': color, 'win_line': win_line}
-
-        # 检查纵向获胜
-        for j in range(self.board_size):
-            for i in range(self.board_size - 4):
-                color = board[i][j]
-                if color == PIECE_COLORS['EMPTY']:
-                    continue
-                if all(board[i + k][j] == color for k in range(5)):
-                    win_line = [(i + k, j) for k in range(5)]
-                    return {'is_end': True, 'winner': color, 'win_line': win_line}
-
-        # 检查正对角线获胜
-        for i in range(self.board_size - 4):
-            for j in range(self.board_size - 4):
-                color = board[i][j]
-                if color == PIECE_COLORS['EMPTY']:
-                    continue
-                if all(board[i + k][j + k] == color for k in range(5)):
-                    win_line = [(i + k, j + k) for k in range(5)]
-                    return {'is_end': True, 'winner': color, 'win_line': win_line}
-
-        # 检查反对角线获胜
-        for i in range(4, self.board_size):
-            for j in range(self.board_size - 4):
-                color = board[i][j]
-                if color == PIECE_COLORS['EMPTY']:
-                    continue
-                if all(board[i - k][j + k] == color for k in range(5)):
-                    win_line = [(i - k, j + k) for k in range(5)]
-                    return {'is_end': True, 'winner': color, 'win_line': win_line}
-
-        # 检查平局（棋盘满）
-        is_full = all(board[i][j] != PIECE_COLORS['EMPTY'] for i in range(self.board_size) for j in range(self.board_size))
-        if is_full:
+        # Python降级判断（备用，遍历预计算获胜线）
+        for line in self.win_lines:
+            x, y = line[0]
+            color = board[x][y]
+            if color == PIECE_COLORS.EMPTY:
+                continue
+            if all(board[i][j] == color for i, j in line):
+                return {'is_end': True, 'winner': color, 'win_line': list(line)}
+        return self._check_draw(board)
+
+    def check_win_at(self, board: List[List[int]], x: int, y: int) -> Dict:
+        """检查落子(x,y)后是否结束（最多检查20条获胜线，无需扫描整盘）"""
+        color = board[x][y]
+        if color != PIECE_COLORS.EMPTY:
+            for line in self.win_lines_at.get((x, y), ()):
+                if all(board[i][j] == color for i, j in line):
+                    return {'is_end': True, 'winner': color, 'win_line': list(line)}
+        return self._check_draw(board)
+
+    def _check_draw(self, board: List[List[int]]) -> Dict:
+        """检查平局（棋盘满）"""
+        empty = PIECE_COLORS.EMPTY
+        if all(empty not in row for row in board):
             return {'is_end': True, 'winner': 0, 'win_line': []}
-
         return {'is_end': False, 'winner': 0, 'win_line': []}
 
     def is_valid_board(self, board: List[List[int]]) -> Tuple[bool, str]:
@@ -135,36 +112,23 @@ class RuleEngine:
     def _find_all_win_lines(self, board: List[List[int]]) -> List[List[Tuple[int, int]]]:
         """查找所有获胜线（用于合法性校验）"""
         win_lines = []
-        # 横向
-        for i in range(self.board_size):
-            for j in range(self.board_size - 4):
-                color = board[i][j]
-                if color == PIECE_COLORS['EMPTY']:
-                    continue
-                if all(board[i][j + k] == color for k in range(5)):
-                    win_lines.append([(i, j + k) for k in range(5)])
-        # 纵向
-        for j in range(self.board_size):
-            for i in range(self.board_size - 4):
-                color = board[i][j]
-                if color == PIECE_COLORS['EMPTY']:
-                    continue
-                if all(board[i + k][j] == color for k in range(5)):
-                    win_lines.append([(i + k, j) for k in range(5)])
-        # 正对角线
-        for i in range(self.board_size - 4):
-            for j in range(self.board_size - 4):
-                color = board[i][j]
-                if color == PIECE_COLORS['EMPTY']:
-                    continue
-                if all(board[i + k][j + k] == color for k in range(5)):
-                    win_lines.append([(i + k, j + k) for k in range(5)])
-        # 反对角线
-        for i in range(4, self.board_size):
-            for j in range(self.board_size - 4):
-                color = board[i][j]
-                if color == PIECE_COLORS['EMPTY']:
-                    continue
-                if all(board[i - k][j + k] == color for k in range(5)):
-                    win_lines.append([(i - k, j + k) for k in range(5)])
-        return win_lines
\ No newline at end of file
+        for line in self.win_lines:
+            x, y = line[0]
+            color = board[x][y]
+            if color == PIECE_COLORS.EMPTY:
+                continue
+            if all(board[i][j] == color for i, j in line):
+                win_lines.append(list(line))
+        return win_lines
+
+    def _build_win_lines(self) -> List[Tuple[Tuple[int, int], ...]]:
+        """生成棋盘上所有长度为5的获胜线（横/纵/正对角/反对角，15路共572条）"""
+        size = self.board_size
+        lines = []
+        for dx, dy in ((0, 1), (1, 0), (1, 1), (-1, 1)):
+            for i in range(size):
+                for j in range(size):
+                    end_x, end_y = i + dx * 4, j + dy * 4
+                    if 0 <= end_x < size and 0 <= end_y < size:
+                        lines.append(tuple((i + dx * k, j + dy * k) for k in range(5)))
+        return lines
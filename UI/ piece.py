@@ -1,6 +1,43 @@
 import pygame
-from typing import Tuple
+import numpy as np
+from typing import Dict, Optional, Tuple
 from Common.constants import COLORS, PIECE_COLORS
+from Common.surface_pool import SurfacePool
+
+# 静态外观缓存四周留白（容纳阴影偏移）
+_PIECE_PADDING = 3
+# 棋子静态外观缓存：(颜色, 直径, 是否3D) -> 预渲染表面
+_PIECE_CACHE: Dict[Tuple[int, int, bool], pygame.Surface] = {}
+# 3D渐变缓存：(颜色, 直径) -> 向量化生成的渐变表面
+_GRADIENT_CACHE: Dict[Tuple[int, int], pygame.Surface] = {}
+# 高亮环缓存：(直径, 高亮透明度) -> 预渲染表面
+_HIGHLIGHT_CACHE: Dict[Tuple[int, int], pygame.Surface] = {}
+
+
+def _build_gradient(color: int, size: int) -> pygame.Surface:
+    """向量化生成3D渐变表面（按像素到圆心距离一次算出明暗，替代逐圈画圆）"""
+    radius = size // 2
+    yy, xx = np.ogrid[-radius:radius + 1, -radius:radius + 1]
+    dist = np.sqrt(xx ** 2 + yy ** 2)
+    # 每个像素取覆盖它的最小圆，step即原逐圈循环中的 size//2 - r
+    step = radius - np.maximum(np.ceil(dist), 1)
+    if color == PIECE_COLORS.BLACK:
+        shade = 20 + step * 10
+    else:
+        shade = 255 - step * 8
+    alpha = np.clip(255 - step * 8, 0, 255).astype(np.uint8)
+    alpha[dist > radius] = 0  # 圆外透明
+
+    gradient = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+    # 像素数组会锁定表面，写完立即释放
+    rgb = pygame.surfarray.pixels3d(gradient)
+    rgb[...] = np.clip(shade, 0, 255).astype(np.uint8)[:, :, None]
+    del rgb
+    alpha_view = pygame.surfarray.pixels_alpha(gradient)
+    alpha_view[...] = alpha
+    del alpha_view
+    return gradient
+
 
 class Piece:
     """棋子组件：支持下落动画、高亮状态、3D渐变效果"""
@@ -22,49 +59,64 @@ class Piece:
         """设置高亮状态"""
         self.highlighted = highlighted
 
-    def draw_3d_effect(self, surface: pygame.Surface):
-        """绘制3D效果（阴影+渐变）"""
+    def draw_3d_effect(self, surface: pygame.Surface, center: Optional[Tuple[int, int]] = None):
+        """绘制3D效果（阴影+渐变，center为空时画在棋子当前位置）"""
         if not self.has_3d:
             return
+        cx, cy = center if center is not None else (self.x, self.y)
         
         # 绘制底部阴影
         shadow_offset = 3
-        shadow_surface = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-        pygame.draw.circle(shadow_surface, (*COLORS['SHADOW'], 100), 
-                         (self.size//2, self.size//2), self.size//2 - 1)
-        surface.blit(shadow_surface, (self.x - self.size//2 + shadow_offset, self.y - self.size//2 + shadow_offset))
+        with SurfacePool.get_instance().borrow(self.size, self.size) as shadow_surface:
+            pygame.draw.circle(shadow_surface, (*COLORS['SHADOW'], 100), 
+                             (self.size//2, self.size//2), self.size//2 - 1)
+            surface.blit(shadow_surface, (cx - self.size//2 + shadow_offset, cy - self.size//2 + shadow_offset))
         
-        # 绘制3D渐变（中心亮，边缘暗）
-        for r in range(self.size//2, 0, -1):
-            alpha = 255 - (self.size//2 - r) * 8
-            if self.color == PIECE_COLORS['BLACK']:
-                shade = 20 + (self.size//2 - r) * 10
-                circle_color = (shade, shade, shade, alpha)
-            else:
-                shade = 255 - (self.size//2 - r) * 8
-                circle_color = (shade, shade, shade, alpha)
-            pygame.draw.circle(surface, circle_color, (self.x, self.y), r)
+        # 绘制3D渐变（中心亮，边缘暗；按(颜色,尺寸)缓存）
+        key = (self.color, self.size)
+        gradient = _GRADIENT_CACHE.get(key)
+        if gradient is None:
+            gradient = _build_gradient(self.color, self.size)
+            _GRADIENT_CACHE[key] = gradient
+        surface.blit(gradient, (cx - self.size//2, cy - self.size//2))
 
     def draw_highlight(self, surface: pygame.Surface):
         """绘制高亮效果（最佳落子/选中）"""
         if not self.highlighted:
             return
         
-        # 绘制外层高亮环
-        highlight_surface = pygame.Surface((self.size + 10, self.size + 10), pygame.SRCALPHA)
-        pygame.draw.circle(highlight_surface, (*COLORS['HIGHLIGHT'], self.highlight_alpha),
-                         (self.size//2 + 5, self.size//2 + 5), self.size//2 + 3)
-        pygame.draw.circle(highlight_surface, (*COLORS['BACKGROUND'], 100),
-                         (self.size//2 + 5, self.size//2 + 5), self.size//2 - 1)
+        # 绘制外层高亮环（几何只与尺寸和透明度有关，渲染一次后复用）
+        key = (self.size, self.highlight_alpha)
+        highlight_surface = _HIGHLIGHT_CACHE.get(key)
+        if highlight_surface is None:
+            highlight_surface = pygame.Surface((self.size + 10, self.size + 10), pygame.SRCALPHA)
+            pygame.draw.circle(highlight_surface, (*COLORS['HIGHLIGHT'], self.highlight_alpha),
+                             (self.size//2 + 5, self.size//2 + 5), self.size//2 + 3)
+            pygame.draw.circle(highlight_surface, (*COLORS['BACKGROUND'], 100),
+                             (self.size//2 + 5, self.size//2 + 5), self.size//2 - 1)
+            _HIGHLIGHT_CACHE[key] = highlight_surface
         surface.blit(highlight_surface, (self.x - self.size//2 - 5, self.y - self.size//2 - 5))
 
+    def _get_static_surface(self) -> pygame.Surface:
+        """获取棋子静态外观（3D→本体→描边只渲染一次，之后按(颜色,尺寸,3D)复用）"""
+        key = (self.color, self.size, self.has_3d)
+        cached = _PIECE_CACHE.get(key)
+        if cached is None:
+            extent = self.size + _PIECE_PADDING * 2
+            center = (self.size//2 + _PIECE_PADDING, self.size//2 + _PIECE_PADDING)
+            cached = pygame.Surface((extent, extent), pygame.SRCALPHA)
+            # 绘制3D效果
+            self.draw_3d_effect(cached, center)
+            # 绘制棋子本体
+            pygame.draw.circle(cached, COLORS['BLACK'] if self.color == PIECE_COLORS.BLACK else COLORS['WHITE'],
+                             center, self.size//2)
+            pygame.draw.circle(cached, COLORS['PIECE_BORDER'], center, self.size//2, 1)
+            _PIECE_CACHE[key] = cached
+        return cached
+
     def draw(self, surface: pygame.Surface):
-        """绘制完整棋子（3D→本体→高亮）"""
-        # 绘制3D效果
-        self.draw_3d_effect(surface)
-        # 绘制棋子本体
-        pygame.draw.circle(surface, COLORS['BLACK'] if self.color == PIECE_COLORS['BLACK'] else COLORS['WHITE'],
-                         (self.x, self.y), self.size//2)
-        pygame.draw.circle(surface, COLORS['PIECE_BORDER'], (self.x, self.y), self.size//2, 1)
+        """绘制完整棋子（预渲染外观→高亮）"""
+        surface.blit(self._get_static_surface(),
+                     (self.x - self.size//2 - _PIECE_PADDING, self.y - self.size//2 - _PIECE_PADDING))
         # 绘制高亮效果
         self.draw_highlight(surface)
\ No newline at end of file
@@ -1,88 +1,128 @@
 import pygame
-from typing import List, Dict
+from typing import List, Dict, Tuple, Optional
 from Common.constants import COLORS
+from Common.surface_pool import convert_alpha_safe
+from UI.font_cache import get_font
 from Core.ranking_system import ELORankingSystem
 
 class RankingPanel:
     """排行榜组件：本地/全球排名展示"""
-    def __init__(self, x: int, y: int, width: int = 300, height: int = 500):
+    def __init__(self, x: int, y: int, width: int = 300, height: int = 500, ranking_system: Optional[ELORankingSystem] = None):
         self.x = x
         self.y = y
         self.width = width
         self.height = height
-        self.ranking_system = ELORankingSystem()
+        # 与GameCore共用同一排名系统，积分更新时刷新的前N名缓存/玩家索引对面板立即可见
+        self.ranking_system = ranking_system or ELORankingSystem()
         self.fonts = {
-            'title': pygame.font.SysFont('Arial', 18, bold=True),
-            'normal': pygame.font.SysFont('Arial', 14),
-            'small': pygame.font.SysFont('Arial', 12),
-            'rank': pygame.font.SysFont('Arial', 16, bold=True)
+            'title': get_font('Arial', 18, bold=True),
+            'normal': get_font('Arial', 14),
+            'small': get_font('Arial', 12),
+            'rank': get_font('Arial', 16, bold=True)
         }
 
         # 排行榜类型：local/global
         self.rank_type = 'local'
         self.rank_list: List[Dict] = []
+        self._loaded = False  # 是否已加载过数据（排行榜为空时也不再逐帧重新查询）
         # 切换按钮
         self.switch_btn = pygame.Rect(x + width - 120, y + 10, 100, 30)
         # 刷新按钮
         self.refresh_btn = pygame.Rect(x + 20, y + 10, 80, 30)
 
-    def load_ranking(self):
-        """加载排行榜数据（对接ELORankingSystem）"""
-        self.rank_list = self.ranking_system.get_ranking_list(
+        # 整面板预合成缓存（数据或布局变化时置脏重建，其余帧只blit一次）
+        self.dirty = True
+        self._panel_surf: Optional[pygame.Surface] = None
+        self._panel_top = y - 30  # 标题绘制在面板上方
+
+        # 文本渲染缓存：(字体, 文本, 颜色) -> 表面，排行榜数据变化时清空
+        self._text_cache: Dict[Tuple[str, str, Tuple], pygame.Surface] = {}
+        # 静态表头文本只渲染一次
+        self._refresh_text = self.fonts['small'].render("刷新", True, COLORS['TEXT_DARK'])
+        self._header_texts = [
+            (self.fonts['small'].render(header, True, COLORS['TEXT_LIGHT']), x_off)
+            for header, x_off in zip(['排名', '昵称', '积分', '胜率'], [20, 80, 200, 250])
+        ]
+
+    def _render_cached(self, font_key: str, text: str, color: Tuple) -> pygame.Surface:
+        """渲染文本（按字体/内容/颜色缓存，避免每帧重复光栅化）"""
+        key = (font_key, text, tuple(color))
+        rendered = self._text_cache.get(key)
+        if rendered is None:
+            rendered = self.fonts[font_key].render(text, True, color)
+            self._text_cache[key] = rendered
+        return rendered
+
+    def fetch_ranking(self) -> List[Dict]:
+        """查询排行榜数据（只读，可在后台线程调用）"""
+        return self.ranking_system.get_ranking_list(
             top_n=10,
             is_global=(self.rank_type == 'global')
         )
 
+    def load_ranking_data(self, rank_list: List[Dict]):
+        """应用查询结果（须在UI线程调用）"""
+        self._text_cache.clear()
+        self.rank_list = rank_list
+        self._loaded = True
+        self.dirty = True
+
+    def load_ranking(self):
+        """加载排行榜数据（对接ELORankingSystem，同步查询）"""
+        self.load_ranking_data(self.fetch_ranking())
+
     def switch_rank_type(self):
         """切换本地/全球排行榜"""
         self.rank_type = 'global' if self.rank_type == 'local' else 'local'
         self.load_ranking()
 
-    def draw_header(self, surface: pygame.Surface):
-        """绘制排行榜表头"""
+    def draw_header(self, surface: pygame.Surface, origin: Tuple[int, int] = (0, 0)):
+        """绘制排行榜表头（origin为目标表面左上角对应的屏幕坐标）"""
+        ox, oy = origin
+        x, y = self.x - ox, self.y - oy
+        switch_btn = self.switch_btn.move(-ox, -oy)
+        refresh_btn = self.refresh_btn.move(-ox, -oy)
         # 标题
-        title = self.fonts['title'].render(f"{'全球排行榜' if self.rank_type == 'global' else '本地排行榜'}", True, COLORS['TEXT_LIGHT'])
-        surface.blit(title, (self.x + 20, self.y - 30))
+        title = self._render_cached('title', '全球排行榜' if self.rank_type == 'global' else '本地排行榜', COLORS['TEXT_LIGHT'])
+        surface.blit(title, (x + 20, y - 30))
         # 切换按钮
-        switch_text = self.fonts['small'].render(f"切换到{'本地' if self.rank_type == 'global' else '全球'}", True, COLORS['TEXT_DARK'])
-        pygame.draw.rect(surface, COLORS['BUTTON'], self.switch_btn, border_radius=3)
-        pygame.draw.rect(surface, COLORS['BUTTON_BORDER'], self.switch_btn, width=2, border_radius=3)
-        surface.blit(switch_text, (self.switch_btn.x + 5, self.switch_btn.y + 7))
+        switch_text = self._render_cached('small', f"切换到{'本地' if self.rank_type == 'global' else '全球'}", COLORS['TEXT_DARK'])
+        pygame.draw.rect(surface, COLORS['BUTTON'], switch_btn, border_radius=3)
+        pygame.draw.rect(surface, COLORS['BUTTON_BORDER'], switch_btn, width=2, border_radius=3)
+        surface.blit(switch_text, (switch_btn.x + 5, switch_btn.y + 7))
         # 刷新按钮
-        refresh_text = self.fonts['small'].render("刷新", True, COLORS['TEXT_DARK'])
-        pygame.draw.rect(surface, COLORS['BUTTON'], self.refresh_btn, border_radius=3)
-        pygame.draw.rect(surface, COLORS['BUTTON_BORDER'], self.refresh_btn, width=2, border_radius=3)
-        surface.blit(refresh_text, (self.refresh_btn.x + 25, self.refresh_btn.y + 7))
+        pygame.draw.rect(surface, COLORS['BUTTON'], refresh_btn, border_radius=3)
+        pygame.draw.rect(surface, COLORS['BUTTON_BORDER'], refresh_btn, width=2, border_radius=3)
+        surface.blit(self._refresh_text, (refresh_btn.x + 25, refresh_btn.y + 7))
         # 表头列名
-        headers = ['排名', '昵称', '积分', '胜率']
-        x_offsets = [20, 80, 200, 250]
-        for i, (header, x_off) in enumerate(zip(headers, x_offsets)):
-            text = self.fonts['small'].render(header, True, COLORS['TEXT_LIGHT'])
-            surface.blit(text, (self.x + x_off, self.y + 50))
+        for text, x_off in self._header_texts:
+            surface.blit(text, (x + x_off, y + 50))
         # 分隔线
-        pygame.draw.line(surface, COLORS['GRAY'], (self.x + 20, self.y + 70), (self.x + self.width - 20, self.y + 70), 1)
+        pygame.draw.line(surface, COLORS['GRAY'], (x + 20, y + 70), (x + self.width - 20, y + 70), 1)
 
-    def draw_rank_items(self, surface: pygame.Surface):
-        """绘制排行榜条目"""
+    def draw_rank_items(self, surface: pygame.Surface, origin: Tuple[int, int] = (0, 0)):
+        """绘制排行榜条目（origin含义同draw_header）"""
+        ox, oy = origin
+        x = self.x - ox
         item_height = 40
         for i, item in enumerate(self.rank_list):
-            y_pos = self.y + 80 + i * item_height
+            y_pos = self.y - oy + 80 + i * item_height
             # 交替背景色
             bg_color = (*COLORS['PANEL_BG'], 150) if i % 2 == 0 else (*COLORS['PANEL_BG'], 100)
-            pygame.draw.rect(surface, bg_color, (self.x + 20, y_pos, self.width - 40, item_height - 5), border_radius=3)
+            pygame.draw.rect(surface, bg_color, (x + 20, y_pos, self.width - 40, item_height - 5), border_radius=3)
             # 排名（前3名特殊颜色）
             rank_color = COLORS['GOLD'] if i == 0 else COLORS['SILVER'] if i == 1 else COLORS['BRONZE'] if i == 2 else COLORS['TEXT_LIGHT']
-            rank_text = self.fonts['rank'].render(f"{item['rank']}", True, rank_color)
-            surface.blit(rank_text, (self.x + 25, y_pos + 5))
+            rank_text = self._render_cached('rank', f"{item['rank']}", rank_color)
+            surface.blit(rank_text, (x + 25, y_pos + 5))
             # 昵称
-            name_text = self.fonts['normal'].render(item['name'], True, COLORS['TEXT_LIGHT'])
-            surface.blit(name_text, (self.x + 80, y_pos + 5))
+            name_text = self._render_cached('normal', item['name'], COLORS['TEXT_LIGHT'])
+            surface.blit(name_text, (x + 80, y_pos + 5))
             # 积分
-            score_text = self.fonts['normal'].render(f"{item['score']}", True, COLORS['TEXT_LIGHT'])
-            surface.blit(score_text, (self.x + 200, y_pos + 5))
+            score_text = self._render_cached('normal', f"{item['score']}", COLORS['TEXT_LIGHT'])
+            surface.blit(score_text, (x + 200, y_pos + 5))
             # 胜率
-            win_rate_text = self.fonts['normal'].render(f"{item['win_rate']:.1f}%", True, COLORS['TEXT_LIGHT'])
-            surface.blit(win_rate_text, (self.x + 250, y_pos + 5))
+            win_rate_text = self._render_cached('normal', f"{item['win_rate']:.1f}%", COLORS['TEXT_LIGHT'])
+            surface.blit(win_rate_text, (x + 250, y_pos + 5))
 
     def handle_click(self, pos: Tuple[int, int]):
         """处理点击事件"""
@@ -91,14 +131,35 @@ class RankingPanel:
         elif self.refresh_btn.collidepoint(pos):
             self.load_ranking()
 
+    def resize(self, x: int, y: int, width: int, height: int):
+        """调整面板位置和尺寸（重建按钮区域并置脏缓存）"""
+        self.x, self.y, self.width, self.height = x, y, width, height
+        self.switch_btn = pygame.Rect(x + width - 120, y + 10, 100, 30)
+        self.refresh_btn = pygame.Rect(x + 20, y + 10, 80, 30)
+        self._panel_top = y - 30
+        self.dirty = True
+
+    def needs_redraw(self) -> bool:
+        """面板缓存是否需要重建"""
+        return self.dirty or self._panel_surf is None
+
+    def _render_panel(self) -> pygame.Surface:
+        """把背景、表头、条目预合成到一张面板表面上"""
+        origin = (self.x, self._panel_top)
+        panel = pygame.Surface((self.width + 1, self.y + self.height - self._panel_top), pygame.SRCALPHA)
+        body_rect = (0, self.y - self._panel_top, self.width, self.height)
+        pygame.draw.rect(panel, (*COLORS['PANEL_BG'], 230), body_rect, border_radius=8)
+        pygame.draw.rect(panel, COLORS['GRAY'], body_rect, width=2, border_radius=8)
+        self.draw_header(panel, origin)
+        self.draw_rank_items(panel, origin)
+        return convert_alpha_safe(panel)
+
     def draw(self, surface: pygame.Surface):
-        """绘制完整排行榜"""
-        # 绘制背景
-        pygame.draw.rect(surface, (*COLORS['PANEL_BG'], 230), (self.x, self.y, self.width, self.height), border_radius=8)
-        pygame.draw.rect(surface, COLORS['GRAY'], (self.x, self.y, self.width, self.height), width=2, border_radius=8)
-        # 绘制表头和条目
-        self.draw_header(surface)
-        self.draw_rank_items(surface)
+        """绘制完整排行榜（缓存有效时只做一次blit）"""
         # 首次加载数据
-        if not self.rank_list:
-            self.load_ranking()
\ No newline at end of file
+        if not self._loaded:
+            self.load_ranking()
+        if self.needs_redraw():
+            self._panel_surf = self._render_panel()
+            self.dirty = False
+        surface.blit(self._panel_surf, (self.x, self._panel_top))
\ No newline at end of file
@@ -1,6 +1,6 @@
 import pygame
 import os
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 class ResourceManager:
     """资源管理器：加载字体、音效、图片资源"""
@@ -9,6 +9,11 @@ class ResourceManager:
         self.fonts: Dict[str, pygame.font.Font] = {}
         self.sounds: Dict[str, pygame.mixer.Sound] = {}
         self.images: Dict[str, pygame.Surface] = {}
+        # 按绝对路径去重的缓存（不同资源名指向同一文件时共享同一对象）
+        self._image_path_cache: Dict[Tuple[str, bool], pygame.Surface] = {}
+        self._sound_path_cache: Dict[str, pygame.mixer.Sound] = {}
+        # 按窗口尺寸缓存的缩放背景（拖拽回到之前的尺寸时无需重新缩放）
+        self._background_cache: Dict[Tuple[str, int, int], pygame.Surface] = {}
 
         # 初始化Pygame混音器
         pygame.mixer.init()
@@ -45,10 +50,14 @@ class ResourceManager:
         if sound_name in self.sounds:
             return self.sounds[sound_name]
         
-        sound_path = os.path.join(self.resource_dir, sound_file)
+        sound_path = os.path.abspath(os.path.join(self.resource_dir, sound_file))
+        if sound_path in self._sound_path_cache:
+            self.sounds[sound_name] = self._sound_path_cache[sound_path]
+            return self.sounds[sound_name]
         if os.path.exists(sound_path):
             try:
                 sound = pygame.mixer.Sound(sound_path)
+                self._sound_path_cache[sound_path] = sound
                 self.sounds[sound_name] = sound
                 return sound
             except Exception as e:
@@ -60,19 +69,37 @@ class ResourceManager:
         if image_name in self.images:
             return self.images[image_name]
         
-        image_path = os.path.join(self.resource_dir, image_file)
+        image_path = os.path.abspath(os.path.join(self.resource_dir, image_file))
+        path_key = (image_path, alpha)
+        if path_key in self._image_path_cache:
+            self.images[image_name] = self._image_path_cache[path_key]
+            return self.images[image_name]
         if os.path.exists(image_path):
             try:
                 if alpha:
                     image = pygame.image.load(image_path).convert_alpha()
                 else:
                     image = pygame.image.load(image_path).convert()
+                self._image_path_cache[path_key] = image
                 self.images[image_name] = image
                 return image
             except Exception as e:
                 print(f"加载图片失败：{e}")
         return None
 
+    def load_background(self, width: int, height: int, image_file: str = "background.png") -> Optional[pygame.Surface]:
+        """加载缩放到窗口尺寸的背景图（按尺寸缓存；无背景文件时返回None）"""
+        key = (image_file, width, height)
+        if key in self._background_cache:
+            return self._background_cache[key]
+        image = self.load_image(image_file, image_file, alpha=False)
+        if image is None:
+            return None
+        if image.get_size() != (width, height):
+            image = pygame.transform.smoothscale(image, (width, height))
+        self._background_cache[key] = image
+        return image
+
     def play_sound(self, sound_name: str, volume: float = 0.5):
         """播放音效"""
         if sound_name in self.sounds:
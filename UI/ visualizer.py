@@ -1,8 +1,41 @@
+import math
 import pygame
 import numpy as np
 from typing import List, Dict, Optional
 from Common.constants import COLORS, PIECE_COLORS
 from Common.config import Config
+from Common.surface_pool import SurfacePool
+from UI.font_cache import get_font
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # 未安装numba时使用NumPy原地运算
+    NUMBA_AVAILABLE = False
+
+
+def _normalize_scores_kernel(scores: np.ndarray, out: np.ndarray):
+    """单遍求最值+缩放写入out（归一化到0-255，全相等时置0）"""
+    rows, cols = scores.shape
+    mn = scores[0, 0]
+    mx = mn
+    for i in range(rows):
+        for j in range(cols):
+            v = scores[i, j]
+            if v < mn:
+                mn = v
+            if v > mx:
+                mx = v
+    inv = 255.0 / (mx - mn) if mx != mn else 0.0
+    for i in range(rows):
+        for j in range(cols):
+            out[i, j] = (scores[i, j] - mn) * inv
+
+
+if NUMBA_AVAILABLE:
+    _normalize_scores_kernel = njit(cache=True, fastmath=True)(_normalize_scores_kernel)
+
 
 class AIVisualizer:
     """AI思考可视化：热力图、博弈树、评分曲线"""
@@ -13,14 +46,14 @@ class AIVisualizer:
         self.cell_size = cell_size
         self.config = Config.get_instance()
         self.fonts = {
-            'small': pygame.font.SysFont('Arial', 10),
-            'normal': pygame.font.SysFont('Arial', 12),
-            'bold': pygame.font.SysFont('Arial', 12, bold=True)
+            'small': get_font('Arial', 10),
+            'normal': get_font('Arial', 12),
+            'bold': get_font('Arial', 12, bold=True)
         }
 
         # 可视化数据（由AI思考回调更新）
         self.thinking_data = {
-            'scores': np.zeros((board_size, board_size)),  # 评分热力图数据
+            'scores': np.zeros((board_size, board_size), dtype=np.float32),  # 评分热力图数据（0-255）
             'best_move': None,  # 最佳落子 (x,y)
             'considering_moves': [],  # 候选落子列表
             'game_tree': {'root': {'win_rate': 0.5, 'children': []}},  # 博弈树数据
@@ -31,10 +64,41 @@ class AIVisualizer:
         self.animation_frame = 0
         self.animation_speed = 3
 
+        # 热力图颜色查找表（0-255评分→蓝→青→绿→黄→红）与复用的整盘叠加层
+        self._heat_ramp = self._build_heat_ramp()
+        self._heat_surface = pygame.Surface((board_size * cell_size, board_size * cell_size), pygame.SRCALPHA)
+        self._heat_dirty = False  # 评分更新后叠加层需重建
+        # 像素级查找表（surfarray按[x, y]索引）：像素所在格子下标、像素到格子中心距离的平方
+        pixel_offsets = np.arange(board_size * cell_size)
+        self._pixel_cell = pixel_offsets // cell_size
+        center_offsets = pixel_offsets % cell_size - cell_size // 2
+        self._pixel_dist2 = center_offsets[:, None] ** 2 + center_offsets[None, :] ** 2
+        # 格子中心相对坐标查找表（最佳落子使用）
+        self._cell_centers = [i * cell_size + cell_size // 2 for i in range(board_size)]
+        # 归一化结果复用缓冲区（float32，评分整盘存放于一个数组）
+        self._norm_buf = np.zeros((board_size, board_size), dtype=np.float32)
+        # 胜率文本缓存：千分位取整后的胜率 -> 文本表面
+        self._win_rate_texts: Dict[int, pygame.Surface] = {}
+        self._tree_title = self.fonts['bold'].render("博弈树搜索路径", True, COLORS['TEXT_LIGHT'])
+        # 评分曲线坐标轴标签缓存：格式化后的文本 -> 文本表面
+        self._axis_texts: Dict[str, pygame.Surface] = {}
+        self._curve_title = self.fonts['bold'].render("局势评分变化", True, COLORS['TEXT_LIGHT'])
+
+    @staticmethod
+    def _build_heat_ramp() -> np.ndarray:
+        """预计算热力图256级颜色表（向量化实现原四段渐变）"""
+        idx = np.arange(256)
+        ramp = np.zeros((256, 3), dtype=np.uint8)
+        ramp[:, 0] = np.where(idx < 128, 0, np.where(idx < 192, (idx - 128) * 4, 255))
+        ramp[:, 1] = np.where(idx < 64, idx * 4, np.where(idx < 192, 255, 255 - (idx - 192) * 4))
+        ramp[:, 2] = np.where(idx < 64, 255, np.where(idx < 128, 255 - (idx - 64) * 4, 0))
+        return ramp
+
     def update_thinking_data(self, data: Dict):
         """更新AI思考数据（对接AI的thinking_callback）"""
         if 'scores' in data:
             self.thinking_data['scores'] = self._normalize_scores(data['scores'])
+            self._heat_dirty = True
         if 'best_move' in data:
             self.thinking_data['best_move'] = data['best_move']
         if 'considering_moves' in data:
@@ -46,37 +110,63 @@ class AIVisualizer:
         self.animation_frame = (self.animation_frame + 1) % self.animation_speed
 
     def _normalize_scores(self, scores: np.ndarray) -> np.ndarray:
-        """归一化评分到0-255（用于热力图）"""
-        if scores.max() == scores.min():
-            return np.zeros_like(scores)
-        return (scores - scores.min()) / (scores.max() - scores.min()) * 255
+        """归一化评分到0-255（用于热力图，结果写入复用缓冲区）"""
+        scores = np.asarray(scores, dtype=np.float64)
+        if self._norm_buf.shape != scores.shape:
+            self._norm_buf = np.zeros(scores.shape, dtype=np.float32)
+        out = self._norm_buf
+        if NUMBA_AVAILABLE and scores.ndim == 2 and scores.size:
+            _normalize_scores_kernel(scores, out)
+            return out
+        mn, mx = scores.min(), scores.max()
+        if mx == mn:
+            out.fill(0.0)
+            return out
+        np.subtract(scores, mn, out=out)
+        out *= 255.0 / (mx - mn)
+        return out
 
-    def draw_heatmap(self, surface: pygame.Surface):
-        """绘制评分热力图"""
-        cell_half = self.cell_size // 2
+    def _render_heat_surface(self):
+        """整盘向量化重建热力图叠加层（评分越高圆越大；像素颜色/alpha一次性写入表面）"""
         scores = self.thinking_data['scores']
-        for bx in range(self.board_size):
-            for by in range(self.board_size):
-                score = scores[bx][by]
-                if score <= 0:
-                    continue
-                # 颜色映射（蓝→红）
-                color_idx = int(min(score, 255))
-                if color_idx < 64:
-                    color = (0, color_idx*4, 255)
-                elif color_idx < 128:
-                    color = (0, 255, 255 - (color_idx-64)*4)
-                elif color_idx < 192:
-                    color = ((color_idx-128)*4, 255, 0)
-                else:
-                    color = (255, 255 - (color_idx-192)*4, 0)
-                # 绘制半透明圆形（评分越高，半径越大）
-                sx, sy = self.x + by * self.cell_size + cell_half, self.y + bx * self.cell_size + cell_half
-                radius = int(cell_half * (score / 255))
-                if radius > 0:
-                    heat_surface = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
-                    pygame.draw.circle(heat_surface, (*color, 180), (cell_half, cell_half), radius)
-                    surface.blit(heat_surface, (sx - cell_half, sy - cell_half))
+        # 评分展开到像素：行号对应屏幕y，列号对应屏幕x
+        cells = self._pixel_cell
+        values = scores.T[cells[:, None], cells[None, :]]
+        radii = (self.cell_size // 2 * (values / 255)).astype(np.int32)
+        mask = (radii > 0) & (self._pixel_dist2 <= radii * radii)
+
+        rgb = pygame.surfarray.pixels3d(self._heat_surface)
+        rgb[...] = self._heat_ramp[np.minimum(values, 255).astype(np.uint8)]
+        del rgb  # 释放像素视图（解除表面锁定）
+        alpha = pygame.surfarray.pixels_alpha(self._heat_surface)
+        alpha[...] = np.where(mask, 180, 0)
+        del alpha
+
+    def draw_heatmap(self, surface: pygame.Surface):
+        """绘制评分热力图（叠加层只在评分更新后重建，其余帧直接blit）"""
+        if self._heat_dirty:
+            self._render_heat_surface()
+            self._heat_dirty = False
+        surface.blit(self._heat_surface, (self.x, self.y))
+
+    def _win_rate_surface(self, win_rate: float) -> pygame.Surface:
+        """获取胜率文本表面（按0.1%精度缓存，最多1001个）"""
+        key = int(round(win_rate * 1000))
+        text = self._win_rate_texts.get(key)
+        if text is None:
+            text = self.fonts['small'].render(f"{key / 10:.1f}%", True, COLORS['BLACK'])
+            self._win_rate_texts[key] = text
+        return text
+
+    def _axis_surface(self, label: str) -> pygame.Surface:
+        """获取坐标轴标签表面（评分未变化时直接复用）"""
+        text = self._axis_texts.get(label)
+        if text is None:
+            if len(self._axis_texts) >= 256:
+                self._axis_texts.clear()
+            text = self.fonts['small'].render(label, True, COLORS['TEXT_LIGHT'])
+            self._axis_texts[label] = text
+        return text
 
     def draw_game_tree(self, surface: pygame.Surface):
         """绘制博弈树分支图"""
@@ -86,8 +176,10 @@ class AIVisualizer:
         level_spacing = 35
         node_spacing = 25
 
-        # 递归绘制节点和分支
-        def draw_node(node: Dict, level: int, x_offset: int):
+        # 显式栈深度优先遍历（从根节点开始），绘制节点和分支
+        stack = [(self.thinking_data['game_tree']['root'], 0, 0)]
+        while stack:
+            node, level, x_offset = stack.pop()
             # 节点颜色（胜率>0.7=绿，<0.3=红，否则黄）
             win_rate = node.get('win_rate', 0.5)
             node_color = COLORS['GREEN'] if win_rate > 0.7 else COLORS['RED'] if win_rate < 0.3 else COLORS['YELLOW']
@@ -96,27 +188,26 @@ class AIVisualizer:
             # 绘制节点
             pygame.draw.circle(surface, node_color, (sx, sy), node_radius)
             # 绘制胜率文本
-            win_text = self.fonts['small'].render(f"{win_rate:.1%}", True, COLORS['BLACK'])
-            surface.blit(win_text, (sx - 10, sy + node_radius + 2))
+            surface.blit(self._win_rate_surface(win_rate), (sx - 10, sy + node_radius + 2))
             # 绘制子节点
             children = node.get('children', [])
             if children:
                 child_count = len(children)
                 total_width = (child_count - 1) * node_spacing
                 start_x = x_offset - total_width / 2
+                child_y = tree_y + (level + 1) * level_spacing - node_radius
                 for i, child in enumerate(children):
                     child_x = start_x + i * node_spacing
                     # 绘制分支（最佳路径加粗）
                     line_width = 2 if child.get('is_best', False) else 1
                     pygame.draw.line(surface, COLORS['GRAY'], (sx, sy + node_radius),
-                                   (tree_x + child_x, tree_y + (level+1)*level_spacing - node_radius), line_width)
-                    draw_node(child, level + 1, child_x)
+                                   (tree_x + child_x, child_y), line_width)
+                # 逆序入栈，保持与递归相同的从左到右访问顺序
+                for i in range(child_count - 1, -1, -1):
+                    stack.append((children[i], level + 1, start_x + i * node_spacing))
 
-        # 绘制博弈树根节点
-        draw_node(self.thinking_data['game_tree']['root'], 0, 0)
         # 绘制标题
-        tree_title = self.fonts['bold'].render("博弈树搜索路径", True, COLORS['TEXT_LIGHT'])
-        surface.blit(tree_title, (tree_x, tree_y - 20))
+        surface.blit(self._tree_title, (tree_x, tree_y - 20))
 
     def draw_score_curve(self, surface: pygame.Surface):
         """绘制局势评分变化曲线"""
@@ -131,31 +222,30 @@ class AIVisualizer:
 
         # 绘制曲线（至少2个点才绘制）
         score_history = self.thinking_data['score_history']
-        if len(score_history) >= 2:
-            # 归一化评分
-            max_score = max(score_history)
-            min_score = min(score_history)
-            normalized = [(s - min_score) / (max_score - min_score) for s in score_history]
-            # 计算点坐标
-            points = []
-            step = curve_width / (len(normalized) - 1)
-            for i, val in enumerate(normalized):
-                x = curve_x + i * step
-                y = curve_y + curve_height - (val * curve_height)
-                points.append((x, y))
+        history = np.asarray(score_history, dtype=np.float32)
+        min_score = float(history.min()) if history.size else 0.0
+        max_score = float(history.max()) if history.size else 1.0
+        if history.size >= 2:
+            # 归一化评分（全相等时画水平线）
+            if max_score != min_score:
+                normalized = (history - min_score) / (max_score - min_score)
+            else:
+                normalized = np.zeros_like(history)
+            # 一次性计算所有点坐标
+            step = curve_width / (history.size - 1)
+            xs = curve_x + np.arange(history.size) * step
+            ys = curve_y + curve_height * (1 - normalized)
+            points = np.column_stack((xs, ys)).tolist()
             # 绘制曲线和点
             pygame.draw.lines(surface, COLORS['BLUE'], False, points, 2)
             for (x, y) in points:
                 pygame.draw.circle(surface, COLORS['BLUE'], (x, y), 3)
 
         # 绘制坐标轴标签
-        min_text = self.fonts['small'].render(f"{min(score_history):.1f}" if score_history else "0.0", True, COLORS['TEXT_LIGHT'])
-        max_text = self.fonts['small'].render(f"{max(score_history):.1f}" if score_history else "1.0", True, COLORS['TEXT_LIGHT'])
-        surface.blit(min_text, (curve_x, curve_y + curve_height - 15))
-        surface.blit(max_text, (curve_x, curve_y + 5))
+        surface.blit(self._axis_surface(f"{min_score:.1f}"), (curve_x, curve_y + curve_height - 15))
+        surface.blit(self._axis_surface(f"{max_score:.1f}"), (curve_x, curve_y + 5))
         # 绘制标题
-        curve_title = self.fonts['bold'].render("局势评分变化", True, COLORS['TEXT_LIGHT'])
-        surface.blit(curve_title, (curve_x, curve_y - 20))
+        surface.blit(self._curve_title, (curve_x, curve_y - 20))
 
     def draw_best_move(self, surface: pygame.Surface):
         """绘制最佳落子标记"""
@@ -163,13 +253,13 @@ class AIVisualizer:
         if not best_move:
             return
         bx, by = best_move
-        sx = self.x + by * self.cell_size + self.cell_size // 2
-        sy = self.y + bx * self.cell_size + self.cell_size // 2
+        sx = self.x + self._cell_centers[by]
+        sy = self.y + self._cell_centers[bx]
         # 绘制红色闪烁边框
-        alpha = 150 + 100 * np.sin(pygame.time.get_ticks() / 150)
-        best_surface = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
-        pygame.draw.circle(best_surface, (*COLORS['WIN_LINE'], int(alpha)), (self.cell_size//2, self.cell_size//2), self.cell_size//2 - 2, 3)
-        surface.blit(best_surface, (sx - self.cell_size//2, sy - self.cell_size//2))
+        alpha = 150 + 100 * math.sin(pygame.time.get_ticks() / 150)
+        with SurfacePool.get_instance().borrow(self.cell_size, self.cell_size) as best_surface:
+            pygame.draw.circle(best_surface, (*COLORS['WIN_LINE'], int(alpha)), (self.cell_size//2, self.cell_size//2), self.cell_size//2 - 2, 3)
+            surface.blit(best_surface, (sx - self.cell_size//2, sy - self.cell_size//2))
 
     def draw(self, surface: pygame.Surface):
         """绘制所有可视化元素"""
@@ -1,3 +1,4 @@
+import math
 import pygame
 import numpy as np
 from typing import List, Tuple, Dict, Optional
@@ -18,17 +19,49 @@ class Board:
         self.logger = Logger.get_instance()
         self.game_core = GameCore()  # 对接游戏核心
         self.pieces: Dict[Tuple[int, int], Piece] = {}  # 已落棋子：(x,y)→Piece实例
+        self._mirror = np.zeros((size, size), dtype=np.int8)  # 已显示棋子的颜色镜像（与GameCore棋盘比对用）
         self.win_line: List[Tuple[int, int]] = []  # 获胜线坐标
         self.animating = False  # 落子动画状态
         self.animation_piece: Optional[Piece] = None  # 动画中的棋子
         self.animation_progress = 0  # 动画进度（0-100）
         self.animation_speed = 5  # 动画速度
+        self._anim_start_y = 0  # 动画起始屏幕y坐标
+        self._anim_target: Tuple[int, int] = (0, 0)  # 动画目标屏幕坐标（落子时计算一次）
+        self._anim_board_pos: Tuple[int, int] = (0, 0)  # 动画目标棋盘坐标（缩放时重算屏幕坐标）
+        # 棋盘列/行→屏幕x/y坐标查找表（格子中心）
+        self._screen_xs = [x + j * cell_size + cell_size // 2 for j in range(size)]
+        self._screen_ys = [y + i * cell_size + cell_size // 2 for i in range(size)]
+        # 静态网格缓存（棋盘尺寸或格子大小变化时重建）
+        self._grid_surface: Optional[pygame.Surface] = None
+        self._grid_key: Optional[Tuple[int, int]] = None
+        # 获胜线缓存（发光+实线整体预渲染，获胜线变化时重建）
+        self._win_line_surface: Optional[pygame.Surface] = None
+        self._win_line_offset: Tuple[int, int] = (0, 0)
+        self._win_line_key: Optional[Tuple[Tuple[int, int], ...]] = None
+
+    def resize(self, x: int, y: int, cell_size: int):
+        """调整棋盘位置和格子大小（重建坐标查找表和静态网格，已落棋子同步移动）"""
+        self.x, self.y = x, y
+        self._screen_xs = [x + j * cell_size + cell_size // 2 for j in range(self.size)]
+        self._screen_ys = [y + i * cell_size + cell_size // 2 for i in range(self.size)]
+        if cell_size != self.cell_size:
+            self.cell_size = cell_size
+            self._grid_surface = self._render_grid()
+            self._grid_key = (self.size, cell_size)
+            for piece in self.pieces.values():
+                piece.size = cell_size - 6
+        # 获胜线位置随棋盘移动，下次绘制时重建
+        self._win_line_surface = None
+        self._win_line_key = None
+        for (bx, by), piece in self.pieces.items():
+            piece.set_position(*self.convert_board_to_screen(bx, by))
+        if self.animating:
+            self._anim_start_y = y - 50
+            self._anim_target = self.convert_board_to_screen(*self._anim_board_pos)
 
     def convert_board_to_screen(self, board_x: int, board_y: int) -> Tuple[int, int]:
-        """棋盘坐标→屏幕坐标（居中对齐）"""
-        screen_x = self.x + board_y * self.cell_size + self.cell_size // 2
-        screen_y = self.y + board_x * self.cell_size + self.cell_size // 2
-        return (screen_x, screen_y)
+        """棋盘坐标→屏幕坐标（居中对齐，查表）"""
+        return (self._screen_xs[board_y], self._screen_ys[board_x])
 
     def convert_screen_to_board(self, screen_x: int, screen_y: int) -> Tuple[int, int]:
         """屏幕坐标→棋盘坐标（容错处理）"""
@@ -46,11 +79,26 @@ class Board:
         if result != 'success' and result != 'game_end':
             return result
         
-        # 创建棋子实例（带3D效果）
-        color = self.game_core.current_player
+        # 创建棋子实例（带落子动画；颜色取GameCore棋盘上刚落下的棋子）
+        self.apply_delta(board_x, board_y, self.game_core.board[board_x][board_y])
+
+        # 检查游戏结束，记录获胜线
+        if result == 'game_end' and self.game_core.game_result:
+            self.win_line = self.game_core.game_result.get('win_line', [])
+        
+        return result
+
+    def apply_delta(self, board_x: int, board_y: int, color: int):
+        """同步单个格子的变化（新落子带下落动画；与镜像一致时直接返回，重复通知无副作用）"""
+        if self._mirror[board_x, board_y] == color:
+            return
+        self._mirror[board_x, board_y] = color
+        if color == PIECE_COLORS.EMPTY:
+            self.pieces.pop((board_x, board_y), None)
+            return
         screen_x, screen_y = self.convert_board_to_screen(board_x, board_y)
         self.animation_piece = Piece(
-            x=screen_x, 
+            x=screen_x,
             y=self.y - 50,  # 动画起始位置（上方）
             color=color,
             size=self.cell_size - 6,
@@ -58,23 +106,36 @@ class Board:
         )
         self.animating = True
         self.animation_progress = 0
+        self._anim_start_y = self.y - 50
+        self._anim_target = (screen_x, screen_y)
+        self._anim_board_pos = (board_x, board_y)
         self.pieces[(board_x, board_y)] = self.animation_piece
-        
-        # 检查游戏结束，记录获胜线
-        if result == 'game_end' and self.game_core.game_result:
-            self.win_line = self.game_core.game_result.get('win_line', [])
-        
-        return result
+
+    def update_board(self, board: List[List[int]]):
+        """整盘同步（重置/悔棋等批量变化使用；只处理与镜像不同的格子，不播放动画）"""
+        new_board = np.asarray(board, dtype=np.int8)
+        if np.array_equal(new_board, self._mirror):
+            return
+        for board_x, board_y in np.argwhere(new_board != self._mirror):
+            color = int(new_board[board_x, board_y])
+            key = (int(board_x), int(board_y))
+            if color == PIECE_COLORS.EMPTY:
+                self.pieces.pop(key, None)
+            else:
+                self.pieces[key] = Piece(*self.convert_board_to_screen(*key), color=color,
+                                         size=self.cell_size - 6, has_3d=True)
+        self._mirror[:] = new_board
+        if self.animation_piece is not None and self.animation_piece not in self.pieces.values():
+            self.animating = False
+            self.animation_piece = None
 
     def update_animation(self):
         """更新落子动画"""
         if not self.animating or not self.animation_piece:
             return
         
-        # 计算动画目标位置
-        target_x, target_y = self.convert_board_to_screen(
-            *next(iter(self.pieces.keys()))  # 动画棋子的棋盘坐标
-        )
+        # 动画目标位置（落子时已缓存）
+        target_x, target_y = self._anim_target
         # 线性插值动画
         self.animation_progress += self.animation_speed
         if self.animation_progress >= 100:
@@ -84,26 +145,35 @@ class Board:
         else:
             # 下落动画（带轻微弹跳）
             progress = self.animation_progress / 100
-            bounce = np.sin(progress * np.pi) * 10  # 弹跳偏移
-            current_y = self.y - 50 + (target_y - (self.y - 50)) * progress - bounce
+            bounce = math.sin(progress * math.pi) * 10  # 弹跳偏移
+            current_y = self._anim_start_y + (target_y - self._anim_start_y) * progress - bounce
             self.animation_piece.set_position(target_x, current_y)
 
-    def draw_board_lines(self, surface: pygame.Surface):
-        """绘制棋盘网格线"""
+    def animation_rect(self) -> Optional[pygame.Rect]:
+        """落子动画覆盖的屏幕区域（起点到落点的一列，含弹跳和阴影余量；无动画时返回None）"""
+        if not self.animating:
+            return None
+        target_x, target_y = self._anim_target
+        pad = self.cell_size
+        return pygame.Rect(target_x - pad, self._anim_start_y - pad, 2 * pad, target_y - self._anim_start_y + 2 * pad)
+
+    def _render_grid(self) -> pygame.Surface:
+        """把网格线和星位光栅化到一张透明表面（坐标相对棋盘左上角）"""
+        grid = pygame.Surface((self.size * self.cell_size, self.size * self.cell_size), pygame.SRCALPHA)
         # 绘制横线和竖线
         for i in range(self.size):
             # 横线
-            y = self.y + i * self.cell_size
+            y = i * self.cell_size
             pygame.draw.line(
-                surface, COLORS['BOARD_LINE'],
-                (self.x, y), (self.x + (self.size - 1) * self.cell_size, y),
+                grid, COLORS['BOARD_LINE'],
+                (0, y), ((self.size - 1) * self.cell_size, y),
                 2 if i in [3, 7, 11] else 1  # 天元和星位加粗
             )
             # 竖线
-            x = self.x + i * self.cell_size
+            x = i * self.cell_size
             pygame.draw.line(
-                surface, COLORS['BOARD_LINE'],
-                (x, self.y), (x, self.y + (self.size - 1) * self.cell_size),
+                grid, COLORS['BOARD_LINE'],
+                (x, 0), (x, (self.size - 1) * self.cell_size),
                 2 if i in [3, 7, 11] else 1
             )
         
@@ -111,7 +181,16 @@ class Board:
         star_positions = [(3, 3), (3, 11), (7, 7), (11, 3), (11, 11)]
         for (bx, by) in star_positions:
             sx, sy = self.convert_board_to_screen(bx, by)
-            pygame.draw.circle(surface, COLORS['BOARD_LINE'], (sx, sy), 4)
+            pygame.draw.circle(grid, COLORS['BOARD_LINE'], (sx - self.x, sy - self.y), 4)
+        return grid
+
+    def draw_board_lines(self, surface: pygame.Surface):
+        """绘制棋盘网格线（网格不变，只渲染一次后整体blit）"""
+        grid_key = (self.size, self.cell_size)
+        if self._grid_surface is None or self._grid_key != grid_key:
+            self._grid_surface = self._render_grid()
+            self._grid_key = grid_key
+        surface.blit(self._grid_surface, (self.x, self.y))
 
     def draw_pieces(self, surface: pygame.Surface):
         """绘制所有棋子（含动画）"""
@@ -128,19 +207,35 @@ class Board:
         if not self.win_line or len(self.win_line) < 5:
             return
         
+        win_line_key = tuple(tuple(pos) for pos in self.win_line)
+        if self._win_line_surface is None or self._win_line_key != win_line_key:
+            self._render_win_line(win_line_key)
+        surface.blit(self._win_line_surface, self._win_line_offset)
+
+    def _render_win_line(self, win_line_key: Tuple[Tuple[int, int], ...]):
+        """把获胜线（外层发光+内层实线）一次性画到覆盖其包围盒的表面上"""
         # 转换获胜线坐标为屏幕坐标
-        screen_points = [self.convert_board_to_screen(bx, by) for (bx, by) in self.win_line]
+        screen_points = [self.convert_board_to_screen(bx, by) for (bx, by) in win_line_key]
+        pad = 8  # 留白容纳发光线宽
+        left = min(px for px, _ in screen_points) - pad
+        top = min(py for _, py in screen_points) - pad
+        width = max(px for px, _ in screen_points) - left + pad + 1
+        height = max(py for _, py in screen_points) - top + pad + 1
+        line_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        local_points = [(px - left, py - top) for px, py in screen_points]
         # 绘制粗线（渐变颜色）
-        for i in range(len(screen_points) - 1):
-            start = screen_points[i]
-            end = screen_points[i + 1]
+        for i in range(len(local_points) - 1):
+            start = local_points[i]
+            end = local_points[i + 1]
             # 绘制外层发光效果
-            glow_surface = pygame.Surface((self.cell_size * 2, self.cell_size * 2), pygame.SRCALPHA)
-            pygame.draw.line(glow_surface, (*COLORS['WIN_LINE'], 80), (self.cell_size, self.cell_size), 
-                           (end[0] - start[0] + self.cell_size, end[1] - start[1] + self.cell_size), 8)
-            surface.blit(glow_surface, (start[0] - self.cell_size, start[1] - self.cell_size))
-            # 绘制内层实线
-            pygame.draw.line(surface, COLORS['WIN_LINE'], start, end, 4)
+            pygame.draw.line(line_surface, (*COLORS['WIN_LINE'], 80), start, end, 8)
+        # 绘制内层实线
+        for i in range(len(local_points) - 1):
+            pygame.draw.line(line_surface, COLORS['WIN_LINE'], local_points[i], local_points[i + 1], 4)
+
+        self._win_line_surface = line_surface
+        self._win_line_offset = (left, top)
+        self._win_line_key = win_line_key
 
     def draw(self, surface: pygame.Surface):
         """绘制完整棋盘（线条→棋子→获胜线）"""
@@ -150,10 +245,17 @@ class Board:
         # 更新动画
         self.update_animation()
 
-    def reset(self):
-        """重置棋盘（对接GameCore重置）"""
+    def clear(self):
+        """清空棋盘界面状态（不触碰GameCore，供统一状态迁移使用）"""
         self.pieces.clear()
+        self._mirror.fill(PIECE_COLORS.EMPTY)
         self.win_line = []
+        self._win_line_surface = None
+        self._win_line_key = None
         self.animating = False
         self.animation_piece = None
+
+    def reset(self):
+        """重置棋盘（对接GameCore重置）"""
+        self.clear()
         self.game_core.reset_game()
\ No newline at end of file
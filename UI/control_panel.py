@@ -1,9 +1,11 @@
 import pygame
-from typing import List, Dict, Callable
+from typing import List, Dict, Callable, Optional, Tuple
 from Common.constants import GAME_MODES, AI_LEVELS, COLORS
 from Common.config import Config
 from Storage.model_storage import ModelStorage
 from Game.game_core import GameCore
+from Common.surface_pool import convert_alpha_safe
+from UI.font_cache import get_font, render_text
 
 class ControlPanel:
     """控制面板：模式切换、AI配置、模型管理"""
@@ -16,9 +18,9 @@ class ControlPanel:
         self.game_core = GameCore()
         self.model_storage = ModelStorage()
         self.fonts = {
-            'normal': pygame.font.SysFont('Arial', 14),
-            'bold': pygame.font.SysFont('Arial', 16, bold=True),
-            'small': pygame.font.SysFont('Arial', 12)
+            'normal': get_font('Arial', 14),
+            'bold': get_font('Arial', 16, bold=True),
+            'small': get_font('Arial', 12)
         }
 
         # 模式切换按钮
@@ -43,67 +45,136 @@ class ControlPanel:
             {'name': '重置模型', 'rect': pygame.Rect(x+20, y+470, 160, 40)}
         ]
 
+        # 按钮文本只渲染一次（名称固定，选中状态只影响背景色）
+        for btn in self.mode_buttons + self.model_buttons:
+            btn['text_surf'] = self.fonts['normal'].render(btn['name'], True, COLORS['TEXT_DARK'])
+            btn['text_rect'] = btn['text_surf'].get_rect(center=btn['rect'].center)
+        # AI难度文本缓存：难度 -> 文本表面
+        self._level_texts: Dict[str, pygame.Surface] = {}
+        # 面板背景（半透明圆角矩形+边框）预渲染一次
+        self._bg_surf = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.rect(self._bg_surf, (*COLORS['PANEL_BG'], 230), (0, 0, width, height), border_radius=8)
+        pygame.draw.rect(self._bg_surf, COLORS['GRAY'], (0, 0, width, height), width=2, border_radius=8)
+        # 静态层缓存（背景+标题+按钮），选中模式或AI难度变化时重建
+        self._static_surf: Optional[pygame.Surface] = None
+        self._static_key: Optional[Tuple[str, str]] = None
+        self._static_top = y - 30  # 静态层上边界（标题位于面板上方）
+
+        # 游戏状态/用户信息文本（由主窗口回调更新，表面来自全局文本缓存）
+        self._status_surf: Optional[pygame.Surface] = None
+        self._user_surf: Optional[pygame.Surface] = None
+        # ELO积分文本（积分变化时才重新渲染）
+        self._elo_value: Optional[int] = None
+        self._elo_surf: Optional[pygame.Surface] = None
+
+        # 后台训练线程与进度文本缓存（进度整数值 -> 文本表面）
+        self._training_thread = None
+        self._progress_texts: Dict[int, pygame.Surface] = {}
+
         # 回调函数
         self.on_mode_change: Optional[Callable[[str], None]] = None
         self.on_ai_config_change: Optional[Callable[[str], None]] = None
 
-    def draw_buttons(self, surface: pygame.Surface):
-        """绘制所有按钮"""
+        # 点击命中表：(左, 右, 上, 下, 处理函数)，按钮位置固定，只构建一次
+        hit_targets = [(btn['rect'], lambda m=btn['mode']: self._select_mode(m)) for btn in self.mode_buttons]
+        hit_targets.append((self.ai_level_rect, self._cycle_ai_level))
+        hit_targets += [(btn['rect'], lambda n=btn['name']: self.handle_model_action(n)) for btn in self.model_buttons]
+        self._hit_table: List[Tuple[int, int, int, int, Callable[[], None]]] = [
+            (rect.left, rect.right, rect.top, rect.bottom, handler) for rect, handler in hit_targets
+        ]
+
+    def draw_buttons(self, surface: pygame.Surface, origin: Tuple[int, int] = (0, 0)):
+        """绘制所有按钮（origin为目标表面左上角对应的屏幕坐标）"""
+        ox, oy = origin
+        text_blits = []  # 按钮文本在背景画完后统一批量blit
         # 模式按钮
         for btn in self.mode_buttons:
             color = COLORS['SELECTED'] if btn['mode'] == self.selected_mode else COLORS['BUTTON']
-            pygame.draw.rect(surface, color, btn['rect'], border_radius=5)
-            pygame.draw.rect(surface, COLORS['BUTTON_BORDER'], btn['rect'], width=2, border_radius=5)
-            text = self.fonts['normal'].render(btn['name'], True, COLORS['TEXT_DARK'])
-            text_rect = text.get_rect(center=btn['rect'].center)
-            surface.blit(text, text_rect)
+            rect = btn['rect'].move(-ox, -oy)
+            pygame.draw.rect(surface, color, rect, border_radius=5)
+            pygame.draw.rect(surface, COLORS['BUTTON_BORDER'], rect, width=2, border_radius=5)
+            text_blits.append((btn['text_surf'], btn['text_rect'].move(-ox, -oy)))
 
         # AI难度选择
-        pygame.draw.rect(surface, COLORS['BUTTON'], self.ai_level_rect, border_radius=5)
-        pygame.draw.rect(surface, COLORS['BUTTON_BORDER'], self.ai_level_rect, width=2, border_radius=5)
-        level_text = self.fonts['normal'].render(f"AI难度：{self.selected_ai_level}", True, COLORS['TEXT_DARK'])
-        surface.blit(level_text, (self.ai_level_rect.x + 15, self.ai_level_rect.y + 10))
+        level_rect = self.ai_level_rect.move(-ox, -oy)
+        pygame.draw.rect(surface, COLORS['BUTTON'], level_rect, border_radius=5)
+        pygame.draw.rect(surface, COLORS['BUTTON_BORDER'], level_rect, width=2, border_radius=5)
+        level_text = self._level_texts.get(self.selected_ai_level)
+        if level_text is None:
+            level_text = self.fonts['normal'].render(f"AI难度：{self.selected_ai_level}", True, COLORS['TEXT_DARK'])
+            self._level_texts[self.selected_ai_level] = level_text
+        text_blits.append((level_text, (level_rect.x + 15, level_rect.y + 10)))
 
         # 模型管理按钮
         for btn in self.model_buttons:
-            pygame.draw.rect(surface, COLORS['BUTTON'], btn['rect'], border_radius=5)
-            pygame.draw.rect(surface, COLORS['BUTTON_BORDER'], btn['rect'], width=2, border_radius=5)
-            text = self.fonts['normal'].render(btn['name'], True, COLORS['TEXT_DARK'])
-            text_rect = text.get_rect(center=btn['rect'].center)
-            surface.blit(text, text_rect)
-
-    def draw_title(self, surface: pygame.Surface):
-        """绘制面板标题"""
+            rect = btn['rect'].move(-ox, -oy)
+            pygame.draw.rect(surface, COLORS['BUTTON'], rect, border_radius=5)
+            pygame.draw.rect(surface, COLORS['BUTTON_BORDER'], rect, width=2, border_radius=5)
+            text_blits.append((btn['text_surf'], btn['text_rect'].move(-ox, -oy)))
+        surface.blits(text_blits, doreturn=False)
+
+    def draw_title(self, surface: pygame.Surface, origin: Tuple[int, int] = (0, 0)):
+        """绘制面板标题（origin为目标表面左上角对应的屏幕坐标）"""
+        ox, oy = origin
         title = self.fonts['bold'].render("控制面板", True, COLORS['TEXT_LIGHT'])
-        surface.blit(title, (self.x + 20, self.y - 25))
-        pygame.draw.line(surface, COLORS['GRAY'], (self.x, self.y - 10), (self.x + self.width, self.y - 10), 2)
+        surface.blit(title, (self.x + 20 - ox, self.y - 25 - oy))
+        pygame.draw.line(surface, COLORS['GRAY'], (self.x - ox, self.y - 10 - oy), (self.x + self.width - ox, self.y - 10 - oy), 2)
+
+    def _render_static(self) -> pygame.Surface:
+        """把背景、标题、按钮画到一张静态层上（只在状态变化时调用）"""
+        origin = (self.x, self._static_top)
+        static = pygame.Surface((self.width + 1, self.y + self.height - self._static_top), pygame.SRCALPHA)
+        # 空白透明层上用MAX混合原样拷贝背景（普通alpha混合会让半透明背景变暗）
+        static.blit(self._bg_surf, (0, self.y - self._static_top), special_flags=pygame.BLEND_RGBA_MAX)
+        self.draw_title(static, origin)
+        self.draw_buttons(static, origin)
+        return convert_alpha_safe(static)
 
     def handle_click(self, pos: Tuple[int, int]):
-        """处理点击事件"""
-        # 模式按钮点击
-        for btn in self.mode_buttons:
-            if btn['rect'].collidepoint(pos):
-                self.selected_mode = btn['mode']
-                self.game_core.set_mode(btn['mode'], user_id="default_user")
-                if self.on_mode_change:
-                    self.on_mode_change(btn['mode'])
+        """处理点击事件（查命中表，内联边界判断）"""
+        px, py = pos
+        for left, right, top, bottom, handler in self._hit_table:
+            if left <= px < right and top <= py < bottom:
+                handler()
                 return
 
-        # AI难度切换
-        if self.ai_level_rect.collidepoint(pos):
-            current_idx = self.ai_levels.index(self.selected_ai_level)
-            next_idx = (current_idx + 1) % len(self.ai_levels)
-            self.selected_ai_level = self.ai_levels[next_idx]
-            self.game_core.ai_level = self.selected_ai_level
-            if self.on_ai_config_change:
-                self.on_ai_config_change(self.selected_ai_level)
-            return
-
-        # 模型管理按钮点击
-        for btn in self.model_buttons:
-            if btn['rect'].collidepoint(pos):
-                self.handle_model_action(btn['name'])
-                return
+    def _select_mode(self, mode: str):
+        """模式按钮点击：切换游戏模式"""
+        self.selected_mode = mode
+        self.game_core.set_mode(mode, user_id="default_user")
+        if self.on_mode_change:
+            self.on_mode_change(mode)
+
+    def _cycle_ai_level(self):
+        """AI难度按钮点击：循环切换难度"""
+        current_idx = self.ai_levels.index(self.selected_ai_level)
+        next_idx = (current_idx + 1) % len(self.ai_levels)
+        self.selected_ai_level = self.ai_levels[next_idx]
+        self.game_core.ai_level = self.selected_ai_level
+        if self.on_ai_config_change:
+            self.on_ai_config_change(self.selected_ai_level)
+
+    def update_game_status(self, status: str):
+        """更新游戏状态文本"""
+        self._status_surf = render_text('Arial', 14, False, f"状态：{status}", tuple(COLORS['TEXT_LIGHT']))
+
+    def update_user_info(self, user: Dict):
+        """更新当前用户信息文本"""
+        self._user_surf = render_text('Arial', 12, False, f"用户：{user['nickname']}", tuple(COLORS['TEXT_LIGHT']))
+
+    def update_mode_info(self, mode: str):
+        """同步当前游戏模式（静态层按选中状态自动重建）"""
+        self.selected_mode = mode
+
+    def update_ai_level(self, level: str):
+        """同步当前AI难度"""
+        self.selected_ai_level = level
+
+    def dispatch(self, events: List[pygame.event.Event]):
+        """批量分发本帧事件（调用方每帧只调用一次pygame.event.get()，再把同一列表传给各组件）"""
+        for event in events:
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                self.handle_click(event.pos)
 
     def handle_model_action(self, action: str):
         """处理模型管理动作"""
@@ -122,17 +193,39 @@ class ControlPanel:
             print("导出模型成功")
         elif action == '开始训练':
             if self.game_core.current_mode == GAME_MODES['TRAIN']:
-                self.game_core.current_ai.self_play(num_games=100)
+                # 训练在后台线程执行，UI线程继续响应；训练中重复点击忽略
+                if self._training_thread is not None and self._training_thread.is_alive():
+                    self.update_game_status("训练进行中")
+                    return
+                self._training_thread = self.game_core.start_ai_training(num_games=100)
                 print("开始训练...")
         elif action == '重置模型':
             self.game_core.current_ai.load_best_model()
             print("重置模型成功")
 
     def draw(self, surface: pygame.Surface):
-        """绘制完整面板"""
-        # 绘制背景
-        pygame.draw.rect(surface, (*COLORS['PANEL_BG'], 230), (self.x, self.y, self.width, self.height), border_radius=8)
-        pygame.draw.rect(surface, COLORS['GRAY'], (self.x, self.y, self.width, self.height), width=2, border_radius=8)
-        # 绘制标题和按钮
-        self.draw_title(surface)
-        self.draw_buttons(surface)
\ No newline at end of file
+        """绘制完整面板（背景、标题、按钮走静态层缓存）"""
+        static_key = (self.selected_mode, self.selected_ai_level)
+        if self._static_surf is None or self._static_key != static_key:
+            self._static_surf = self._render_static()
+            self._static_key = static_key
+        surface.blit(self._static_surf, (self.x, self._static_top))
+        # 状态/用户文本（已缓存的表面直接blit）
+        if self._status_surf is not None:
+            surface.blit(self._status_surf, (self.x + 20, self.y + 545))
+        if self._user_surf is not None:
+            surface.blit(self._user_surf, (self.x + 20, self.y + 570))
+        elo = self.game_core.current_elo
+        if elo is not None:
+            if elo != self._elo_value:
+                self._elo_surf = render_text('Arial', 12, False, f"积分：{elo}", tuple(COLORS['TEXT_LIGHT']))
+                self._elo_value = elo
+            surface.blit(self._elo_surf, (self.x + 120, self.y + 570))
+        # 训练进度（仅训练线程运行时显示）
+        if self._training_thread is not None and self._training_thread.is_alive():
+            progress = int(self.game_core.train_progress)
+            progress_text = self._progress_texts.get(progress)
+            if progress_text is None:
+                progress_text = self.fonts['small'].render(f"训练进度：{progress}%", True, COLORS['TEXT_LIGHT'])
+                self._progress_texts[progress] = progress_text
+            surface.blit(progress_text, (self.x + 20, self.y + 520))
\ No newline at end of file
@@ -0,0 +1,27 @@
+import functools
+import pygame
+from typing import Dict, Tuple
+
+# 全局字体缓存：(字体名, 字号, 是否加粗) -> Font（多个组件共享同一实例）
+_FONT_CACHE: Dict[Tuple[str, int, bool], pygame.font.Font] = {}
+
+
+def get_font(name: str, size: int, bold: bool = False) -> pygame.font.Font:
+    """获取系统字体（同名同字号只加载一次，避免重复查找和解析字体文件）"""
+    key = (name, size, bold)
+    font = _FONT_CACHE.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size, bold=bold)
+        _FONT_CACHE[key] = font
+    return font
+
+
+@functools.lru_cache(maxsize=512)
+def render_text(name: str, size: int, bold: bool, text: str, color: Tuple[int, ...]) -> pygame.Surface:
+    """渲染文本（按字体/内容/颜色缓存表面，状态文本等重复字符串只光栅化一次；color须为元组）"""
+    return get_font(name, size, bold).render(text, True, color)
+
+
+def clear_text_cache():
+    """清空文本表面缓存（字体重新加载或缩放因子变化时调用）"""
+    render_text.cache_clear()
@@ -1,9 +1,31 @@
+import asyncio
+import random
+import threading
+from collections import deque
 import pygame
-from typing import List, Dict, Optional
+from typing import Deque, List, Dict, Optional, Tuple
+from concurrent.futures import Future
 from Common.constants import COLORS
+from Common.logger import Logger
 from Network.live_stream import LiveStreamManager
 from UI.board import Board
 from UI.piece import Piece
+from Common.surface_pool import convert_alpha_safe
+from UI.font_cache import get_font
+
+class Danmaku:
+    """单条弹幕（__slots__属性访问，比字典更快更省内存）"""
+    __slots__ = ('user_name', 'content', 'x', 'y', 'born', 'surf', 'color')
+
+    def __init__(self, user_name: str, content: str, x: float, y: int, born: int,
+                 surf: pygame.Surface, color: Tuple[int, int, int]):
+        self.user_name = user_name
+        self.content = content
+        self.x = x  # 出现时的x坐标
+        self.y = y
+        self.born = born  # 出现时的帧号
+        self.surf = surf  # 白色文字蒙版
+        self.color = color  # 弹幕颜色
 
 class LiveViewer:
     """直播观看组件：弹幕、对局同步、直播间信息"""
@@ -13,10 +35,15 @@ class LiveViewer:
         self.board_size = board_size
         self.cell_size = cell_size
         self.live_manager = LiveStreamManager()
+        # 常驻后台事件循环（守护线程），网络发送不阻塞UI线程
+        self.logger = Logger.get_instance()
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name="LiveViewerLoop", daemon=True)
+        self._loop_thread.start()
         self.fonts = {
-            'normal': pygame.font.SysFont('Arial', 14),
-            'small': pygame.font.SysFont('Arial', 12),
-            'bold': pygame.font.SysFont('Arial', 16, bold=True)
+            'normal': get_font('Arial', 14),
+            'small': get_font('Arial', 12),
+            'bold': get_font('Arial', 16, bold=True)
         }
 
         # 直播状态
@@ -25,17 +52,46 @@ class LiveViewer:
         self.host_name = ""
         self.viewer_count = 0
         self.board = Board(x + 50, y + 80, board_size, cell_size)  # 直播棋盘
+        # 网络线程投递的直播消息（deque的append/popleft线程安全，主循环每帧取出处理一次；
+        # 设上限防止界面长时间不处理时无限堆积，超出时淘汰最早的消息）
+        self._inbox: Deque[Dict] = deque(maxlen=512)
+        self._live_handlers = {
+            'game_update': self._apply_game_update,
+            'chat_message': self._apply_chat_message,
+            'join_success': self._apply_join_success
+        }
         # 弹幕相关
-        self.danmaku_list: List[Dict] = []
+        self.danmaku_list: Deque[Danmaku] = deque(maxlen=15)  # 最多保留15条，超出时自动淘汰最早的
+        self._danmaku_x0 = x + 50 + board_size * cell_size * 0.2  # 弹幕出现时的x坐标（固定值）
+        # 弹幕行位置环：15个固定y槽位循环分配，与deque容量一致，新弹幕总是占用最早弹幕的槽位
+        self._slot_ys = [y + 80 + i * 20 for i in range(15)]
+        self._next_slot = 0
+        self.danmaku_frame = 0  # 弹幕帧计数（每帧+1，弹幕位置和透明度由存活帧数推出）
+        # 预生成的随机弹幕调色板（新弹幕按顺序取色，无需每次调用随机数）
+        self.danmaku_palette = [
+            (random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)) for _ in range(256)
+        ]
+        self.palette_index = 0
+        # 所有弹幕共用的染色缓冲区（不够大时按需扩容）
+        self._tint_buf = pygame.Surface((board_size * cell_size, 32), pygame.SRCALPHA)
+        self._tint_buf_converted = False  # 是否已转换为显示器像素格式
         self.danmaku_input_rect = pygame.Rect(x + 50, y + 600, 400, 35)
         self.danmaku_input_text = ""
         self.send_btn = pygame.Rect(x + 460, y + 600, 80, 35)
         # 直播间信息面板
         self.info_panel_rect = pygame.Rect(x + 600, y + 80, 200, 300)
+        # 直播间信息缓存（房间/主播/观众数变化时置脏重新渲染）
+        self._info_cache: Dict[str, pygame.Surface] = {}
+        self._info_dirty = True
+        # 信息面板背景预渲染一次
+        self._info_bg = pygame.Surface(self.info_panel_rect.size, pygame.SRCALPHA)
+        pygame.draw.rect(self._info_bg, (*COLORS['PANEL_BG'], 230), self._info_bg.get_rect(), border_radius=8)
+        pygame.draw.rect(self._info_bg, COLORS['GRAY'], self._info_bg.get_rect(), width=2, border_radius=8)
 
     def join_live_room(self, room_id: str, user_id: str, user_name: str):
         """加入直播间（对接LiveStreamManager）"""
         self.current_room_id = room_id
+        self._info_dirty = True
         self.is_watching = self.live_manager.join_live_room(
             room_id=room_id,
             user_id=user_id,
@@ -44,74 +100,117 @@ class LiveViewer:
         )
 
     def _on_live_data_received(self, data: Dict):
-        """直播数据回调：同步棋盘、弹幕等"""
-        msg_type = data.get('type')
-        if msg_type == 'game_update':
-            # 同步棋盘状态
-            game_data = data.get('data', {})
-            if 'move' in game_data:
-                move = game_data['move']
-                self.board.place_piece(move['x'], move['y'], is_ai=move.get('is_ai', False))
-            if 'win_line' in game_data:
-                self.board.win_line = game_data['win_line']
-        elif msg_type == 'chat_message':
-            # 接收弹幕
-            chat_data = data.get('data', {})
-            self.danmaku_list.append({
-                'user_name': chat_data.get('user_name', '匿名'),
-                'content': chat_data.get('content', ''),
-                'x': self.x + 50 + self.board_size * self.cell_size * 0.2,
-                'y': self.y + 80 + len(self.danmaku_list) * 20,
-                'alpha': 255
-            })
-            # 限制弹幕数量
-            if len(self.danmaku_list) > 15:
-                self.danmaku_list.pop(0)
-        elif msg_type == 'join_success':
-            # 初始化直播间信息
-            self.host_name = data.get('host_name', '未知主播')
-            self.viewer_count = data.get('viewer_count', 0)
-            # 同步初始棋盘状态
-            current_game = data.get('current_game', {})
-            if 'board_state' in current_game:
-                # 简化实现：假设board_state为字符串格式，转换为棋盘
-                pass
+        """直播数据回调（网络线程调用：只入队，不直接修改界面状态）"""
+        self._inbox.append(data)
+
+    def process_messages(self) -> int:
+        """在UI线程处理已收到的直播消息（按消息类型查表分发），返回处理条数"""
+        inbox = self._inbox
+        handlers = self._live_handlers
+        count = 0
+        while inbox:
+            data = inbox.popleft()
+            handler = handlers.get(data.get('type'))
+            if handler:
+                handler(data)
+            count += 1
+        return count
+
+    def _apply_game_update(self, data: Dict):
+        """同步棋盘状态"""
+        game_data = data.get('data', {})
+        if 'move' in game_data:
+            move = game_data['move']
+            self.board.place_piece(move['x'], move['y'], is_ai=move.get('is_ai', False))
+        if 'win_line' in game_data:
+            self.board.win_line = game_data['win_line']
+
+    def _apply_chat_message(self, data: Dict):
+        """接收弹幕"""
+        chat_data = data.get('data', {})
+        self.danmaku_list.append(self._create_danmaku(
+            chat_data.get('user_name', '匿名'),
+            chat_data.get('content', '')
+        ))
+
+    def _apply_join_success(self, data: Dict):
+        """初始化直播间信息"""
+        self.host_name = data.get('host_name', '未知主播')
+        self.viewer_count = data.get('viewer_count', 0)
+        self._info_dirty = True
+        # 同步初始棋盘状态
+        current_game = data.get('current_game', {})
+        if 'board_state' in current_game:
+            # 简化实现：假设board_state为字符串格式，转换为棋盘
+            pass
+
+    def _create_danmaku(self, user_name: str, content: str) -> Danmaku:
+        """创建弹幕（文本只在到达时光栅化一次为白色蒙版，颜色在绘制时染色）"""
+        mask = convert_alpha_safe(self.fonts['small'].render(f"{user_name}: {content}", True, (255, 255, 255)))
+        slot = self._next_slot
+        self._next_slot = (slot + 1) % len(self._slot_ys)
+        return Danmaku(
+            user_name=user_name,
+            content=content,
+            x=self._danmaku_x0,
+            y=self._slot_ys[slot],
+            born=self.danmaku_frame,
+            surf=mask,
+            color=self._next_danmaku_color()
+        )
+
+    def _next_danmaku_color(self) -> Tuple[int, int, int]:
+        """从调色板依次取弹幕颜色（循环使用）"""
+        color = self.danmaku_palette[self.palette_index]
+        self.palette_index = (self.palette_index + 1) & 0xFF
+        return color
 
     def send_danmaku(self, user_name: str):
         """发送弹幕（对接LiveStreamManager）"""
-        if not self.is_watching or not self.danmaku_input_text.strip():
+        text = self.danmaku_input_text.strip()
+        if not self.is_watching or not text:
             return
-        # 发送弹幕到直播服务器
-        import asyncio
-        asyncio.run(self.live_manager._handle_viewer_chat(
+        # 发送弹幕到直播服务器（提交到后台事件循环，立即返回；失败在完成回调中记录）
+        future = asyncio.run_coroutine_threadsafe(self.live_manager._handle_viewer_chat(
             room_id=self.current_room_id,
             user_name=user_name,
-            content=self.danmaku_input_text.strip()
-        ))
+            content=text
+        ), self._loop)
+        future.add_done_callback(self._on_danmaku_sent)
         # 本地显示自己的弹幕
-        self.danmaku_list.append({
-            'user_name': user_name,
-            'content': self.danmaku_input_text.strip(),
-            'x': self.x + 50 + self.board_size * self.cell_size * 0.2,
-            'y': self.y + 80 + len(self.danmaku_list) * 20,
-            'alpha': 255
-        })
+        self.danmaku_list.append(self._create_danmaku(user_name, text))
         self.danmaku_input_text = ""
 
+    def _on_danmaku_sent(self, future: Future):
+        """弹幕发送完成回调（事件循环线程调用，只记录失败）"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self.logger.error(f"发送弹幕失败：{str(error)}")
+
     def draw_live_info(self, surface: pygame.Surface):
         """绘制直播间信息"""
-        # 标题
+        if self._info_dirty:
+            self._render_live_info()
+        # 标题与主播/观众信息
+        surface.blit(self._info_cache['header'], (self.x + 50, self.y + 20))
+        # 信息面板（背景+标题+内容）
+        surface.blit(self._info_cache['panel'], self.info_panel_rect.topleft)
+
+    def _render_live_info(self):
+        """把直播间信息整体渲染为表头层和面板层（仅在信息变化后调用）"""
         title = self.fonts['bold'].render(f"直播间 {self.current_room_id}", True, COLORS['TEXT_LIGHT'])
-        surface.blit(title, (self.x + 50, self.y + 20))
-        # 主播和观众信息
         info_text = self.fonts['small'].render(f"主播：{self.host_name} | 观众：{self.viewer_count}人", True, COLORS['TEXT_LIGHT'])
-        surface.blit(info_text, (self.x + 50, self.y + 50))
-        # 信息面板背景
-        pygame.draw.rect(surface, (*COLORS['PANEL_BG'], 230), self.info_panel_rect, border_radius=8)
-        pygame.draw.rect(surface, COLORS['GRAY'], self.info_panel_rect, width=2, border_radius=8)
+        header = pygame.Surface((max(title.get_width(), info_text.get_width()), 30 + info_text.get_height()), pygame.SRCALPHA)
+        # 空白透明层上用MAX混合原样拷贝文字像素
+        header.blit(title, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+        header.blit(info_text, (0, 30), special_flags=pygame.BLEND_RGBA_MAX)
+        self._info_cache['header'] = convert_alpha_safe(header)
+
+        panel = self._info_bg.copy()
         # 面板标题
-        panel_title = self.fonts['bold'].render("直播信息", True, COLORS['TEXT_LIGHT'])
-        surface.blit(panel_title, (self.info_panel_rect.x + 20, self.info_panel_rect.y + 15))
+        panel.blit(self.fonts['bold'].render("直播信息", True, COLORS['TEXT_LIGHT']), (20, 15))
         # 面板内容
         content_lines = [
             f"房间ID：{self.current_room_id}",
@@ -124,28 +223,47 @@ class LiveViewer:
             "• 支持实时互动"
         ]
         for i, line in enumerate(content_lines):
-            text = self.fonts['small'].render(line, True, COLORS['TEXT_LIGHT'])
-            surface.blit(text, (self.info_panel_rect.x + 20, self.info_panel_rect.y + 40 + i * 20))
+            panel.blit(self.fonts['small'].render(line, True, COLORS['TEXT_LIGHT']), (20, 40 + i * 20))
+        self._info_cache['panel'] = convert_alpha_safe(panel)
+        self._info_dirty = False
 
     def draw_danmaku(self, surface: pygame.Surface):
         """绘制弹幕"""
-        # 更新弹幕位置和透明度
-        for danmaku in self.danmaku_list:
-            danmaku['x'] -= 1  # 弹幕左移
-            danmaku['alpha'] -= 1  # 透明度降低
-        # 过滤消失的弹幕
-        self.danmaku_list = [d for d in self.danmaku_list if d['alpha'] > 0]
-        # 绘制弹幕
-        for danmaku in self.danmaku_list:
-            # 随机弹幕颜色
-            color = (
-                random.randint(0, 255),
-                random.randint(0, 255),
-                random.randint(0, 255),
-                danmaku['alpha']
-            )
-            text = self.fonts['small'].render(f"{danmaku['user_name']}: {danmaku['content']}", True, color)
-            surface.blit(text, (danmaku['x'], danmaku['y']))
+        # 所有弹幕每帧统一左移1像素、透明度减1，只需推进帧计数
+        self.danmaku_frame += 1
+        frame = self.danmaku_frame
+        # 移除消失的弹幕（存活255帧后透明度降为0；先到先消失，只需从队首弹出）
+        danmaku_list = self.danmaku_list
+        while danmaku_list and frame - danmaku_list[0].born >= 255:
+            danmaku_list.popleft()
+        if not self.danmaku_list:
+            return
+        # 每条弹幕在共用缓冲区中占一行，做 纯色×白色蒙版 得到带当前透明度的彩色文字
+        row_height = max(d.surf.get_height() for d in danmaku_list)
+        tint_buf = self._ensure_tint_buf(
+            max(d.surf.get_width() for d in danmaku_list),
+            row_height * len(danmaku_list)
+        )
+        blit_sequence = []
+        for i, danmaku in enumerate(danmaku_list):
+            age = frame - danmaku.born
+            area = danmaku.surf.get_rect(top=i * row_height)
+            tint_buf.fill((*danmaku.color, 255 - age), area)
+            tint_buf.blit(danmaku.surf, area, special_flags=pygame.BLEND_RGBA_MULT)
+            blit_sequence.append((tint_buf, (danmaku.x - age, danmaku.y), area))
+        # 各行互不覆盖，一次批量blit到屏幕
+        surface.blits(blit_sequence, doreturn=False)
+
+    def _ensure_tint_buf(self, width: int, height: int) -> pygame.Surface:
+        """获取至少为指定尺寸的染色缓冲区（只在弹幕文本超出当前尺寸时重新分配）"""
+        buf_width, buf_height = self._tint_buf.get_size()
+        if width > buf_width or height > buf_height:
+            self._tint_buf = pygame.Surface((max(width, buf_width), max(height, buf_height)), pygame.SRCALPHA)
+            self._tint_buf_converted = False
+        if not self._tint_buf_converted and pygame.display.get_surface() is not None:
+            self._tint_buf = convert_alpha_safe(self._tint_buf)
+            self._tint_buf_converted = True
+        return self._tint_buf
 
     def draw_danmaku_input(self, surface: pygame.Surface):
         """绘制弹幕输入框"""
@@ -176,6 +294,22 @@ class LiveViewer:
         """处理退格键（弹幕输入）"""
         self.danmaku_input_text = self.danmaku_input_text[:-1]
 
+    def dispatch(self, events: List[pygame.event.Event], user_name: str):
+        """批量分发本帧事件（点击/文本输入/退格，与ControlPanel共用同一事件列表）"""
+        for event in events:
+            event_type = event.type
+            if event_type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                self.handle_click(event.pos, user_name)
+            elif event_type == pygame.TEXTINPUT:
+                self.handle_text_input(event.text)
+            elif event_type == pygame.KEYDOWN and event.key == pygame.K_BACKSPACE:
+                self.handle_backspace()
+
+    def close(self):
+        """停止后台事件循环"""
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
     def draw(self, surface: pygame.Surface):
         """绘制完整直播组件"""
         if not self.is_watching:
@@ -1,9 +1,15 @@
 import pygame
 import sys
 import os
-from typing import Optional, Dict, List, Tuple, Callable
+import time
+import queue
+import functools
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Dict, List, Tuple, Callable, Any
 from Common.config import Config
-from Common.constants import COLORS, GAME_MODES, AI_LEVELS, TRAIN_STATUSES, MSG_TYPES
+from Common.constants import COLORS, GAME_MODES, AI_LEVELS, TRAIN_STATUSES, MSG_TYPES, PIECE_COLORS
 from Common.logger import Logger
 from Common.error_handler import UIError, ErrorHandler
 from Common.event import EventManager, Event
@@ -17,23 +23,119 @@ from UI.menu import MainMenu, GameMenu
 from UI.ranking import RankingPanel
 from UI.live_viewer import LiveViewer
 from UI.resources import ResourceManager
-from Game.game_core import GameCore
+from UI.font_cache import get_font, clear_text_cache
+from Game.game_core import GameCore, run_training_process
 from Game.game_mode import GameModeManager
 from Storage.user_storage import UserStorage
 from Storage.game_record_storage import GameRecordStorage
 from Storage.model_storage import ModelStorage
 
+# 主菜单动画重绘定时事件（主菜单空闲时阻塞等待，仍需定期唤醒重绘）
+REDRAW_EVENT = pygame.USEREVENT + 1
+# 进程DPI感知只需设置一次（重复调用SetProcessDpiAwareness会失败）
+_DPI_AWARENESS_SET = False
+# SDL2窗口切换显示器事件（pygame 2.1.3+提供，旧版本为None）
+_WINDOW_DISPLAY_CHANGED = getattr(pygame, 'WINDOWDISPLAYCHANGED', None)
+
+# 仅依赖缩放因子的布局常量（DPI不变时只计算一次）
+ScaledLayout = namedtuple('ScaledLayout', ['panel', 'sidebar', 'margin', 'spacing', 'cell'])
+# 窗口尺寸相关的布局参数
+Layout = namedtuple('Layout', [
+    'width', 'height', 'panel_width', 'sidebar_width', 'board_margin',
+    'cell_size', 'board_x', 'board_y', 'sidebar_x', 'panel_height'
+])
+
+
+def _compute_scaled(scale: float, base_cell_size: int) -> ScaledLayout:
+    """按缩放因子计算布局常量"""
+    return ScaledLayout(
+        panel=int(320 * scale),
+        sidebar=int(280 * scale),
+        margin=int(20 * scale),
+        spacing=int(10 * scale),
+        cell=int(base_cell_size * scale)
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _compute_layout(width: int, height: int, scaled: ScaledLayout) -> Layout:
+    """计算窗口布局（按尺寸缓存，拖拽缩放时往返于相同尺寸无需重算）"""
+    return Layout(
+        width=width,
+        height=height,
+        panel_width=scaled.panel,
+        sidebar_width=scaled.sidebar,
+        board_margin=scaled.margin,
+        cell_size=scaled.cell,
+        board_x=scaled.panel + 2 * scaled.margin,
+        board_y=scaled.margin,
+        sidebar_x=width - scaled.sidebar - scaled.margin,
+        panel_height=height - 2 * scaled.margin
+    )
+
+
 class MainWindow:
     """程序主窗口（Win11深度适配：高DPI、系统字体、窗口缩放、流畅动画）"""
+    # 主循环逐条分发的事件类型（鼠标移动单独合并处理）
+    _DISPATCH_EVENT_TYPES = [pygame.QUIT, pygame.VIDEORESIZE, pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN, pygame.USEREVENT,
+                             pygame.TEXTINPUT]
+    if _WINDOW_DISPLAY_CHANGED is not None:
+        _DISPATCH_EVENT_TYPES.append(_WINDOW_DISPLAY_CHANGED)
+    # 字体规格：用途 -> (字号, 是否加粗)
+    _FONT_SPECS = {
+        'title': (28, True),
+        'sub_title': (22, True),
+        'normal': (18, False),
+        'small': (14, False),
+        'tiny': (12, False)
+    }
+    _FONT_FAMILY = 'Microsoft YaHei'  # Win11系统字体
+    # 显示模式：单一软件表面（不用HWSURFACE/SCALED，display.update局部刷新才真正只提交脏区域；
+    # 高DPI由scale_factor按物理像素直接布局）
+    _WINDOW_FLAGS = pygame.RESIZABLE | pygame.DOUBLEBUF
+    _FULLSCREEN_FLAGS = pygame.FULLSCREEN | pygame.DOUBLEBUF
+    # 窗口缩放防抖时间（秒）：拖拽过程中的连续缩放事件只在停顿后处理一次
+    _RESIZE_DEBOUNCE = 0.15
+    # 主菜单空闲时单次等待事件的超时（毫秒）及动画重绘周期（毫秒）
+    _MENU_IDLE_TIMEOUT = 50
+    _MENU_REDRAW_INTERVAL = 200
+    # 训练进度重绘最小间隔（秒）
+    _PROGRESS_REDRAW_INTERVAL = 0.1
+    # 对局结束提示：胜方 -> (状态, 提示, 胜方棋色；平局为None)
+    _GAME_END_TABLE = {
+        'black': ("黑方获胜", "游戏结束，黑方获胜！", PIECE_COLORS.BLACK),
+        'white': ("白方获胜", "游戏结束，白方获胜！", PIECE_COLORS.WHITE),
+        'draw': ("平局", "游戏结束，平局！", None)
+    }
+    # 会改变界面内容的业务事件（触发时整帧重绘）
+    _VIEW_CHANGE_EVENTS = (
+        'game_start', 'game_end', 'move_made', 'ai_thinking_start', 'ai_thinking_end',
+        'model_saved', 'train_progress', 'train_complete', 'online_connected',
+        'online_disconnected', 'live_room_created', 'live_room_joined', 'live_message',
+        'error_occurred'
+    )
+
     def __init__(self):
         # 核心依赖初始化
         self.config = Config.get_instance()
+        # 音效开关（构造时读取一次，配置变更时刷新）
+        self._sound_enabled = self.config.get_bool('GAME', 'enable_sound', True)
+        self.config.add_ini_listener(self._on_config_changed)
         self.logger = Logger.get_instance()
         self.event_manager = EventManager()
         self.resource_manager = ResourceManager()  # 资源管理器
         self.user_storage = UserStorage()
         self.game_record_storage = GameRecordStorage()
         self.model_storage = ModelStorage()
+        # 阻塞IO（存储/网络）线程池，结果通过USEREVENT投递回UI线程
+        self._io = ThreadPoolExecutor(max_workers=2, thread_name_prefix='ui_io')
+        # 模型训练子进程（CPU密集训练不与UI线程争用GIL，进度经队列回传）
+        self._train_process: Optional[multiprocessing.Process] = None
+        self._train_queue: Optional[multiprocessing.Queue] = None
+        # 训练进度载荷与事件对象（每帧原地更新后直接交给进度回调，不再逐条分配字典/事件）
+        self._progress_payload: Dict[str, float] = {'progress': 0.0, 'loss': 0.0}
+        self._progress_event = Event('train_progress', self._progress_payload)
+        self._progress_redraw_next = 0.0  # 训练进度区域下次允许重绘的时刻（进度重绘限频10Hz）
 
         # 窗口基础配置（Win11优化）
         self.base_width = self.config.get_int('WINDOW', 'DEFAULT_WIDTH')
@@ -46,20 +148,28 @@ class MainWindow:
         # Pygame初始化（Win11兼容配置）
         pygame.init()
         pygame.display.set_caption(self.window_title)
-        # 高DPI适配 + 硬件加速 + 双缓冲
+        # 高DPI适配（软件表面，支持局部刷新）
         self.screen = pygame.display.set_mode(
             (self.base_width, self.base_height),
-            pygame.RESIZABLE | pygame.DOUBLEBUF | pygame.HWSURFACE | pygame.SCALED
+            self._WINDOW_FLAGS
         )
         self.clock = pygame.time.Clock()
+        # 屏蔽主循环不处理的事件类型，避免其进入SDL事件队列
+        pygame.event.set_blocked([
+            pygame.ACTIVEEVENT, pygame.JOYAXISMOTION, pygame.JOYBALLMOTION, pygame.JOYHATMOTION,
+            pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP, pygame.MOUSEBUTTONUP, pygame.KEYUP
+        ])
         self.scale_factor = 1.0  # 窗口缩放因子
+        # 桌面分辨率缓存（全屏切换使用，仅显示器切换时刷新）
+        self._desktop_size = self._query_desktop_size()
         self._adapt_high_dpi()  # Win11高DPI适配
 
-        # 组件布局参数（基于缩放因子动态调整）
-        self.panel_width = int(320 * self.scale_factor)
-        self.sidebar_width = int(280 * self.scale_factor)
-        self.board_margin = int(20 * self.scale_factor)
-        self.component_spacing = int(10 * self.scale_factor)
+        # 组件布局参数（基于缩放因子计算一次，仅显示器切换时重算）
+        self._scaled = _compute_scaled(self.scale_factor, self.config.get_int('GAME', 'CELL_SIZE'))
+        self.panel_width = self._scaled.panel
+        self.sidebar_width = self._scaled.sidebar
+        self.board_margin = self._scaled.margin
+        self.component_spacing = self._scaled.spacing
 
         # 核心组件初始化
         self._init_components()
@@ -81,6 +191,46 @@ class MainWindow:
         self.is_ai_thinking = False  # AI思考中状态
         self.game_active = False  # 游戏激活状态
 
+        # 局部刷新状态（脏矩形）
+        self._full_redraw = True  # 下一帧是否整屏重绘
+        self._dirty_rects: List[pygame.Rect] = []  # 下一帧需重绘的区域
+        # Pygame事件类型→处理方法（与_DISPATCH_EVENT_TYPES一一对应）
+        self._event_handlers: Dict[int, Callable[[pygame.event.Event], None]] = {
+            pygame.QUIT: self._on_quit_event,
+            pygame.VIDEORESIZE: self._on_resize_event,
+            pygame.MOUSEBUTTONDOWN: self._on_mouse_down_event,
+            pygame.KEYDOWN: self._on_key_down_event,
+            pygame.USEREVENT: self._on_user_event,
+            # 文本输入只有直播弹幕框使用，由live_viewer.dispatch随本帧事件列表批量处理
+            pygame.TEXTINPUT: lambda event: None
+        }
+        if _WINDOW_DISPLAY_CHANGED is not None:
+            # 窗口移到其他显示器（DPI可能变化，重算缩放相关布局）
+            self._event_handlers[_WINDOW_DISPLAY_CHANGED] = lambda event: self._on_display_changed()
+        # 棋盘分析结果缓存（按局面Zobrist哈希，同一局面重复分析直接复用；开始/停止对局时清空）
+        self._analysis_cache: Dict[int, Dict] = {}
+        self._anim_rect: Optional[pygame.Rect] = None  # 上一帧落子动画区域（动画结束后再补画一帧）
+        # 各界面状态组合对应的绘制层序列缓存（组合数有限，首次进入某状态时生成）
+        self._layer_plans: Dict[Tuple[bool, ...], Tuple[Tuple[str, Callable[[pygame.Surface], None]], ...]] = {}
+        self._last_hover_pos: Tuple[int, int] = (-1, -1)  # 上次处理悬停时的鼠标位置
+        # 悬停命中表（组件区域，仅布局变化时重建）
+        self._hover_targets: List[Tuple[pygame.Rect, Any]] = []
+        self._hover_component: Any = None  # 上次悬停命中的组件
+        self._rebuild_hover_targets()
+        self._update_board_transform()
+        # 窗口缩放防抖状态
+        self._resize_pending_size: Optional[Tuple[int, int]] = None
+        self._resize_deadline = 0.0
+        # 事件泵取节流：每个目标帧周期最多泵取一次SDL事件队列
+        self._poll_interval = 1.0 / self.fps if self.fps > 0 else 0.0
+        self._next_pump = time.perf_counter()
+        # 训练进度日志按秒汇总
+        self._train_log_next = 0.0
+        self._train_log_skipped = 0
+        # 主菜单动画定期重绘
+        pygame.time.set_timer(REDRAW_EVENT, self._MENU_REDRAW_INTERVAL)
+        self._rebuild_layer_rects()
+
         # 加载资源（Win11系统字体优先）
         self._load_resources()
 
@@ -90,14 +240,25 @@ class MainWindow:
         # 初始化完成日志
         self.logger.info("主窗口初始化完成（Win11适配版）")
 
+    @staticmethod
+    def _query_desktop_size() -> Tuple[int, int]:
+        """查询当前桌面分辨率（旧版pygame无get_desktop_sizes时退回display.Info）"""
+        if hasattr(pygame.display, 'get_desktop_sizes'):
+            return pygame.display.get_desktop_sizes()[0]
+        info = pygame.display.Info()
+        return info.current_w, info.current_h
+
     def _adapt_high_dpi(self):
-        """Win11高DPI适配（自动调整缩放因子）"""
+        """Win11高DPI适配（自动调整缩放因子；进程DPI感知只设置一次）"""
+        global _DPI_AWARENESS_SET
         try:
             # Windows系统高DPI感知
             if os.name == 'nt':
                 import ctypes
                 # 设置进程DPI感知（Per-Monitor V2）
-                ctypes.windll.shcore.SetProcessDpiAwareness(2)
+                if not _DPI_AWARENESS_SET:
+                    ctypes.windll.shcore.SetProcessDpiAwareness(2)
+                    _DPI_AWARENESS_SET = True
                 # 获取当前DPI缩放比例
                 dpi_x = ctypes.windll.user32.GetDpiForWindow(pygame.display.get_wm_info()['window'])
                 self.scale_factor = dpi_x / 96.0  # 96为标准DPI
@@ -167,7 +328,7 @@ class MainWindow:
 
         # 4. 棋盘组件（中间）
         self.board_size = self.config.get_int('GAME', 'BOARD_SIZE')
-        self.cell_size = int(self.config.get_int('GAME', 'CELL_SIZE') * self.scale_factor)
+        self.cell_size = self._scaled.cell
         self.board_x = self.panel_width + 2 * self.board_margin
         self.board_y = self.board_margin
         self.board = Board(
@@ -202,7 +363,8 @@ class MainWindow:
             width=self.sidebar_width,
             height=self.base_height - 2 * self.board_margin,
             scale_factor=self.scale_factor,
-            event_manager=self.event_manager
+            event_manager=self.event_manager,
+            ranking_system=self.game_core.ranking_system
         )
 
         # 8. 直播观看组件（右侧，与排行榜切换）
@@ -216,33 +378,40 @@ class MainWindow:
         )
 
     def _load_resources(self):
-        """加载资源（Win11系统字体 + 本地资源）"""
-        # 1. 字体加载（优先使用Win11系统字体）
-        self.fonts = self.resource_manager.load_fonts([
-            ('title', 28, True),
-            ('sub_title', 22, True),
-            ('normal', 18, False),
-            ('small', 14, False),
-            ('tiny', 12, False)
-        ])
-
-        # 2. 图标资源（本地+默认绘制）
-        self.icons = self.resource_manager.load_icons([
-            'black_piece', 'white_piece', 'ai_icon', 'user_icon',
-            'rank_icon', 'live_icon', 'settings_icon', 'train_icon',
-            'save_icon', 'load_icon', 'analyze_icon'
-        ])
-
-        # 3. 背景图（Win11适配分辨率）
+        """加载资源（背景和常用字体立即加载，其余字体/图标/音效首次使用时按需加载）"""
+        # 1. 按需加载缓存（用途/名称 -> 资源；加载失败的音效/图标缓存为None，避免重复查找文件）
+        self.fonts: Dict[str, pygame.font.Font] = {}
+        self.icons: Dict[str, Optional[pygame.Surface]] = {}
+        self.sounds: Dict[str, Optional[pygame.mixer.Sound]] = {}
+        # 每帧都会使用的正文字体预先加载
+        self._get_font('normal')
+
+        # 2. 背景图（Win11适配分辨率，首帧即需要）
         self.background = self.resource_manager.load_background(
             width=self.base_width,
             height=self.base_height
         )
 
-        # 4. 音效资源（可选，默认关闭）
-        self.sounds = self.resource_manager.load_sounds([
-            'place_piece', 'win', 'lose', 'draw', 'button_click'
-        ])
+    def _get_font(self, role: str) -> pygame.font.Font:
+        """获取指定用途的字体（首次使用时加载，Win11系统字体）"""
+        font = self.fonts.get(role)
+        if font is None:
+            size, bold = self._FONT_SPECS[role]
+            font = get_font(self._FONT_FAMILY, int(size * self.scale_factor), bold=bold)
+            self.fonts[role] = font
+        return font
+
+    def _get_icon(self, name: str) -> Optional[pygame.Surface]:
+        """获取图标（首次使用时加载）"""
+        if name not in self.icons:
+            self.icons[name] = self.resource_manager.load_image(name, f"{name}.png")
+        return self.icons[name]
+
+    def _get_sound(self, name: str) -> Optional[pygame.mixer.Sound]:
+        """获取音效（首次使用时加载）"""
+        if name not in self.sounds:
+            self.sounds[name] = self.resource_manager.load_sound(name, f"{name}.wav")
+        return self.sounds[name]
 
     def _register_events(self):
         """注册全局事件监听（事件驱动解耦）"""
@@ -252,6 +421,7 @@ class MainWindow:
         self.event_manager.register('move_made', self._on_move_made_event)
         self.event_manager.register('ai_thinking_start', self._on_ai_thinking_start)
         self.event_manager.register('ai_thinking_end', self._on_ai_thinking_end)
+        self.event_manager.register('ai_thinking_update', self._on_ai_thinking_update)
         self.event_manager.register('model_saved', self._on_model_saved_event)
         self.event_manager.register('train_progress', self._on_train_progress_event)
         self.event_manager.register('train_complete', self._on_train_complete_event)
@@ -266,12 +436,41 @@ class MainWindow:
         # 错误事件
         self.event_manager.register('error_occurred', self._on_error_occurred)
 
+        # 后台IO完成事件
+        self.event_manager.register('ranking_loaded', self._on_ranking_loaded)
+        self.event_manager.register('model_save_done', self._on_model_save_done)
+        self.event_manager.register('trained_model_loaded', self._on_trained_model_loaded)
+        self.event_manager.register('live_join_done', self._on_live_join_done)
+
+        # 界面变化事件统一标记重绘
+        for event_type in self._VIEW_CHANGE_EVENTS:
+            self.event_manager.register(event_type, self._on_view_changed)
+
     # ------------------------------ 窗口生命周期管理 ------------------------------
     def run(self):
         """主窗口运行循环（Win11流畅度优化）"""
         while self.running:
-            # 事件处理（优先响应）
-            self._handle_events()
+            # 空闲路径（主菜单，或对局中等待玩家思考）：阻塞等待输入（SDL休眠线程，不再空转重绘静态画面）
+            if self.show_main_menu or self._is_idle():
+                event = pygame.event.wait(self._MENU_IDLE_TIMEOUT)
+                if event.type != pygame.NOEVENT:
+                    # 放回队列，与其余待处理事件一起按常规流程分发
+                    pygame.event.post(event)
+                self._handle_events()
+                self.event_manager.flush_frame()
+                self.live_viewer.process_messages()
+                self._draw_interface()
+                continue
+
+            # 事件处理（优先响应；按帧周期截止时间节流泵取）
+            now = time.perf_counter()
+            if now >= self._next_pump:
+                self._handle_events()
+                # 推进截止时间（落后超过一个周期时从当前时刻重新计时，避免连续追赶泵取）
+                self._next_pump = max(self._next_pump + self._poll_interval, now)
+            # 本帧缓冲的业务事件按层级统一分发、网络线程投递的直播消息统一处理（绘制前完成所有状态修改）
+            self.event_manager.flush_frame()
+            self.live_viewer.process_messages()
 
             # 绘制界面（双缓冲优化）
             self._draw_interface()
@@ -282,71 +481,220 @@ class MainWindow:
         # 退出清理
         self._cleanup()
 
+    def _is_idle(self) -> bool:
+        """游戏界面是否空闲（AI未思考、无落子动画及其收尾帧、未显示直播时，画面只随输入变化）"""
+        return not (self.is_ai_thinking or self.board.animating or self._anim_rect is not None
+                    or self.show_live_viewer)
+
     def _handle_events(self):
-        """处理所有Pygame事件（Win11交互适配）"""
-        for event in pygame.event.get():
-            # 退出事件
-            if event.type == pygame.QUIT:
-                self.running = False
+        """处理所有Pygame事件（Win11交互适配：每帧泵一次，按类型批量取出）"""
+        if self._train_process is not None:
+            self._drain_train_queue()
+        pygame.event.pump()
+        # 鼠标移动事件合并：高回报率鼠标每帧可产生上百条，只处理最后位置
+        if pygame.event.get(pygame.MOUSEMOTION, pump=False):
+            self._handle_mouse_hover(pygame.mouse.get_pos())
+
+        # 定时重绘事件合并：只重绘主菜单区域（游戏中忽略）
+        if pygame.event.get(REDRAW_EVENT, pump=False) and self.show_main_menu:
+            self._invalidate(self._layer_rects['main_menu'])
+
+        events = pygame.event.get(self._DISPATCH_EVENT_TYPES, pump=False)
+        if events:
+            # 点击/按键/缩放/自定义事件可能改变任意组件状态，整帧重绘
+            self._invalidate()
+        # 按事件类型查表分发（取出的事件类型均在表中）
+        handlers = self._event_handlers
+        for event in events:
+            handlers[event.type](event)
+        # 组件内部的点击/文本输入：同一事件列表整批交给可见组件（组件各自做命中判断）
+        if events and not self.show_main_menu:
+            if self.show_control_panel:
+                self.control_panel.dispatch(events)
+            if self.show_live_viewer:
+                user_name = self.current_user['nickname'] if self.current_user else '游客'
+                self.live_viewer.dispatch(events, user_name)
+
+        # 丢弃其余未处理类型的事件（与逐条取出后忽略等价），防止队列堆积
+        pygame.event.clear(pump=False)
+
+        # 缩放停顿超过防抖时间后才执行重布局
+        if self._resize_pending_size and time.monotonic() >= self._resize_deadline:
+            new_w, new_h = self._resize_pending_size
+            self._resize_pending_size = None
+            self._handle_window_resize(new_w, new_h)
+            self._invalidate()
+
+    def _on_quit_event(self, event: pygame.event.Event):
+        """退出事件"""
+        self.running = False
 
-            # 窗口缩放事件（动态调整组件布局）
-            elif event.type == pygame.VIDEORESIZE:
-                self._handle_window_resize(event.w, event.h)
+    def _on_resize_event(self, event: pygame.event.Event):
+        """窗口缩放事件（防抖：只记录最新尺寸，停顿后统一调整布局）"""
+        self._resize_pending_size = (event.w, event.h)
+        self._resize_deadline = time.monotonic() + self._RESIZE_DEBOUNCE
 
-            # 鼠标事件（点击+悬停）
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                self._handle_mouse_click(pygame.mouse.get_pos(), event.button)
-            elif event.type == pygame.MOUSEMOTION:
-                self._handle_mouse_hover(pygame.mouse.get_pos())
+    def _on_mouse_down_event(self, event: pygame.event.Event):
+        """鼠标点击事件"""
+        self._handle_mouse_click(pygame.mouse.get_pos(), event.button)
 
-            # 键盘事件（快捷键支持）
-            elif event.type == pygame.KEYDOWN:
-                self._handle_keyboard(event.key, event.mod)
+    def _on_key_down_event(self, event: pygame.event.Event):
+        """键盘事件（快捷键支持）"""
+        self._handle_keyboard(event.key, event.mod)
 
-            # 自定义事件（通过事件管理器分发）
-            elif event.type == pygame.USEREVENT:
-                self.event_manager.emit(Event(event.custom_type, event.dict))
+    def _on_user_event(self, event: pygame.event.Event):
+        """自定义事件（按custom_type经事件管理器分发）"""
+        self.event_manager.emit_pooled(event.custom_type, event.dict, level=EventManager.LEVEL_WRITE)
 
     def _draw_interface(self):
-        """绘制完整界面（分层绘制，提升性能）"""
-        # 1. 绘制背景（最底层）
-        if self.background:
-            self.screen.blit(self.background, (0, 0))
-        else:
-            self.screen.fill(COLORS.BOARD_BG)
-
-        # 2. 绘制棋盘（中间层）
+        """绘制界面（脏矩形局部刷新：空闲帧不写屏，活动帧只重绘变化区域）"""
+        # 持续动画的区域每帧都需重绘
         if not self.show_main_menu:
-            self.board.draw(self.screen)
-            # 绘制AI思考可视化（叠加）
             if self.show_ai_visualizer and self.is_ai_thinking:
-                self.ai_visualizer.draw(self.screen)
-            # 绘制控制面板
-            if self.show_control_panel:
-                self.control_panel.draw(self.screen)
-            # 绘制游戏菜单
-            self.game_menu.draw(self.screen)
-            # 绘制排行榜/直播（二选一）
-            if self.show_ranking:
-                self.ranking_panel.draw(self.screen)
-            elif self.show_live_viewer:
-                self.live_viewer.draw(self.screen)
-
-        # 3. 绘制主菜单（顶层，覆盖其他组件）
-        if self.show_main_menu:
-            self.main_menu.draw(self.screen)
+                self._invalidate(self._layer_rects['board'])
+            # 落子动画只重绘棋子下落的那一列；上一帧区域也要重绘，保证动画最后一帧落位
+            anim_rect = self.board.animation_rect()
+            if self._anim_rect is not None:
+                self._invalidate(self._anim_rect)
+            if anim_rect is not None:
+                self._invalidate(anim_rect)
+            self._anim_rect = anim_rect
+            if self.show_live_viewer:
+                self._invalidate(self._layer_rects['sidebar'])
+
+        if self._full_redraw:
+            self._draw_layers(self._visible_layers())
+            pygame.display.flip()
+        elif self._dirty_rects:
+            # 各层每帧只绘制一次（draw内推进动画/弹幕/消息），裁剪区取全部脏矩形的并集，区域内按层序完整重合成
+            clip = self._dirty_rects[0].unionall(self._dirty_rects[1:])
+            self._draw_layers(self._visible_layers(), clip)
+            pygame.display.update(self._dirty_rects)
+        self._full_redraw = False
+        self._dirty_rects = []
+
+    def _visible_layers(self) -> Tuple[Tuple[str, Callable[[pygame.Surface], None]], ...]:
+        """当前界面状态对应的绘制层序列（按状态组合缓存，界面处于同一状态时直接复用）"""
+        state = (
+            self.show_main_menu, self.show_ai_visualizer and self.is_ai_thinking,
+            self.show_control_panel, self.show_ranking, self.show_live_viewer
+        )
+        layers = self._layer_plans.get(state)
+        if layers is None:
+            layers = self._build_layers(*state)
+            self._layer_plans[state] = layers
+        return layers
+
+    def _build_layers(self, main_menu: bool, visualizer: bool, control_panel: bool,
+                      ranking: bool, live_viewer: bool) -> Tuple[Tuple[str, Callable[[pygame.Surface], None]], ...]:
+        """生成绘制层序列（自底向上：棋盘→AI可视化→控制面板→游戏菜单→侧边栏；主菜单覆盖其他组件）"""
+        if main_menu:
+            return (('main_menu', self.main_menu.draw),)
+        layers = [('board', self.board.draw)]
+        if visualizer:
+            layers.append(('board', self.ai_visualizer.draw))
+        if control_panel:
+            layers.append(('control_panel', self.control_panel.draw))
+        layers.append(('game_menu', self.game_menu.draw))
+        # 排行榜/直播（二选一）
+        if ranking:
+            layers.append(('sidebar', self.ranking_panel.draw))
+        elif live_viewer:
+            layers.append(('sidebar', self.live_viewer.draw))
+        return tuple(layers)
+
+    def _draw_layers(self, layers: Tuple[Tuple[str, Callable[[pygame.Surface], None]], ...],
+                     clip: Optional[pygame.Rect] = None):
+        """分层绘制界面（clip非空时裁剪到该区域，只重绘与其相交的层）"""
+        self.screen.set_clip(clip)
+        # 1. 背景（最底层）
+        if self.background:
+            if clip is None:
+                self.screen.blit(self.background, (0, 0))
+            else:
+                self.screen.blit(self.background, clip, clip)
+        else:
+            self.screen.fill(COLORS.BOARD_BG, clip)
+        # 2. 各组件按层级叠加（相互重叠的组件在同一裁剪区内按序重绘）
+        for name, draw in layers:
+            if clip is None or self._layer_rects[name].colliderect(clip):
+                draw(self.screen)
+        self.screen.set_clip(None)
+
+    def _rebuild_layer_rects(self):
+        """按当前布局计算各绘制层的屏幕区域（局部刷新的重绘单位）"""
+        m = self.board_margin
+        board_extent = self.cell_size * self.board_size
+        sidebar_x = self.base_width - self.sidebar_width - m
+        self._layer_rects: Dict[str, pygame.Rect] = {
+            # 控制面板标题绘制在面板上方，区域延伸至窗口顶部
+            'control_panel': pygame.Rect(0, 0, self.panel_width + 2 * m, self.base_height),
+            # 落子动画从棋盘上方开始下落，区域延伸至窗口顶部
+            'board': pygame.Rect(self.board_x - m, 0, board_extent + 2 * m, self.board_y + board_extent + m),
+            'sidebar': pygame.Rect(sidebar_x - m, 0, self.sidebar_width + 2 * m, self.base_height),
+            'game_menu': pygame.Rect(
+                self.base_width - self.game_menu.width - 2 * m, 0,
+                self.game_menu.width + 2 * m, self.game_menu.height + 2 * m
+            ),
+            'main_menu': pygame.Rect(
+                (self.base_width - self.main_menu.width) // 2 - m,
+                (self.base_height - self.main_menu.height) // 2 - m,
+                self.main_menu.width + 2 * m, self.main_menu.height + 2 * m
+            )
+        }
 
-        # 4. 刷新显示（双缓冲切换）
-        pygame.display.flip()
+    def _rebuild_hover_targets(self):
+        """按当前布局重建悬停命中表（顺序与点击响应优先级一致）"""
+        sidebar_rect = pygame.Rect(
+            self.base_width - self.sidebar_width - self.board_margin, self.board_margin,
+            self.sidebar_width, self.base_height - 2 * self.board_margin
+        )
+        self._hover_targets = [
+            (pygame.Rect(self.game_menu.x, self.game_menu.y, self.game_menu.width, self.game_menu.height), self.game_menu),
+            (pygame.Rect(self.board_margin, self.board_margin, self.panel_width, self.base_height - 2 * self.board_margin), self.control_panel),
+            (sidebar_rect, self.ranking_panel),
+            (sidebar_rect, self.live_viewer)
+        ]
+
+    def _is_hover_target_visible(self, component: Any) -> bool:
+        """判断命中表中的组件当前是否显示"""
+        if component is self.ranking_panel:
+            return self.show_ranking
+        if component is self.live_viewer:
+            return self.show_live_viewer
+        if component is self.control_panel:
+            return self.show_control_panel
+        return True
+
+    def _invalidate(self, rect: Optional[pygame.Rect] = None):
+        """标记需重绘的区域（rect为空时整帧重绘）"""
+        if rect is None:
+            self._full_redraw = True
+        elif not self._full_redraw and rect not in self._dirty_rects:
+            self._dirty_rects.append(rect)
+
+    def _invalidate_at(self, pos: Tuple[int, int]):
+        """标记包含指定坐标的所有绘制层区域"""
+        for rect in self._layer_rects.values():
+            if rect.collidepoint(pos):
+                self._invalidate(rect)
+
+    def _on_view_changed(self, event: Event):
+        """界面变化事件回调（标记整帧重绘）"""
+        self._invalidate()
 
     def _cleanup(self):
         """退出清理（释放资源）"""
         # 停止游戏和直播
-        self.game_core.stop_game()
+        self.game_core.transition_to('stopped')
         self.game_core.stop_live()
-        # 保存配置
-        self.config.save_ini()
-        self.config.save_json()
+        self.live_viewer.close()
+        # 等待进行中的后台IO（如模型保存）完成
+        self._io.shutdown(wait=True)
+        if self._train_process is not None and self._train_process.is_alive():
+            self._train_process.terminate()
+        # 保存配置（INI+JSON一次完成）
+        self.config.persist()
         # 释放Pygame资源
         pygame.font.quit()
         pygame.mixer.quit()
@@ -362,34 +710,59 @@ class MainWindow:
         # 更新屏幕尺寸
         self.screen = pygame.display.set_mode(
             (self.base_width, self.base_height),
-            pygame.RESIZABLE | pygame.DOUBLEBUF | pygame.HWSURFACE | pygame.SCALED
+            self._WINDOW_FLAGS
         )
-        # 重新计算布局参数
-        self.panel_width = int(320 * self.scale_factor)
-        self.sidebar_width = int(280 * self.scale_factor)
-        self.board_margin = int(20 * self.scale_factor)
-        self.cell_size = int(self.config.get_int('GAME', 'CELL_SIZE') * self.scale_factor)
+        # 重新计算布局参数（按尺寸缓存；缩放相关常量沿用初始化时的结果）
+        layout = _compute_layout(self.base_width, self.base_height, self._scaled)
+        self.panel_width = layout.panel_width
+        self.sidebar_width = layout.sidebar_width
+        self.board_margin = layout.board_margin
+        self.cell_size = layout.cell_size
         # 更新组件位置和尺寸
-        self._update_component_layout()
-        # 重新加载背景图
+        self._update_component_layout(layout)
+        self._rebuild_layer_rects()
+        self._rebuild_hover_targets()
+        # 重新加载背景图（资源管理器按尺寸缓存）
         self.background = self.resource_manager.load_background(
             width=self.base_width,
             height=self.base_height
         )
-        self.logger.info(f"窗口缩放：{self.base_width}x{self.base_height}")
-
-    def _update_component_layout(self):
+        self.logger.debug("窗口缩放：%dx%d", self.base_width, self.base_height)
+
+    def _on_display_changed(self):
+        """显示器切换回调（重新查询DPI，缩放因子变化时重算布局常量）"""
+        self._desktop_size = self._query_desktop_size()
+        old_scale = self.scale_factor
+        self._adapt_high_dpi()
+        if self.scale_factor == old_scale:
+            return
+        self._scaled = _compute_scaled(self.scale_factor, self.config.get_int('GAME', 'CELL_SIZE'))
+        # 缩放因子变化后字体需按新字号重新加载，旧文本表面作废
+        self.fonts.clear()
+        clear_text_cache()
+        self._handle_window_resize(self.base_width, self.base_height)
+
+    def _update_board_transform(self):
+        """预计算屏幕→棋盘坐标变换参数（悬停预览走内联计算）"""
+        self._inv_cell = 1.0 / self.cell_size
+        self._board_ox, self._board_oy = self.board_x, self.board_y
+        self._board_max = self.board_size - 1
+
+    def _update_component_layout(self, layout: Layout):
         """更新所有组件布局（窗口缩放后）"""
+        # 组件位置已变，下一次鼠标移动必须重新做悬停判定
+        self._last_hover_pos = (-1, -1)
         # 控制面板
         self.control_panel.resize(
-            x=self.board_margin,
-            y=self.board_margin,
-            width=self.panel_width,
-            height=self.base_height - 2 * self.board_margin
+            x=layout.board_margin,
+            y=layout.board_margin,
+            width=layout.panel_width,
+            height=layout.panel_height
         )
         # 棋盘
-        self.board_x = self.panel_width + 2 * self.board_margin
-        self.board_y = self.board_margin
+        self.board_x = layout.board_x
+        self.board_y = layout.board_y
+        self._update_board_transform()
         self.board.resize(
             x=self.board_x,
             y=self.board_y,
@@ -402,18 +775,17 @@ class MainWindow:
             cell_size=self.cell_size
         )
         # 排行榜/直播
-        sidebar_x = self.base_width - self.sidebar_width - self.board_margin
         self.ranking_panel.resize(
-            x=sidebar_x,
-            y=self.board_margin,
-            width=self.sidebar_width,
-            height=self.base_height - 2 * self.board_margin
+            x=layout.sidebar_x,
+            y=layout.board_margin,
+            width=layout.sidebar_width,
+            height=layout.panel_height
         )
         self.live_viewer.resize(
-            x=sidebar_x,
-            y=self.board_margin,
-            width=self.sidebar_width,
-            height=self.base_height - 2 * self.board_margin
+            x=layout.sidebar_x,
+            y=layout.board_margin,
+            width=layout.sidebar_width,
+            height=layout.panel_height
         )
         # 游戏菜单
         game_menu_width = self.game_menu.width
@@ -442,9 +814,8 @@ class MainWindow:
             self._play_sound('button_click')
             return
 
-        # 控制面板响应
+        # 控制面板响应（按钮由control_panel.dispatch处理，这里只拦截点击，避免穿透到棋盘）
         if self.control_panel.is_hover(mouse_pos):
-            self.control_panel.handle_click(mouse_pos, button)
             self._play_sound('button_click')
             return
 
@@ -453,7 +824,7 @@ class MainWindow:
             self.ranking_panel.handle_click(mouse_pos, button)
             return
         if self.show_live_viewer and self.live_viewer.is_hover(mouse_pos):
-            self.live_viewer.handle_click(mouse_pos, button)
+            # 直播组件的点击由live_viewer.dispatch处理
             self._play_sound('button_click')
             return
 
@@ -463,30 +834,41 @@ class MainWindow:
             self._on_piece_place(x, y)
 
     def _handle_mouse_hover(self, mouse_pos: Tuple[int, int]):
-        """处理鼠标悬停事件（Win11风格高亮）"""
+        """处理鼠标悬停事件（Win11风格高亮；位置未变化的抖动事件直接忽略）"""
+        if mouse_pos == self._last_hover_pos:
+            return
+        # 悬停高亮只影响鼠标新旧位置所在的组件
+        self._invalidate_at(self._last_hover_pos)
+        self._invalidate_at(mouse_pos)
+        self._last_hover_pos = mouse_pos
+
         # 主菜单悬停
         if self.show_main_menu:
             self.main_menu.handle_hover(mouse_pos)
             return
 
-        # 游戏菜单悬停
-        self.game_menu.handle_hover(mouse_pos)
-
-        # 控制面板悬停
-        self.control_panel.handle_hover(mouse_pos)
-
-        # 排行榜/直播悬停
-        if self.show_ranking:
-            self.ranking_panel.handle_hover(mouse_pos)
-        if self.show_live_viewer:
-            self.live_viewer.handle_hover(mouse_pos)
-
-        # 棋盘悬停（预览落子）
-        if self.board.is_hover(mouse_pos) and self.game_active and not self.is_ai_thinking:
-            x, y = self.board.get_board_pos(mouse_pos)
-            self.board.set_preview_pos(x, y, self.game_core.current_player)
-        else:
-            self.board.clear_preview()
+        # 组件悬停：只分发给命中的组件；离开上一个组件时通知其取消高亮
+        hit = next(
+            (c for r, c in self._hover_targets if r.collidepoint(mouse_pos) and self._is_hover_target_visible(c)),
+            None
+        )
+        if self._hover_component is not None and self._hover_component is not hit:
+            self._hover_component.handle_hover(mouse_pos)
+        if hit is not None:
+            hit.handle_hover(mouse_pos)
+        self._hover_component = hit
+
+        # 棋盘悬停（预览落子）：内联屏幕→棋盘坐标变换，棋盘外直接拒绝
+        if self.game_active and not self.is_ai_thinking:
+            dx = mouse_pos[0] - self._board_ox
+            dy = mouse_pos[1] - self._board_oy
+            if dx >= 0 and dy >= 0:
+                row = int(dy * self._inv_cell)
+                col = int(dx * self._inv_cell)
+                if row <= self._board_max and col <= self._board_max:
+                    self.board.set_preview_pos(row, col, self.game_core.current_player)
+                    return
+        self.board.clear_preview()
 
     def _handle_keyboard(self, key: int, mod: int):
         """处理键盘事件（快捷键支持）"""
@@ -537,7 +919,7 @@ class MainWindow:
                 self.show_main_menu = False
                 # 更新组件用户信息
                 self.control_panel.update_user_info(self.current_user)
-                self.ranking_panel.load_ranking(user['user_id'])
+                self._load_ranking_async()
                 self.game_core.set_train_user_id(user['user_id'])
                 # 更新窗口标题
                 pygame.display.set_caption(f"{self.window_title} - {user['nickname']}（登录）")
@@ -590,7 +972,7 @@ class MainWindow:
         }
         self.show_main_menu = False
         self.control_panel.update_user_info(self.current_user)
-        self.ranking_panel.load_ranking('-1')
+        self._load_ranking_async()
         self.game_core.set_train_user_id('-1')
         pygame.display.set_caption(f"{self.window_title} - 游客模式")
         self.logger.info(f"游客登录成功：{self.current_user['username']}")
@@ -607,11 +989,7 @@ class MainWindow:
             return
         self.current_mode = mode
         # 切换模式时重置状态
-        self.game_core.stop_game()
-        self.board.reset()
-        self.ai_visualizer.reset()
-        self.game_active = False
-        self.is_ai_thinking = False
+        self._transition_to_stopped()
         # 设置游戏模式
         self.mode_manager.set_mode(mode, self.current_user['user_id'])
         self.control_panel.update_mode_info(mode)
@@ -619,8 +997,8 @@ class MainWindow:
         self.show_live_viewer = (mode == GAME_MODES['ONLINE'])
         self.show_ranking = (mode != GAME_MODES['ONLINE'])
         if self.show_ranking:
-            self.ranking_panel.load_ranking(self.current_user['user_id'])
-        self.logger.info(f"切换游戏模式：{mode}")
+            self._load_ranking_async()
+        self.logger.info("切换游戏模式：%s", mode)
 
     def _on_ai_level_change(self, level: str):
         """AI难度切换回调"""
@@ -629,13 +1007,13 @@ class MainWindow:
             return
         self.game_core.set_ai_level(level)
         self.control_panel.update_ai_level(level)
-        self.logger.info(f"切换AI难度：{level}")
+        self.logger.info("切换AI难度：%s", level)
 
     def _on_ai_first_toggle(self, ai_first: bool):
         """AI先手切换回调"""
         self.game_core.set_ai_first(ai_first)
         self.control_panel.update_ai_first(ai_first)
-        self.logger.info(f"AI先手：{'开启' if ai_first else '关闭'}")
+        self.logger.info("AI先手：%s", '开启' if ai_first else '关闭')
 
     def _on_start_game(self):
         """开始游戏回调"""
@@ -646,8 +1024,9 @@ class MainWindow:
             self.control_panel.show_error("请先登录或游客登录")
             return
 
-        # 启动游戏
+        # 启动游戏（新对局的分析结果不沿用上一局）
         self.game_core.start_game()
+        self._analysis_cache.clear()
         self.game_active = True
         self.control_panel.update_game_status("游戏中")
         self.board.set_game_active(True)
@@ -656,20 +1035,34 @@ class MainWindow:
 
         # AI先手时自动落子
         if self.current_mode == GAME_MODES['PVE'] and self.game_core.ai_first:
-            self.game_core.ai_move(self.ai_visualizer.update_thinking_data)
+            self._start_ai_move()
+
+    def _start_ai_move(self):
+        """请求AI落子（先在UI线程置思考状态，关闭入队到AI开始思考之间玩家抢先落子的窗口）"""
+        self.is_ai_thinking = True
+        self.game_core.request_ai_move(self._post_thinking_data)
+
+    def _post_thinking_data(self, data: Dict):
+        """AI线程的思考数据回调（缓冲为事件，由UI线程flush_frame时更新可视化）"""
+        self.event_manager.emit(Event('ai_thinking_update', data), EventManager.LEVEL_WRITE)
 
     def _on_stop_game(self):
         """停止游戏回调"""
-        self.game_core.stop_game()
-        self.game_active = False
-        self.is_ai_thinking = False
-        self.ai_visualizer.reset()
-        self.board.reset()
+        self._transition_to_stopped()
         self.board.clear_preview()
         self.control_panel.update_game_status("已停止")
         self.logger.info("游戏停止")
         self._play_sound('button_click')
 
+    def _transition_to_stopped(self):
+        """统一的停止迁移：核心停止并清盘（一次加锁），再清空棋盘/可视化界面状态"""
+        self.game_core.transition_to('stopped')
+        self.board.clear()
+        self.ai_visualizer.reset()
+        self._analysis_cache.clear()
+        self.game_active = False
+        self.is_ai_thinking = False
+
     def _on_new_game(self):
         """新游戏回调"""
         self._on_stop_game()
@@ -697,23 +1090,23 @@ class MainWindow:
         self.is_fullscreen = not self.is_fullscreen
         if self.is_fullscreen:
             self.screen = pygame.display.set_mode(
-                (pygame.display.Info().current_w, pygame.display.Info().current_h),
-                pygame.FULLSCREEN | pygame.DOUBLEBUF | pygame.HWSURFACE
+                self._desktop_size,
+                self._FULLSCREEN_FLAGS
             )
         else:
             self.screen = pygame.display.set_mode(
                 (self.base_width, self.base_height),
-                pygame.RESIZABLE | pygame.DOUBLEBUF | pygame.HWSURFACE | pygame.SCALED
+                self._WINDOW_FLAGS
             )
-        self.logger.info(f"全屏状态：{'开启' if self.is_fullscreen else '关闭'}")
+        self.logger.info("全屏状态：%s", '开启' if self.is_fullscreen else '关闭')
 
     def _on_toggle_ranking(self):
         """切换排行榜显示回调"""
         self.show_ranking = not self.show_ranking
         self.show_live_viewer = False
         if self.show_ranking:
-            self.ranking_panel.load_ranking(self.current_user['user_id'])
-        self.logger.info(f"排行榜显示：{'开启' if self.show_ranking else '关闭'}")
+            self._load_ranking_async()
+        self.logger.info("排行榜显示：%s", '开启' if self.show_ranking else '关闭')
 
     def _on_toggle_live(self):
         """切换直播显示回调"""
@@ -735,30 +1128,24 @@ class MainWindow:
             self.game_core.stop_live()
             self.live_viewer.stop_host()
             self.control_panel.show_message("直播已停止")
-        self.logger.info(f"直播显示：{'开启' if self.show_live_viewer else '关闭'}")
+        self.logger.info("直播显示：%s", '开启' if self.show_live_viewer else '关闭')
 
     def _on_join_live(self, room_id: str):
         """加入直播回调"""
         if not self.current_user:
             self.control_panel.show_error("请先登录或游客登录")
             return
-        try:
-            success = self.game_core.join_live_room(
+        # 网络加入在IO线程执行（用户信息先在UI线程取出），结果由_on_live_join_done处理
+        user_id, user_name = self.current_user['user_id'], self.current_user['nickname']
+        self._submit_io(
+            'live_join_done',
+            lambda: (room_id, self.game_core.join_live_room(
                 room_id=room_id,
-                user_id=self.current_user['user_id'],
-                user_name=self.current_user['nickname'],
+                user_id=user_id,
+                user_name=user_name,
                 callback=self.live_viewer.update_live_data
-            )
-            if success:
-                self.show_live_viewer = True
-                self.show_ranking = False
-                self.live_viewer.start_viewer(room_id)
-                self.control_panel.show_message(f"成功加入直播间：{room_id}")
-            else:
-                self.control_panel.show_error("直播间不存在或已关闭")
-        except Exception as e:
-            error_msg = ErrorHandler.handle_ui_error(e)
-            self.control_panel.show_error(error_msg)
+            ))
+        )
 
     def _on_save_model(self):
         """保存模型回调"""
@@ -783,16 +1170,19 @@ class MainWindow:
                 'train_params': self.config.get_json('rl_params'),
                 'description': self.control_panel.get_model_desc()
             }
-            # 保存模型（带版本控制）
-            model_path, meta_path = self.model_storage.save_model_with_version(
-                model_data=self.game_core.get_ai_model(),
-                model_name=model_name,
-                metadata=metadata,
-                user_id=self.current_user['user_id']
+            # 保存模型（带版本控制；模型快照在UI线程获取，写盘在IO线程执行）
+            model_data = self.game_core.get_ai_model()
+            user_id = self.current_user['user_id']
+            self._submit_io(
+                'model_save_done',
+                lambda: (model_name, self.model_storage.save_model_with_version(
+                    model_data=model_data,
+                    model_name=model_name,
+                    metadata=metadata,
+                    user_id=user_id
+                ))
             )
-            self.control_panel.show_message(f"模型保存成功：{model_name}")
-            self.logger.info(f"模型保存成功：{model_path}")
-            self._play_sound('save_icon')
+            self.control_panel.show_message(f"模型保存中：{model_name}")
         except Exception as e:
             error_msg = ErrorHandler.handle_ui_error(e)
             self.control_panel.show_error(error_msg)
@@ -839,6 +1229,9 @@ class MainWindow:
         if self.game_active:
             self.control_panel.show_error("请先停止当前游戏")
             return
+        if self._train_process is not None:
+            self.control_panel.show_error("模型正在训练中")
+            return
 
         # 获取训练参数
         epochs = self.control_panel.get_train_epochs()
@@ -853,31 +1246,24 @@ class MainWindow:
         self.control_panel.show_message("开始训练，请勿关闭程序...")
         self.control_panel.set_train_status(TRAIN_STATUSES['TRAINING'])
 
-        # 异步训练（避免阻塞UI）
-        def train_thread():
-            try:
-                self.game_core.train_ai_model(
-                    user_id=self.current_user['user_id'],
-                    epochs=epochs,
-                    batch_size=batch_size,
-                    progress_callback=self._on_train_progress_event
-                )
-                # 训练完成事件
-                pygame.event.post(pygame.event.Event(
-                    pygame.USEREVENT,
-                    custom_type='train_complete',
-                    dict={'success': True}
-                ))
-            except Exception as e:
-                pygame.event.post(pygame.event.Event(
-                    pygame.USEREVENT,
-                    custom_type='train_complete',
-                    dict={'success': False, 'error': str(e)}
-                ))
-
-        import threading
-        train_thread = threading.Thread(target=train_thread, daemon=True)
-        train_thread.start()
+        # 子进程训练（避免GIL争用导致UI卡顿），进度由_drain_train_queue转为训练事件
+        settings = {
+            'user_id': self.current_user['user_id'],
+            'mode': self.current_mode,
+            'ai_type': self.game_core.ai_type,
+            'ai_level': self.game_core.ai_level,
+            'model_path': self.game_core.model_path,
+            'epochs': epochs,
+            'batch_size': batch_size
+        }
+        self._train_queue = multiprocessing.Queue()
+        self._train_process = multiprocessing.Process(
+            target=run_training_process,
+            args=(settings, self._train_queue),
+            name='trainer',
+            daemon=True
+        )
+        self._train_process.start()
 
     def _on_analyze_board(self):
         """棋盘分析回调"""
@@ -886,7 +1272,11 @@ class MainWindow:
             return
 
         try:
-            analysis_report = self.game_core.analyze_board()
+            key = self.game_core.zkey
+            analysis_report = self._analysis_cache.get(key)
+            if analysis_report is None:
+                analysis_report = self.game_core.analyze_board()
+                self._analysis_cache[key] = analysis_report
             self.control_panel.show_analysis_report(analysis_report)
             # 标记关键落子位置
             if analysis_report.get('key_move'):
@@ -906,21 +1296,19 @@ class MainWindow:
 
         try:
             result = self.game_core.place_piece(x, y)
-            if result == 'success':
-                # 更新棋盘
-                self.board.update_board(self.game_core.board)
+            if result in ('success', 'game_end'):
+                # 更新棋盘（只同步刚落下的一子）
+                self.board.apply_delta(x, y, self.game_core.board[x][y])
                 self.control_panel.update_move_count(len(self.game_core.move_history))
                 self._play_sound('place_piece')
 
-                # 检查游戏结束
-                game_result = self.game_core.game_result
-                if game_result:
-                    self._on_game_end_event(Event('game_end', {'data': game_result}))
+                # 游戏结束：结算由GameCore发布的game_end事件回调完成
+                if result == 'game_end':
                     return
 
                 # 人机/训练模式：AI落子
                 if self.current_mode in [GAME_MODES['PVE'], GAME_MODES['TRAIN']]:
-                    self.game_core.ai_move(self.ai_visualizer.update_thinking_data)
+                    self._start_ai_move()
 
             elif result == 'invalid_position':
                 self.control_panel.show_error("落子位置超出棋盘")
@@ -936,14 +1324,15 @@ class MainWindow:
     # ------------------------------ 事件驱动回调 ------------------------------
     def _on_game_start_event(self, event: Event):
         """游戏开始事件回调"""
+        self._analysis_cache.clear()
         self.game_active = True
         self.control_panel.update_game_status("游戏中")
         self.board.set_game_active(True)
         self.logger.info("游戏开始（事件驱动）")
 
     def _on_game_end_event(self, event: Event):
-        """游戏结束事件回调"""
-        game_result = event.data['data']
+        """游戏结束事件回调（GameCore发布的数据即结果本身，兼容{'data': 结果}包装）"""
+        game_result = event.data.get('data', event.data)
         self.game_active = False
         self.is_ai_thinking = False
         self.ai_visualizer.reset()
@@ -957,38 +1346,32 @@ class MainWindow:
         if win_line:
             self.board.draw_win_line(win_line)
 
-        # 更新状态和提示
-        if winner == 'draw':
-            status = "平局"
-            msg = "游戏结束，平局！"
-            self._play_sound('draw')
-        elif winner == 'black':
-            status = "黑方获胜"
-            msg = "游戏结束，黑方获胜！"
-            self._play_sound('win' if self.game_core.current_player == PIECE_COLORS['BLACK'] else 'lose')
-        elif winner == 'white':
-            status = "白方获胜"
-            msg = "游戏结束，白方获胜！"
-            self._play_sound('win' if self.game_core.current_player == PIECE_COLORS['WHITE'] else 'lose')
+        # 更新状态和提示（按胜方查表；音效按当前执子方是否为胜方选择）
+        entry = self._GAME_END_TABLE.get(winner)
+        if entry is None:
+            status, msg = "游戏结束", "游戏结束！"
         else:
-            status = "游戏结束"
-            msg = "游戏结束！"
+            status, msg, winner_color = entry
+            if winner_color is None:
+                self._play_sound('draw')
+            else:
+                self._play_sound('win' if self.game_core.current_player == winner_color else 'lose')
 
         # 显示排行榜更新
         if ranking_update:
             msg += f"\n{ranking_update['message']}"
-            self.ranking_panel.load_ranking(self.current_user['user_id'])
+            self._load_ranking_async()
 
         self.control_panel.update_game_status(status)
         self.control_panel.show_message(msg)
-        self.logger.info(f"游戏结束：{status}")
+        self.logger.info("游戏结束：%s", status)
 
     def _on_move_made_event(self, event: Event):
         """落子事件回调"""
         move_data = event.data
-        self.board.update_board(self.game_core.board)
+        self.board.apply_delta(move_data['x'], move_data['y'], move_data['color'])
         self.control_panel.update_move_count(len(self.game_core.move_history))
-        self.logger.debug(f"落子事件：({move_data['x']},{move_data['y']})，颜色：{move_data['color']}")
+        self.logger.debug("落子事件：(%s,%s)，颜色：%s", move_data['x'], move_data['y'], move_data['color'])
 
     def _on_ai_thinking_start(self, event: Event):
         """AI思考开始事件回调"""
@@ -996,6 +1379,10 @@ class MainWindow:
         self.control_panel.update_game_status("AI思考中...")
         self.board.set_ai_thinking(True)
 
+    def _on_ai_thinking_update(self, event: Event):
+        """AI思考数据事件回调（UI线程更新可视化）"""
+        self.ai_visualizer.update_thinking_data(event.data)
+
     def _on_ai_thinking_end(self, event: Event):
         """AI思考结束事件回调"""
         self.is_ai_thinking = False
@@ -1012,7 +1399,16 @@ class MainWindow:
         """训练进度事件回调"""
         progress_data = event.data
         self.control_panel.update_train_progress(progress_data['progress'])
-        self.logger.debug(f"训练进度：{progress_data['progress']:.1f}%，损失：{progress_data['loss']:.4f}")
+        # 训练进度回调频繁：每秒最多汇总输出一条日志
+        self._train_log_skipped += 1
+        now = time.monotonic()
+        if now >= self._train_log_next:
+            self.logger.debug(
+                "训练进度：%.1f%%，损失：%.4f（近1秒%d次更新）",
+                progress_data['progress'], progress_data['loss'], self._train_log_skipped
+            )
+            self._train_log_next = now + 1.0
+            self._train_log_skipped = 0
 
     def _on_train_complete_event(self, event: Event):
         """训练完成事件回调"""
@@ -1021,6 +1417,8 @@ class MainWindow:
             self.control_panel.show_message("模型训练完成！")
             self.control_panel.set_train_status(TRAIN_STATUSES['COMPLETED'])
             self._play_sound('win')
+            # 训练在子进程完成：新模型交给AI工作线程加载（与AI落子串行，不会在推理途中替换）
+            self.game_core.request_model_reload()
         else:
             error_msg = train_data.get('error', '未知错误')
             self.control_panel.show_error(f"训练失败：{error_msg}")
@@ -1058,6 +1456,46 @@ class MainWindow:
         msg_data = event.data
         self.live_viewer.add_message(msg_data['user_name'], msg_data['content'])
 
+    def _on_ranking_loaded(self, event: Event):
+        """排行榜后台查询完成回调"""
+        if event.data.get('error'):
+            self.logger.error(f"加载排行榜失败：{event.data['error']}")
+            return
+        self.ranking_panel.load_ranking_data(event.data['result'])
+
+    def _on_model_save_done(self, event: Event):
+        """模型后台保存完成回调"""
+        if event.data.get('error'):
+            self.control_panel.show_error(f"保存模型失败：{event.data['error']}")
+            self.logger.error(f"保存模型失败：{event.data['error']}")
+            return
+        model_name, (model_path, meta_path) = event.data['result']
+        self.control_panel.show_message(f"模型保存成功：{model_name}")
+        self.logger.info(f"模型保存成功：{model_path}")
+        self._play_sound('save_icon')
+
+    def _on_trained_model_loaded(self, event: Event):
+        """训练后模型后台加载完成回调"""
+        if event.data.get('error'):
+            self.control_panel.show_error(f"加载训练后模型失败：{event.data['error']}")
+            self.logger.error(f"加载训练后模型失败：{event.data['error']}")
+            return
+        self.logger.info("已切换为训练后模型")
+
+    def _on_live_join_done(self, event: Event):
+        """加入直播间后台请求完成回调"""
+        if event.data.get('error'):
+            self.control_panel.show_error(event.data['error'])
+            return
+        room_id, success = event.data['result']
+        if success:
+            self.show_live_viewer = True
+            self.show_ranking = False
+            self.live_viewer.start_viewer(room_id)
+            self.control_panel.show_message(f"成功加入直播间：{room_id}")
+        else:
+            self.control_panel.show_error("直播间不存在或已关闭")
+
     def _on_error_occurred(self, event: Event):
         """错误事件回调"""
         error_data = event.data
@@ -1065,7 +1503,66 @@ class MainWindow:
         self.logger.error(f"错误事件：{error_data}")
 
     # ------------------------------ 辅助方法 ------------------------------
+    def _submit_io(self, done_type: str, fn: Callable[[], Any]):
+        """在IO线程池执行阻塞调用，完成后以USEREVENT（custom_type=done_type）把结果/错误投递回UI线程"""
+        def on_done(future: Future):
+            error = future.exception()
+            pygame.event.post(pygame.event.Event(
+                pygame.USEREVENT,
+                custom_type=done_type,
+                result=None if error else future.result(),
+                error=ErrorHandler.handle_ui_error(error) if error else None
+            ))
+        self._io.submit(fn).add_done_callback(on_done)
+
+    def _drain_train_queue(self):
+        """取出训练子进程回传的进度/结果（本帧多条进度只取最新一条原地写入载荷；结果投递为USEREVENT）"""
+        # 先判断存活再取队列：子进程退出前已把数据全部写入管道，避免误判为异常退出
+        exited = not self._train_process.is_alive()
+        completed = False
+        progressed = False
+        while not completed:
+            try:
+                custom_type, data = self._train_queue.get_nowait()
+            except queue.Empty:
+                break
+            if custom_type == 'train_progress':
+                self._progress_payload['progress'], self._progress_payload['loss'] = data
+                progressed = True
+                continue
+            pygame.event.post(pygame.event.Event(pygame.USEREVENT, custom_type=custom_type, **data))
+            completed = custom_type == 'train_complete'
+        if progressed:
+            self._on_train_progress_event(self._progress_event)
+            # 进度条变化肉眼难以分辨高于10Hz的刷新，限频重绘控制面板（最终进度由训练完成时的整帧重绘补上）
+            now = time.monotonic()
+            if now >= self._progress_redraw_next:
+                self._invalidate(self._layer_rects['control_panel'])
+                self._progress_redraw_next = now + self._PROGRESS_REDRAW_INTERVAL
+        if not (exited or completed):
+            return
+        if not completed:
+            pygame.event.post(pygame.event.Event(
+                pygame.USEREVENT, custom_type='train_complete', success=False,
+                error=f"训练进程异常退出（退出码：{self._train_process.exitcode}）"
+            ))
+        self._train_process.join()
+        self._train_process = None
+        self._train_queue = None
+
+    def _load_ranking_async(self):
+        """后台查询排行榜（结果由_on_ranking_loaded应用）"""
+        self._submit_io('ranking_loaded', self.ranking_panel.fetch_ranking)
+
+    def _on_config_changed(self, section: str, key: str, value: str):
+        """INI配置变更回调（刷新缓存的配置值）"""
+        if section == 'GAME' and key == 'enable_sound':
+            self._sound_enabled = self.config.get_bool('GAME', 'enable_sound', True)
+
     def _play_sound(self, sound_name: str):
-        """播放音效（可选）"""
-        if self.config.get_bool('GAME', 'enable_sound', True) and sound_name in self.sounds:
-            self.sounds[sound_name].play()
\ No newline at end of file
+        """播放音效（可选；音效关闭时不加载任何音效文件）"""
+        if not self._sound_enabled:
+            return
+        sound = self._get_sound(sound_name)
+        if sound:
+            sound.play()
\ No newline at end of file
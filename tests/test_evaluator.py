@@ -0,0 +1,35 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from AI import evaluator as evaluator_module
+from AI.evaluator import BoardEvaluator
+from Common.constants import PIECE_COLORS, COLOR_SWITCH
+
+
+def _random_board(size: int, stones: int, seed: int):
+    """生成随机棋盘（黑白交替落子）"""
+    rng = random.Random(seed)
+    board = [[PIECE_COLORS.EMPTY] * size for _ in range(size)]
+    cells = [(x, y) for x in range(size) for y in range(size)]
+    for i, (x, y) in enumerate(rng.sample(cells, stones)):
+        board[x][y] = PIECE_COLORS.BLACK if i % 2 == 0 else PIECE_COLORS.WHITE
+    return board
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("stones", [0, 1, 12, 60, 150])
+def test_board_kernel_matches_python_loop(seed, stones):
+    """numba内核（未安装numba时为同一函数的解释执行）与逐格Python评估结果一致"""
+    evaluator = BoardEvaluator(15)
+    evaluator.cpp_core = None  # 强制Python降级棋型识别，作为参照实现
+    board = _random_board(15, stones, seed)
+    for color in (PIECE_COLORS.BLACK, PIECE_COLORS.WHITE):
+        expected = evaluator._evaluate_board_py(board, color)
+        actual = evaluator_module._evaluate_board_kernel(
+            np.asarray(board, dtype=np.int8), color, color ^ COLOR_SWITCH,
+            evaluator.position_weights, evaluator.score_table
+        )
+        assert float(actual) == pytest.approx(float(expected), rel=1e-5, abs=1e-6)